@@ -0,0 +1,122 @@
+"""
+Benchmark: `pd.read_excel(engine='openpyxl')` vs the read-only streaming
+reader in `src/data/excel_reader.py`.
+
+Two measurements:
+1. The workbooks in excel/: time to read the first sheet with each path
+   (these regional recap workbooks have a summary sheet first, so both
+   paths end with "missing columns"; this measures the read cost alone).
+2. Roster-layout workbooks built from csv/ (title rows above the header,
+   extra columns, formula columns and cell styling, like the recap files),
+   replicated to `--scale` times the rows: full parse + clean through
+   `parse_sales_file`, checked for identical output.
+
+Run from the repo root:
+    python benchmarks/bench_excel_ingest.py [--scale 20]
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+
+import openpyxl
+import pandas as pd
+from openpyxl.styles import Font, PatternFill
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data import data_processor
+from src.data.excel_reader import read_roster_xlsx
+
+
+TITLE_ROWS = 2
+
+
+def _best_of(fn, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _as_upload(content, name):
+    buffer = io.BytesIO(content)
+    buffer.name = name
+    return buffer
+
+
+def _legacy_parse(content, name):
+    # jalur lama (pd.read_excel semua kolom, lalu resolve/rename/clean); header=2 diberikan
+    # manual karena jalur lama tidak bisa menemukan header di bawah baris judul
+    df = pd.read_excel(_as_upload(content, name), sheet_name=0, engine='openpyxl', header=TITLE_ROWS)
+    df.columns = df.columns.str.strip()
+    rename_map, missing = data_processor.resolve_required_columns(df.columns)
+    if missing:
+        return None
+    return data_processor.normalize_schema(data_processor.clean_sales_frame(df.rename(columns=rename_map)))
+
+
+def _roster_workbook(csv_path, scale):
+    df = pd.read_csv(csv_path, **data_processor.CSV_READ_OPTIONS)
+    df = pd.concat([df] * scale, ignore_index=True)
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['REKAPAN PENCAPAIAN NASIONAL'])
+    sheet.append([os.path.basename(csv_path)])
+    sheet.append(['NO', 'Area', 'SubArea', 'Nama', 'Grade', 'Status', 'Target', 'Sales', 'Minus/plus', '%', 'Keterangan'])
+    header_fill = PatternFill('solid', fgColor='FFD966')
+    for cell in sheet[3]:
+        cell.font = Font(bold=True)
+        cell.fill = header_fill
+    for i, row in enumerate(df.itertuples(index=False), start=4):
+        sheet.append([
+            i - 3, row.Area, row.SubArea, row.Nama, row.Grade, 'Active', row.Target, row.Sales,
+            f'=H{i}-G{i}', f'=H{i}/G{i}*100%', None,
+        ])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue(), len(df)
+
+
+def bench_recap_files():
+    print("excel/ recap workbooks (first sheet read)")
+    for path in sorted(glob.glob('excel/*.xlsx')):
+        content = open(path, 'rb').read()
+        legacy_time, _ = _best_of(lambda: pd.read_excel(io.BytesIO(content), sheet_name=0, engine='openpyxl'))
+        fast_time, _ = _best_of(lambda: read_roster_xlsx(io.BytesIO(content)))
+        print(f"  {os.path.basename(path)[:48]:48s} {legacy_time * 1000:8.1f} ms → {fast_time * 1000:7.1f} ms"
+              f"  ({legacy_time / fast_time:4.1f}x)")
+
+
+def bench_roster_workbooks(scale):
+    print(f"\nroster workbooks from csv/ (x{scale} rows, parse + clean)")
+    for path in sorted(glob.glob('csv/*.csv'))[:2]:
+        content, n_rows = _roster_workbook(path, scale)
+        name = os.path.basename(path).replace('.csv', '.xlsx')
+        legacy_time, legacy = _best_of(lambda: _legacy_parse(content, name), repeat=2)
+        fast_time, fast = _best_of(lambda: data_processor.parse_sales_file(_as_upload(content, name)), repeat=2)
+
+        pd.testing.assert_frame_equal(
+            legacy[fast.columns].reset_index(drop=True), fast.reset_index(drop=True),
+            check_dtype=False, check_categorical=False
+        )
+        print(f"  {n_rows:>8,} rows, {len(content) / 1e6:5.1f} MB   read_excel {legacy_time:6.2f} s"
+              f" → read-only {fast_time:6.2f} s  ({legacy_time / fast_time:4.1f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=int, default=20, help="Row multiplier for the roster workbooks")
+    args = parser.parse_args(argv)
+    bench_recap_files()
+    bench_roster_workbooks(args.scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: row-wise `Series.apply(categorize_performance)` vs the vectorized
+band engine in `src/analytics/bands.py`.
+
+Run from the repo root:
+    python benchmarks/bench_performance_bands.py [n_rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics.bands import categorize_series, band_of, PERFORMANCE_BANDS
+
+
+def _legacy_categorize(percentage):
+    if percentage >= 120:
+        return 'Excellent'
+    elif percentage >= 100:
+        return 'Good'
+    elif percentage >= 80:
+        return 'Average'
+    elif percentage >= 60:
+        return 'Below Average'
+    else:
+        return 'Poor'
+
+
+def _best_of(fn, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(n_rows=1_000_000):
+    rng = np.random.default_rng(42)
+    percentage = pd.Series((rng.integers(0, 60, n_rows) / rng.integers(20, 50, n_rows) * 100).round(2))
+
+    legacy_time, legacy = _best_of(lambda: percentage.apply(_legacy_categorize))
+    vector_time, vector = _best_of(lambda: categorize_series(percentage))
+
+    assert (legacy == vector.astype(str)).all(), "vectorized result differs from legacy apply"
+    assert all(band_of(v, PERFORMANCE_BANDS) == _legacy_categorize(v) for v in (0, 59.99, 60, 80, 100, 119.99, 120))
+
+    print(f"rows               : {n_rows:,}")
+    print(f"Series.apply       : {legacy_time * 1000:9.1f} ms")
+    print(f"categorize_series  : {vector_time * 1000:9.1f} ms")
+    print(f"speedup            : {legacy_time / vector_time:9.1f}x")
+    print(f"memory object/cat  : {legacy.memory_usage(deep=True) / 1e6:.1f} MB / {vector.memory_usage(deep=True) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
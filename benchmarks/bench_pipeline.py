@@ -0,0 +1,238 @@
+"""
+Benchmark: the dashboard pipeline end to end, headless (no Streamlit runtime).
+
+Stages, each at every row count in `--sizes`:
+    ingest_csv / ingest_xlsx   process_uploaded_file on a generated upload (upload cache cleared)
+    build_cube                 the aggregation cube shared by the tabs
+    team_metrics               calculate_team_metrics
+    area_performance           get_area_performance (with the cube, as the tabs call it)
+    grade_analysis             get_grade_analysis (with the cube)
+    heatmap_data               create_heatmap_data (with the cube)
+    performance_map            create_performance_map (with the cube)
+    filter_index               FilterEngine build (once per dataset in the sidebar)
+    sidebar_filter             FilterEngine.select + view for a fixed set of sidebar states
+
+Rows come from the seeded synthetic roster generator (src/data/synthetic.py,
+fitted from csv/), so every run at a given size sees the same data. Latency is the best of
+`--repeat` runs. Peak memory is measured in one extra run under tracemalloc,
+kept separate so tracing does not skew the timings.
+
+Results are written as JSON (see --out) and can be diffed against an earlier run:
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000 100000 1000000]
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<old>.json
+"""
+import argparse
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics.cube import build_cube
+from src.analytics.metrics import calculate_team_metrics, get_area_performance, get_grade_analysis
+from src.data import data_processor
+from src.data.filter_engine import FilterEngine
+from src.data.synthetic import ROSTER_COLUMNS, fit_roster_profile, generate_roster
+from src.maps.maps import create_heatmap_data, create_performance_map
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# xlsx besar lambat dibuat & dibaca; di atas batas ini ingest_xlsx dilewati (ubah lewat --xlsx-max-rows)
+XLSX_MAX_ROWS = 100_000
+
+
+def _best_of(fn, repeat=3, setup=None):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_mb(fn, setup=None):
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# ============================================================
+#   DATA
+# ============================================================
+def _upload(content, name):
+    buffer = io.BytesIO(content)
+    buffer.name = name
+    return buffer
+
+
+def _csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def _xlsx_bytes(df):
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {'constant_memory': True})
+    sheet = workbook.add_worksheet()
+    sheet.write_row(0, 0, ROSTER_COLUMNS)
+    columns = [df[column].astype(object).where(df[column].notna(), None).tolist() for column in ROSTER_COLUMNS]
+    for i, row in enumerate(zip(*columns), start=1):
+        sheet.write_row(i, 0, row)
+    workbook.close()
+    return buffer.getvalue()
+
+
+# ============================================================
+#   STAGES
+# ============================================================
+def _sidebar_states(df):
+    """Representative sidebar states: nothing, one value filter, range only, everything combined."""
+    area = df['Area'].value_counts().index[0]
+    grade = df['Grade'].value_counts().index[0]
+    return [
+        {},
+        {'area': area},
+        {'min_pct': 80.0, 'max_pct': 120.0},
+        {'area': area, 'grade': grade, 'category': 'Good', 'min_pct': 50.0},
+    ]
+
+
+def pipeline_stages(df, raw, xlsx_max_rows):
+    """(name, fn, setup) per stage for one dataset size."""
+    cube = build_cube(df)
+    engine = FilterEngine(df)
+    states = _sidebar_states(df)
+    clear_upload_cache = data_processor._UPLOAD_CACHE.clear
+
+    csv_content = _csv_bytes(raw)
+    stages = [
+        ('ingest_csv', lambda: data_processor.process_uploaded_file(_upload(csv_content, 'bench.csv')),
+         clear_upload_cache),
+    ]
+    if len(raw) <= xlsx_max_rows:
+        xlsx_content = _xlsx_bytes(raw)
+        stages.append(
+            ('ingest_xlsx', lambda: data_processor.process_uploaded_file(_upload(xlsx_content, 'bench.xlsx')),
+             clear_upload_cache)
+        )
+    stages += [
+        ('build_cube', lambda: build_cube(df), None),
+        ('team_metrics', lambda: calculate_team_metrics(df), None),
+        ('area_performance', lambda: get_area_performance(df, cube), None),
+        ('grade_analysis', lambda: get_grade_analysis(df, cube), None),
+        ('heatmap_data', lambda: create_heatmap_data(df, cube), None),
+        ('performance_map', lambda: create_performance_map(df, cube), None),
+        ('filter_index', lambda: FilterEngine(df), None),
+        ('sidebar_filter', lambda: [engine.view(engine.select(**state)) for state in states], None),
+    ]
+    return stages
+
+
+def run(sizes, repeat=3, seed=42, xlsx_max_rows=XLSX_MAX_ROWS):
+    profile = fit_roster_profile()
+    results = []
+    for n_rows in sizes:
+        raw = generate_roster(n_rows, seed, raw=True, profile=profile)
+        df = data_processor.parse_sales_file(_upload(_csv_bytes(raw), 'bench.csv'))
+        print(f"\n{n_rows:,} rows")
+        for name, fn, setup in pipeline_stages(df, raw, xlsx_max_rows):
+            seconds, _ = _best_of(fn, repeat, setup)
+            peak_mb = _peak_mb(fn, setup)
+            results.append({'stage': name, 'rows': n_rows, 'seconds': seconds, 'peak_mb': round(peak_mb, 2)})
+            print(f"  {name:18s} {seconds * 1000:10.1f} ms   peak {peak_mb:8.1f} MB")
+        if len(raw) > xlsx_max_rows:
+            print(f"  {'ingest_xlsx':18s} skipped (> --xlsx-max-rows {xlsx_max_rows:,})")
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    before = {(r['stage'], r['rows']): r for r in baseline['results']}
+    print(f"\nvs {os.path.basename(baseline_path)} (commit {baseline['meta']['commit']})")
+    for result in results:
+        old = before.get((result['stage'], result['rows']))
+        if old is None:
+            continue
+        ratio = result['seconds'] / old['seconds'] if old['seconds'] else float('nan')
+        print(f"  {result['stage']:18s} {result['rows']:>9,}  {old['seconds'] * 1000:10.1f} → "
+              f"{result['seconds'] * 1000:10.1f} ms  ({ratio:5.2f}x)   peak {old['peak_mb']:8.1f} → {result['peak_mb']:8.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--xlsx-max-rows', type=int, default=XLSX_MAX_ROWS,
+                        help="Skip ingest_xlsx above this row count")
+    parser.add_argument('--out', help="JSON result path (default: benchmarks/results/<commit>-<timestamp>.json)")
+    parser.add_argument('--compare', help="Earlier JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    # tanpa runtime Streamlit, st.cache_data mencatat warning di setiap import/panggilan
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    # folium memperingatkan soal API key tile CartoDB di setiap peta; tidak relevan untuk timing
+    warnings.filterwarnings('ignore', category=UserWarning, module='folium')
+
+    commit = _git_commit()
+    results = run(args.sizes, args.repeat, args.seed, args.xlsx_max_rows)
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n→ {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,72 +11,108 @@ from src.ui.sidebar import render_sidebar
 
 # Analytics
 from src.analytics.metrics import calculate_team_metrics
+from src.analytics.cube import get_aggregation_cube
 
 # Tabs (UI screens)
 from src.ui.tabs import render_tabs
 
-# NEW (for choropleth integration)
-# If you already created these files, good — this import will work
-# If not, I will generate the file maps/choro.py for you later
-try:
-    from src.maps.choropleth import create_province_choropleth
-except Exception:
-    create_province_choropleth = None
+# Debug: waktu per tahap tiap rerun
+from src.ui.debug_panel import render_debug_panel
+from src.utils.profiling import begin_rerun, end_rerun, stage
 
 
 def main():
-    # -------------------------
-    # 🌐 Global page settings
-    # -------------------------
-    st.set_page_config(
-        page_title="Sales Performance Analytics Dashboard",
-        page_icon="📊",
-        layout="wide",
-        initial_sidebar_state="expanded",
+    # cProfile / tracemalloc hanya aktif kalau dicentang di panel debug (rerun sebelumnya)
+    begin_rerun(
+        cprofile=st.session_state.get('debug_cprofile', False),
+        trace_memory=st.session_state.get('debug_tracemalloc', False),
     )
 
-    # -------------------------
-    # 🌐 Initialize language
-    # -------------------------
-    init_language()  # <--- IMPORTANT (keeps selected language across pages)
-
-    # -------------------------
-    # 🎨 Inject global CSS
-    # -------------------------
-    inject_styles()
-
-    # -------------------------
-    # 🏷️ Render Header
-    # -------------------------
-    render_header()
-
-    # -------------------------
-    # 🧭 Sidebar: file upload, filters, language switcher
-    # returns: (data, filtered_data)
-    # -------------------------
-    data, filtered_data = render_sidebar()
-
-    # -------------------------
-    # 📊 Calculate KPIs
-    # -------------------------
-    team_metrics = calculate_team_metrics(filtered_data)
-
-    # -------------------------
-    # 🗂️ Render TABS (Maps, Overview, Performers, Detailed, Recommendations)
-    # -------------------------
-    render_tabs(filtered_data, team_metrics)
-
-    # -------------------------
-    # 📌 OPTIONAL: Show footer text (multilanguage)
-    # -------------------------
-    st.markdown(
-        f"""
-        <div style='text-align:center; margin-top: 30px; color: gray; font-size: 13px;'>
-            <i>{get_text('footer_text')}</i>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    rerun_context = None
+    try:
+        # -------------------------
+        # 🌐 Global page settings
+        # -------------------------
+        st.set_page_config(
+            page_title="Sales Performance Analytics Dashboard",
+            page_icon="📊",
+            layout="wide",
+            initial_sidebar_state="expanded",
+        )
+
+        # -------------------------
+        # 🌐 Initialize language
+        # -------------------------
+        init_language()  # <--- IMPORTANT (keeps selected language across pages)
+
+        # -------------------------
+        # 🎨 Inject global CSS
+        # -------------------------
+        inject_styles()
+
+        # -------------------------
+        # 🏷️ Render Header
+        # -------------------------
+        render_header()
+
+        # -------------------------
+        # 🧭 Sidebar: file upload, filters, language switcher
+        # returns: (data, filtered_data)
+        # -------------------------
+        with stage('render_sidebar'):
+            data, filtered_data = render_sidebar()
+
+        # -------------------------
+        # 📊 Calculate KPIs
+        # -------------------------
+        # snapshot dari streaming ingest dan tidak ada baris yang tersaring:
+        # KPI & cube dari agregat yang disimpan saat ingest, tanpa scan baris
+        aggregates = st.session_state.get('dataset_aggregates')
+        unfiltered = aggregates is not None and len(filtered_data) == len(data) == aggregates.rows
+        with stage('calculate_team_metrics'):
+            team_metrics = aggregates.team_metrics() if unfiltered else calculate_team_metrics(filtered_data)
+
+        # -------------------------
+        # 🧊 Aggregation cube (1x scan, dipakai semua tab)
+        # -------------------------
+        with stage('aggregation_cube'):
+            cube = get_aggregation_cube(
+                filtered_data, st.session_state.get('filter_fingerprint'),
+                grain=aggregates.grain if unfiltered else None
+            )
+
+        # -------------------------
+        # 🗂️ Render TABS (Maps, Overview, Performers, Detailed, Recommendations)
+        # -------------------------
+        with stage('render_tabs'):
+            render_tabs(filtered_data, team_metrics, cube)
+
+        # -------------------------
+        # 📌 OPTIONAL: Show footer text (multilanguage)
+        # -------------------------
+        st.markdown(
+            f"""
+            <div style='text-align:center; margin-top: 30px; color: gray; font-size: 13px;'>
+                <i>{get_text('footer_text')}</i>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+        # -------------------------
+        # 🐞 Debug panel + log JSONL (satu baris per rerun)
+        # -------------------------
+        fingerprint = st.session_state.get('filter_fingerprint') or ()
+        rerun_context = {
+            'active_tab': st.session_state.get('active_tab'),
+            'rows': len(data),
+            'filtered_rows': len(filtered_data),
+            'filters': list(fingerprint[1:]),
+        }
+    finally:
+        # st.rerun / st.stop / error di tengah jalan: profiler & tracemalloc tetap dimatikan
+        rerun = end_rerun(rerun_context or {'interrupted': True})
+    render_debug_panel(rerun)
 
 
 if __name__ == "__main__":
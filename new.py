@@ -27,6 +27,8 @@ from typing import Dict, List, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.analytics.bands import categorize_series
+
 # ============================================================================
 # PAGE CONFIGURATION AND SETUP
 # ============================================================================
@@ -436,19 +438,7 @@ def load_data() -> pd.DataFrame:
     df['Minus/plus'] = df['Sales'] - df['Target']
     df['Percentage'] = (df['Sales'] / df['Target'] * 100).round(2)
     
-    def categorize_performance(percentage):
-        if percentage >= 120:
-            return 'Excellent'
-        elif percentage >= 100:
-            return 'Good'
-        elif percentage >= 80:
-            return 'Average'
-        elif percentage >= 60:
-            return 'Below Average'
-        else:
-            return 'Poor'
-    
-    df['Performance_Category'] = df['Percentage'].apply(categorize_performance)
+    df['Performance_Category'] = categorize_series(df['Percentage'])
     
     return df
 
@@ -22,6 +22,7 @@ from plotly.subplots import make_subplots
 import datetime
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
+from functools import lru_cache
 import warnings
 import io
 import openpyxl  
@@ -29,6 +30,13 @@ import re
 import folium
 from streamlit_folium import st_folium
 
+from src.analytics.bands import (
+    categorize_series, band_of,
+    MAP_COLOR_BANDS, ROW_HIGHLIGHT_BANDS, ACHIEVEMENT_TEXT_BANDS,
+    TOP_HIGHLIGHT_BANDS, BOTTOM_HIGHLIGHT_BANDS,
+)
+from src.ui.table_styles import render_table, background_css, text_css
+
 warnings.filterwarnings('ignore')
 
 # ============================================================================
@@ -401,19 +409,7 @@ def process_uploaded_file(uploaded_file):
         df['Minus/plus'] = df['Sales'] - df['Target']
         df['Percentage'] = (df['Sales'] / df['Target'] * 100).round(2)
         
-        def categorize_performance(percentage):
-            if percentage >= 120:
-                return 'Excellent'
-            elif percentage >= 100:
-                return 'Good'
-            elif percentage >= 80:
-                return 'Average'
-            elif percentage >= 60:
-                return 'Below Average' 
-            else:
-                return 'Poor'
-        
-        df['Performance_Category'] = df['Percentage'].apply(categorize_performance)
+        df['Performance_Category'] = categorize_series(df['Percentage'])
         
         return df
         
@@ -440,19 +436,7 @@ def load_sample_data():
     df['Minus/plus'] = df['Sales'] - df['Target']
     df['Percentage'] = (df['Sales'] / df['Target'] * 100).round(2)
     
-    def categorize_performance(percentage):
-        if percentage >= 120:
-            return 'Excellent'
-        elif percentage >= 100:
-            return 'Good'
-        elif percentage >= 80:
-            return 'Average'
-        elif percentage >= 60:
-            return 'Below Average' 
-        else:
-            return 'Poor'
-    
-    df['Performance_Category'] = df['Percentage'].apply(categorize_performance)
+    df['Performance_Category'] = categorize_series(df['Percentage'])
     
     return df
 
@@ -548,6 +532,7 @@ def get_grade_analysis(df):
 # MAP VISUALIZATION FUNCTIONS 
 # ============================================================================
 
+@lru_cache(maxsize=4096)
 def get_indonesia_coordinates(area_name):
     """Get approximate coordinates for Indonesian areas - PULAU-BASED VERSION"""
     # Normalize area name
@@ -701,18 +686,8 @@ def create_performance_map(df):
         coords = get_indonesia_coordinates(area)
         
         # Determine marker color based on performance
-        if avg_performance >= 120:
-            color = 'green'
-            icon_color = 'green'
-        elif avg_performance >= 100:
-            color = 'lightgreen'
-            icon_color = 'lightgreen'
-        elif avg_performance >= 80:
-            color = 'orange'
-            icon_color = 'orange'
-        else:
-            color = 'red'
-            icon_color = 'red'
+        color = band_of(avg_performance, MAP_COLOR_BANDS)
+        icon_color = color
         
         # Determine icon
         if team_size >= 10:
@@ -1235,27 +1210,15 @@ with tab1:
         area_detail['Achievement'] = (area_detail['Sales'] / area_detail['Target'] * 100).round(1)
         area_detail = area_detail.sort_values('Achievement', ascending=False)
         
-        # Style the dataframe
-        def color_achievement(val):
-            if val >= 120:
-                color = '#28a745'
-            elif val >= 100:
-                color = '#17a2b8'
-            elif val >= 80:
-                color = '#ffc107'
-            else:
-                color = '#dc3545'
-            return f'color: {color}; font-weight: bold'
-        
-        styled_area = area_detail.style.format({
+        # Style the dataframe (warna achievement dihitung sekali untuk seluruh kolom)
+        render_table(area_detail, {
             'Target': 'Rp {:,.0f}',
             'Sales': 'Rp {:,.0f}',
             'Percentage': '{:.1f}%',
             'Achievement': '{:.1f}%',
             'Minus/plus': 'Rp {:+,.0f}'
-        }).applymap(color_achievement, subset=['Achievement'])
-        
-        st.dataframe(styled_area, use_container_width=True)
+        }, cell_css={'Achievement': text_css(area_detail['Achievement'], ACHIEVEMENT_TEXT_BANDS)},
+            use_container_width=True)
     else:
         st.info("📊 Tidak ada data untuk ditampilkan")
 
@@ -1387,41 +1350,23 @@ with tab3:
             top_10 = filtered_data.nlargest(10, 'Percentage')[['Nama', 'SubArea', 'Grade', 'Sales', 'Target', 'Percentage', 'Performance_Category']]
             st.write(f"**🏅 {get_text('top_performers')}:**")
             
-            def highlight_performance(val):
-                if val >= 120:
-                    return 'background-color: #d4edda; color: #155724'
-                elif val >= 100:
-                    return 'background-color: #cce5ff; color: #004085'
-                else:
-                    return ''
-            
-            styled_top = top_10.style.format({
+            render_table(top_10, {
                 'Sales': '{:.0f}',
                 'Target': '{:.0f}', 
                 'Percentage': '{:.1f}%'
-            }).applymap(highlight_performance, subset=['Percentage'])
-            
-            st.dataframe(styled_top, use_container_width=True)
+            }, cell_css={'Percentage': background_css(top_10['Percentage'], TOP_HIGHLIGHT_BANDS)},
+                use_container_width=True)
         
         with col2:
             bottom_10 = filtered_data.nsmallest(10, 'Percentage')[['Nama', 'SubArea', 'Grade', 'Sales', 'Target', 'Percentage', 'Performance_Category']]
             st.write(f"**⚠️ {get_text('bottom_performers')}:**")
             
-            def highlight_poor_performance(val):
-                if val < 60:
-                    return 'background-color: #f8d7da; color: #721c24'
-                elif val < 80:
-                    return 'background-color: #fff3cd; color: #856404'
-                else:
-                    return ''
-            
-            styled_bottom = bottom_10.style.format({
+            render_table(bottom_10, {
                 'Sales': '{:.0f}',
                 'Target': '{:.0f}',
                 'Percentage': '{:.1f}%'
-            }).applymap(highlight_poor_performance, subset=['Percentage'])
-            
-            st.dataframe(styled_bottom, use_container_width=True)
+            }, cell_css={'Percentage': background_css(bottom_10['Percentage'], BOTTOM_HIGHLIGHT_BANDS)},
+                use_container_width=True)
 
 # TAB 4: DETAILED DATA
 with tab4:
@@ -1477,28 +1422,14 @@ with tab4:
         
         display_columns = ['Nama', 'Area', 'SubArea', 'Grade', 'Target', 'Sales', 'Minus/plus', 'Percentage', 'Performance_Category']
         
-        def style_dataframe(df):
-            def highlight_performance_row(row):
-                if row['Percentage'] >= 120:
-                    return ['background-color: #d4edda'] * len(row)
-                elif row['Percentage'] >= 100:
-                    return ['background-color: #cce5ff'] * len(row)
-                elif row['Percentage'] >= 80:
-                    return ['background-color: #fff3cd'] * len(row)
-                elif row['Percentage'] >= 60:
-                    return ['background-color: #ffeaa7'] * len(row)
-                else:
-                    return ['background-color: #f8d7da'] * len(row)
-            
-            return df.style.format({
-                'Target': '{:.0f}', 
-                'Sales': '{:.0f}', 
-                'Minus/plus': '{:+.0f}',
-                'Percentage': '{:.1f}%'
-            }).apply(highlight_performance_row, axis=1)
-        
-        styled_df = style_dataframe(display_df[display_columns])
-        st.dataframe(styled_df, use_container_width=True, height=500)
+        # tabel besar (> STYLER_MAX_CELLS) otomatis tampil dengan format native tanpa Styler
+        render_table(display_df[display_columns], {
+            'Target': '{:.0f}', 
+            'Sales': '{:.0f}', 
+            'Minus/plus': '{:+.0f}',
+            'Percentage': '{:.1f}%'
+        }, row_css=background_css(display_df['Percentage'], ROW_HIGHLIGHT_BANDS, contrast_text=False),
+            use_container_width=True, height=500)
         
         if export_format == 'CSV Download':
             csv = display_df.to_csv(index=False)
@@ -0,0 +1,91 @@
+# src/analytics/bands.py
+import numpy as np
+import pandas as pd
+
+# ============================================================
+#   BAND THRESHOLDS — satu sumber untuk semua batas performa
+#   (batas bawah inklusif, urut dari tertinggi ke terendah;
+#    nilai di bawah semua batas jatuh ke 'default', NaN juga
+#    kecuali tabelnya punya band 'nan' sendiri)
+# ============================================================
+PERFORMANCE_BANDS = {
+    'thresholds': [(120, 'Excellent'), (100, 'Good'), (80, 'Average'), (60, 'Below Average')],
+    'default': 'Poor',
+}
+
+# Warna marker folium (create_performance_map)
+MAP_COLOR_BANDS = {
+    'thresholds': [(120, 'green'), (100, 'lightgreen'), (80, 'orange')],
+    'default': 'red',
+}
+
+# Warna background baris tabel (satu.py → style_dataframe)
+ROW_HIGHLIGHT_BANDS = {
+    'thresholds': [(120, '#d4edda'), (100, '#cce5ff'), (80, '#fff3cd'), (60, '#ffeaa7')],
+    'default': '#f8d7da',
+}
+
+# Warna teks achievement (tabel area); NaN tetap merah seperti versi per-sel lama
+ACHIEVEMENT_TEXT_BANDS = {
+    'thresholds': [(120, '#28a745'), (100, '#17a2b8'), (80, '#ffc107')],
+    'default': '#dc3545',
+}
+
+# Highlight kolom Percentage di tabel top / bottom performers; '' = tanpa warna
+TOP_HIGHLIGHT_BANDS = {
+    'thresholds': [(120, '#d4edda'), (100, '#cce5ff')],
+    'default': '',
+}
+BOTTOM_HIGHLIGHT_BANDS = {
+    'thresholds': [(80, ''), (60, '#fff3cd')],
+    'default': '#f8d7da',
+    # Percentage kosong (Target 0) tidak di-highlight, bukan ikut merah
+    'nan': '',
+}
+
+
+def band_labels(bands):
+    """Labels from lowest to highest band, then the NaN band when the table has one."""
+    labels = [bands['default']] + [label for _, label in reversed(bands['thresholds'])]
+    if 'nan' in bands:
+        labels.append(bands['nan'])
+    return labels
+
+
+PERFORMANCE_CATEGORIES = band_labels(PERFORMANCE_BANDS)
+
+
+def band_codes(values, bands):
+    """Band index per value (0 = default/lowest band), computed with one np.select."""
+    values = np.asarray(values, dtype='float64')
+    n_bands = len(bands['thresholds'])
+    conditions = [values >= lower for lower, _ in bands['thresholds']]
+    choices = list(range(n_bands, 0, -1))
+    if 'nan' in bands:
+        conditions.append(np.isnan(values))
+        choices.append(n_bands + 1)
+    return np.select(conditions, choices, default=0).astype('int8')
+
+
+def classify_bands(values, bands):
+    """Vectorized band lookup, returns an ndarray of labels."""
+    labels = np.asarray(band_labels(bands), dtype=object)
+    return labels[band_codes(values, bands)]
+
+
+def categorize_series(values, bands=PERFORMANCE_BANDS, name='Performance_Category'):
+    """Classify a numeric Series into an ordered categorical (lowest band first)."""
+    values = pd.Series(values)
+    codes = band_codes(values.to_numpy(dtype='float64', na_value=np.nan), bands)
+    categories = pd.Categorical.from_codes(codes, categories=band_labels(bands), ordered=True)
+    return pd.Series(categories, index=values.index, name=name)
+
+
+def band_of(value, bands=PERFORMANCE_BANDS):
+    """Scalar lookup for places that only classify a single value."""
+    if 'nan' in bands and value != value:
+        return bands['nan']
+    for lower, label in bands['thresholds']:
+        if value >= lower:
+            return label
+    return bands['default']
@@ -0,0 +1,87 @@
+# src/analytics/cube.py
+"""
+Aggregation cube: one scan of the (filtered) data at the finest grain
+Area × SubArea × Grade, rolled up to every level the tabs need.
+
+Only additive measures are stored (sums, counts, Σx and Σx² of Percentage),
+so means and sample std can be derived exactly at any roll-up level.
+"""
+import numpy as np
+import pandas as pd
+
+from src.utils.cache import LRUCache
+
+CUBE_GRAIN = ['Area', 'SubArea', 'Grade']
+CUBE_LEVELS = {
+    'Area': ['Area'],
+    'SubArea': ['SubArea'],
+    'Grade': ['Grade'],
+}
+
+_CUBE_CACHE = LRUCache(maxsize=16)
+
+
+def cube_grain(df):
+    """Additive measures at the Area × SubArea × Grade grain (one groupby over `df`)."""
+    pct = df['Percentage'].astype('float64')
+    base = pd.DataFrame({
+        'Area': df['Area'], 'SubArea': df['SubArea'], 'Grade': df['Grade'],
+        'Target_Sum': df['Target'], 'Sales_Sum': df['Sales'], 'Gap_Sum': df['Minus/plus'],
+        'Target_Count': df['Target'].notna(), 'Sales_Count': df['Sales'].notna(),
+        'Nama_Count': df['Nama'].notna(),
+        'Pct_Sum': pct, 'Pct_SumSq': pct * pct, 'Pct_Count': pct.notna(),
+    })
+    return base.groupby(CUBE_GRAIN, sort=False, observed=True).sum()
+
+
+def merge_grains(grains):
+    """Combine partial grains (e.g. one per CSV chunk) into one."""
+    grains = [g for g in grains if not g.empty]
+    if not grains:
+        return pd.DataFrame()
+    if len(grains) == 1:
+        return grains[0]
+    return pd.concat(grains).groupby(level=CUBE_GRAIN, sort=False, observed=True).sum()
+
+
+def cube_from_grain(fine):
+    if fine.empty:
+        return {level: pd.DataFrame() for level in CUBE_LEVELS}
+
+    cube = {'grain': fine}
+    for level, keys in CUBE_LEVELS.items():
+        rolled = fine.groupby(level=keys, observed=True).sum()
+        n = rolled['Pct_Count']
+        rolled['Pct_Mean'] = rolled['Pct_Sum'] / n.where(n > 0)
+        with np.errstate(invalid='ignore'):
+            variance = (rolled['Pct_SumSq'] - rolled['Pct_Sum'] ** 2 / n) / (n - 1).where(n > 1)
+        rolled['Pct_Std'] = np.sqrt(variance.clip(lower=0))
+        cube[level] = rolled
+    return cube
+
+
+def build_cube(df):
+    if df.empty:
+        return {level: pd.DataFrame() for level in CUBE_LEVELS}
+    return cube_from_grain(cube_grain(df))
+
+
+def get_aggregation_cube(df, fingerprint=None, grain=None):
+    """
+    Cube for `df`, memoized on the filter-state fingerprint when one is given.
+    `grain` is a precomputed grain of exactly `df` (the streaming ingest
+    aggregates); it replaces the scan of `df`.
+    """
+    build = (lambda: cube_from_grain(grain)) if grain is not None and not grain.empty else (lambda: build_cube(df))
+    if fingerprint is None:
+        return build()
+    cube = _CUBE_CACHE.get(fingerprint)
+    if cube is None:
+        cube = build()
+        _CUBE_CACHE.put(fingerprint, cube)
+    return cube
+
+
+def dataset_fingerprint(df, source):
+    # murah (dua sum vectorized) tapi cukup untuk membedakan dataset sample yang di-regenerate
+    return (source, len(df), float(df['Target'].sum()), float(df['Sales'].sum()))
@@ -1,52 +1,119 @@
 # src/analytics/metrics.py
+import numpy as np
 import pandas as pd
 
-def calculate_team_metrics(df):
-    metrics = {
-        'total_team_size': len(df),
-        'total_target': df['Target'].sum(),
-        'total_sales': df['Sales'].sum(),
-        'overall_achievement': (df['Sales'].sum() / df['Target'].sum() * 100).round(2) if df['Target'].sum() > 0 else 0,
-        'avg_individual_performance': df['Percentage'].mean().round(2) if not df.empty else 0,
-        'performance_std': df['Percentage'].std().round(2) if not df.empty else 0,
-        'top_performer': df.loc[df['Percentage'].idxmax(), 'Nama'] if not df.empty else 'N/A',
-        'top_performance': df['Percentage'].max() if not df.empty else 0,
-        'bottom_performer': df.loc[df['Percentage'].idxmin(), 'Nama'] if not df.empty else 'N/A',
-        'bottom_performance': df['Percentage'].min() if not df.empty else 0,
-        'zero_sales_count': len(df[df['Sales'] == 0]),
-        'excellent_performers': len(df[df['Performance_Category'] == 'Excellent']),
-        'good_performers': len(df[df['Performance_Category'] == 'Good']),
-        'needs_improvement': len(df[df['Performance_Category'].isin(['Below Average', 'Poor'])])
+from src.analytics.bands import PERFORMANCE_CATEGORIES
+from src.analytics.cube import build_cube
+
+def _column(df, column, rows):
+    values = df[column].to_numpy(dtype='float64', na_value=np.nan)
+    return values if rows is None else values[rows]
+
+
+def _total(df, column, values):
+    # kolom integer → total int seperti Series.sum (kartu KPI "9,454/17,905", bukan "9,454.0/17,905.0")
+    total = np.nansum(values)
+    return int(total) if pd.api.types.is_integer_dtype(df[column].dtype) else total
+
+
+def _category_counts(df, rows):
+    category = df['Performance_Category']
+    if isinstance(category.dtype, pd.CategoricalDtype) and list(category.cat.categories) == PERFORMANCE_CATEGORIES:
+        codes = category.cat.codes.to_numpy()
+    else:
+        codes = pd.Categorical(category, categories=PERFORMANCE_CATEGORIES).codes
+    codes = codes if rows is None else codes[rows]
+    # kode -1 (NaN / kategori asing) tidak dihitung
+    counts = np.bincount(codes[codes >= 0], minlength=len(PERFORMANCE_CATEGORIES))
+    return dict(zip(PERFORMANCE_CATEGORIES, counts.tolist()))
+
+
+def calculate_team_metrics(df, mask=None):
+    """
+    Team KPIs in one pass over the NumPy columns. `mask` (boolean array or
+    row positions) restricts the KPIs to those rows without materializing
+    them; the batch area reports use it for the KPIs per period.
+    """
+    rows = None
+    if mask is not None:
+        mask = np.asarray(mask)
+        rows = np.flatnonzero(mask) if mask.dtype == bool else mask
+    n_rows = len(df) if rows is None else len(rows)
+
+    target = _column(df, 'Target', rows)
+    sales = _column(df, 'Sales', rows)
+    pct = _column(df, 'Percentage', rows)
+    total_target = _total(df, 'Target', target)
+    total_sales = _total(df, 'Sales', sales)
+
+    valid = ~np.isnan(pct)
+    n_pct = int(valid.sum())
+    if n_pct:
+        pct_valid = pct[valid]
+        mean = pct_valid.mean()
+        # ddof=1 seperti Series.std; inf - inf (Target 0) → NaN tanpa RuntimeWarning, seperti cube.py
+        with np.errstate(invalid='ignore'):
+            std = np.sqrt(((pct_valid - mean) ** 2).sum() / (n_pct - 1)) if n_pct > 1 else np.nan
+        # argmax / argmin → kemunculan pertama, sama seperti idxmax / idxmin
+        positions = np.flatnonzero(valid)
+        i_top, i_bottom = positions[np.argmax(pct_valid)], positions[np.argmin(pct_valid)]
+        if rows is not None:
+            i_top, i_bottom = rows[i_top], rows[i_bottom]
+        top_performer, bottom_performer = df['Nama'].iloc[i_top], df['Nama'].iloc[i_bottom]
+        top_performance, bottom_performance = pct_valid.max(), pct_valid.min()
+    counts = _category_counts(df, rows)
+
+    return {
+        'total_team_size': n_rows,
+        'total_target': total_target,
+        'total_sales': total_sales,
+        'overall_achievement': round(total_sales / total_target * 100, 2) if total_target > 0 else 0,
+        'avg_individual_performance': round(mean, 2) if n_pct else 0,
+        'performance_std': round(std, 2) if n_pct else 0,
+        'top_performer': top_performer if n_pct else 'N/A',
+        'top_performance': top_performance if n_pct else 0,
+        'bottom_performer': bottom_performer if n_pct else 'N/A',
+        'bottom_performance': bottom_performance if n_pct else 0,
+        'zero_sales_count': int((sales == 0).sum()),
+        'excellent_performers': counts['Excellent'],
+        'good_performers': counts['Good'],
+        'needs_improvement': counts['Below Average'] + counts['Poor'],
     }
-    return metrics
 
-def get_area_performance(df):
+def get_area_performance(df, cube=None):
     if df.empty:
         return pd.DataFrame()
 
-    area_stats = df.groupby('Area').agg({
-        'Target': 'sum',
-        'Sales': 'sum',
-        'Percentage': ['mean', 'std', 'count'],
-        'Nama': 'count'
+    cube = cube if cube is not None else build_cube(df)
+    level = cube['Area']
+    area_stats = pd.DataFrame({
+        'Total_Target': level['Target_Sum'],
+        'Total_Sales': level['Sales_Sum'],
+        'Avg_Performance': level['Pct_Mean'],
+        'Performance_Std': level['Pct_Std'],
+        'Performance_Count': level['Pct_Count'],
+        'Team_Size': level['Nama_Count'],
     }).round(2)
 
-    area_stats.columns = ['Total_Target', 'Total_Sales', 'Avg_Performance', 'Performance_Std', 'Performance_Count', 'Team_Size']
     area_stats['Achievement_Rate'] = (area_stats['Total_Sales'] / area_stats['Total_Target'] * 100).round(2)
     area_stats = area_stats.sort_values('Achievement_Rate', ascending=False)
     return area_stats
 
-def get_grade_analysis(df):
+def get_grade_analysis(df, cube=None):
     if df.empty:
         return pd.DataFrame()
 
-    grade_stats = df.groupby('Grade').agg({
-        'Target': ['sum', 'mean'],
-        'Sales': ['sum', 'mean'],
-        'Percentage': ['mean', 'std'],
-        'Nama': 'count'
+    cube = cube if cube is not None else build_cube(df)
+    level = cube['Grade']
+    grade_stats = pd.DataFrame({
+        'Total_Target': level['Target_Sum'],
+        'Avg_Target': level['Target_Sum'] / level['Target_Count'],
+        'Total_Sales': level['Sales_Sum'],
+        'Avg_Sales': level['Sales_Sum'] / level['Sales_Count'],
+        'Avg_Performance': level['Pct_Mean'],
+        'Performance_Std': level['Pct_Std'],
+        'Count': level['Nama_Count'],
     }).round(2)
 
-    grade_stats.columns = ['Total_Target', 'Avg_Target', 'Total_Sales', 'Avg_Sales', 'Avg_Performance', 'Performance_Std', 'Count']
     grade_stats['Achievement_Rate'] = (grade_stats['Total_Sales'] / grade_stats['Total_Target'] * 100).round(2)
     return grade_stats
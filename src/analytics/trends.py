@@ -0,0 +1,169 @@
+# src/analytics/trends.py
+"""
+Multi-period trend engine.
+
+Periods are stacked into one long table keyed by salesperson; the trend
+columns are then computed on a (person × period) matrix so every metric is
+one vectorized pass over all people instead of a loop per person.
+"""
+import numpy as np
+import pandas as pd
+
+from src.analytics.bands import categorize_series
+from src.data.data_processor import period_sort_key
+
+TREND_KEYS = ['Nama', 'SubArea', 'Area']
+ROLLING_WINDOW = 3
+STREAK_THRESHOLD = 80
+STREAK_MIN_PERIODS = 3
+
+
+def _normalize_key(series):
+    return series.astype(str).str.strip().str.replace(r'\s+', ' ', regex=True).str.upper()
+
+
+def stack_periods(period_frames, keys=TREND_KEYS):
+    """
+    period_frames: iterable of (period_label, DataFrame).
+    Returns one long table, one row per (person, period). Duplicate rows of the
+    same person inside a period are summed before Percentage is recomputed.
+    """
+    frames = []
+    for period, df in period_frames:
+        if df is None or df.empty:
+            continue
+        part = df[['Area', 'SubArea', 'Nama', 'Grade', 'Target', 'Sales']].copy()
+        part['Period'] = period
+        frames.append(part)
+    if not frames:
+        return pd.DataFrame()
+
+    long_df = pd.concat(frames, ignore_index=True)
+    periods = sorted(long_df['Period'].unique(), key=period_sort_key)
+    long_df['Period_Index'] = long_df['Period'].map({p: i for i, p in enumerate(periods)}).astype('int16')
+    long_df['Period'] = pd.Categorical(long_df['Period'], categories=periods, ordered=True)
+    long_df['Person_Key'] = _normalize_key(long_df[keys[0]])
+    for key in keys[1:]:
+        long_df['Person_Key'] = long_df['Person_Key'] + ' | ' + _normalize_key(long_df[key])
+
+    long_df = (
+        long_df.groupby(['Person_Key', 'Period_Index'], sort=True, observed=True)
+        .agg({
+            'Period': 'first', 'Nama': 'last', 'SubArea': 'last', 'Area': 'last', 'Grade': 'last',
+            'Target': 'sum', 'Sales': 'sum',
+        })
+        .reset_index()
+    )
+    # sama dengan add_derived_columns: Target 0 → ±inf (Sales > 0) atau NaN (0/0)
+    long_df['Percentage'] = (long_df['Sales'] / long_df['Target'] * 100).round(2)
+    long_df['Performance_Category'] = categorize_series(long_df['Percentage'])
+    return long_df
+
+
+def _rolling_sum(matrix, window):
+    # rolling sum along the period axis via cumulative sums (NaN counted as 0)
+    filled = np.nan_to_num(matrix)
+    csum = np.cumsum(filled, axis=1)
+    shifted = np.zeros_like(csum)
+    shifted[:, window:] = csum[:, :-window]
+    return csum - shifted
+
+
+def compute_trends(long_df, window=ROLLING_WINDOW, streak_threshold=STREAK_THRESHOLD):
+    """
+    Adds per-row trend columns to the stacked table:
+    - Delta_Pct / Delta_Sales: change vs the person's previous period
+      (NaN when the person was absent in that previous period)
+    - Rolling_Achievement: Σ Sales / Σ Target over the last `window` periods
+    - Below_Streak: consecutive periods (ending here) below `streak_threshold`
+    - Periods_Active: periods with data so far
+    """
+    if long_df.empty:
+        return long_df
+
+    person_codes, person_keys = pd.factorize(long_df['Person_Key'], sort=False)
+    period_codes = long_df['Period_Index'].to_numpy()
+    n_people, n_periods = len(person_keys), int(period_codes.max()) + 1
+
+    def to_matrix(column):
+        matrix = np.full((n_people, n_periods), np.nan)
+        matrix[person_codes, period_codes] = long_df[column].to_numpy(dtype='float64')
+        return matrix
+
+    target = to_matrix('Target')
+    sales = to_matrix('Sales')
+    pct = to_matrix('Percentage')
+
+    delta_pct = np.full_like(pct, np.nan)
+    with np.errstate(invalid='ignore'):
+        # inf - inf → NaN
+        delta_pct[:, 1:] = pct[:, 1:] - pct[:, :-1]
+    delta_sales = np.full_like(sales, np.nan)
+    delta_sales[:, 1:] = sales[:, 1:] - sales[:, :-1]
+
+    rolling_target = _rolling_sum(target, window)
+    rolling_sales = _rolling_sum(sales, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # seperti Percentage: Σ Target 0 → inf / NaN
+        rolling_achievement = rolling_sales / rolling_target * 100
+
+    # streaks: loop over periods (a handful), vectorized over all people
+    below = pct < streak_threshold
+    streak = np.zeros((n_people, n_periods), dtype='int16')
+    streak[:, 0] = below[:, 0]
+    for t in range(1, n_periods):
+        streak[:, t] = np.where(below[:, t], streak[:, t - 1] + 1, 0)
+
+    periods_active = np.cumsum(~np.isnan(pct), axis=1)
+
+    result = long_df.copy()
+    result['Delta_Pct'] = delta_pct[person_codes, period_codes].round(2)
+    result['Delta_Sales'] = delta_sales[person_codes, period_codes]
+    result['Rolling_Achievement'] = rolling_achievement[person_codes, period_codes].round(2)
+    result['Below_Streak'] = streak[person_codes, period_codes]
+    result['Periods_Active'] = periods_active[person_codes, period_codes].astype('int16')
+    return result
+
+
+def period_summary(trend_df):
+    if trend_df.empty:
+        return pd.DataFrame()
+
+    summary = trend_df.groupby('Period', observed=True).agg({
+        'Target': 'sum',
+        'Sales': 'sum',
+        'Percentage': 'mean',
+        'Person_Key': 'count',
+    })
+    summary.columns = ['Total_Target', 'Total_Sales', 'Avg_Performance', 'Team_Size']
+    summary['Achievement_Rate'] = (summary['Total_Sales'] / summary['Total_Target'] * 100).round(2)
+    summary['Achievement_Delta'] = summary['Achievement_Rate'].diff().round(2)
+    summary['Avg_Performance'] = summary['Avg_Performance'].round(2)
+    return summary
+
+
+def filter_trend_rows(trend_df, area='All', grade='All', category='All', min_pct=None, max_pct=None):
+    """
+    Rows (person × period) matching the sidebar filters, with the same
+    semantics as FilterEngine.select; the trend columns keep the full history.
+    """
+    if trend_df.empty:
+        return trend_df
+    mask = np.ones(len(trend_df), dtype=bool)
+    for column, value in (('Area', area), ('Grade', grade), ('Performance_Category', category)):
+        if value != 'All':
+            mask &= (trend_df[column] == value).to_numpy()
+    if min_pct is not None:
+        mask &= (trend_df['Percentage'] >= min_pct).to_numpy()
+    if max_pct is not None:
+        mask &= (trend_df['Percentage'] <= max_pct).to_numpy()
+    return trend_df if mask.all() else trend_df[mask]
+
+
+def streak_alerts(trend_df, min_periods=STREAK_MIN_PERIODS):
+    """People whose current (last-period) below-threshold streak is at least `min_periods`."""
+    if trend_df.empty:
+        return pd.DataFrame()
+    last_period = trend_df['Period_Index'].max()
+    current = trend_df[(trend_df['Period_Index'] == last_period) & (trend_df['Below_Streak'] >= min_periods)]
+    return current.sort_values(['Below_Streak', 'Rolling_Achievement'], ascending=[False, True])
@@ -0,0 +1,23 @@
+# src/core/__init__.py
+"""
+Streamlit-free analytics core: everything needed to ingest roster files and
+compute the dashboard tables in a plain Python process (batch jobs, CLIs,
+notebooks). Importing this package never imports Streamlit.
+
+Batch reports: python -m src.core.reports csv/ --out reports/
+"""
+from src.analytics.cube import build_cube
+from src.analytics.metrics import calculate_team_metrics, get_area_performance, get_grade_analysis
+from src.data.data_processor import (
+    MissingColumnsError, SalesFileError, concat_periods, describe_file_error,
+    extract_period_from_filename, parse_sales_file, period_sort_key
+)
+from src.data.export import write_workbook
+from src.data.snapshots import expand_sources
+
+__all__ = [
+    'build_cube', 'calculate_team_metrics', 'get_area_performance', 'get_grade_analysis',
+    'MissingColumnsError', 'SalesFileError', 'concat_periods', 'describe_file_error',
+    'extract_period_from_filename', 'parse_sales_file', 'period_sort_key',
+    'write_workbook', 'expand_sources',
+]
@@ -0,0 +1,269 @@
+# src/core/reports.py
+"""
+Batch month-end reports, headless.
+
+Every roster file is one period. Files are parsed in a process pool, and
+each worker writes its period report (KPI, Area, Grade and Data sheets)
+right away. The periods are then combined, and the per-area reports (KPI
+per period, SubArea per period, Data) are written by the pool in batches
+of areas. A summary workbook holds the KPIs per period, achievement per
+Area × period, and the status of every file.
+
+    python -m src.core.reports csv/ --out reports/ [--workers 4]
+
+Output:
+    reports/periods/<period>.xlsx
+    reports/areas/<area>.xlsx
+    reports/summary.xlsx
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import pandas as pd
+
+from src.core import (
+    build_cube, calculate_team_metrics, concat_periods, describe_file_error, expand_sources,
+    extract_period_from_filename, get_area_performance, get_grade_analysis, parse_sales_file,
+    period_sort_key, write_workbook
+)
+from src.data.export import EXPORT_COLUMNS
+
+REPORT_DIR = 'reports'
+# beberapa area per task: overhead pickling & spawn tidak sebanding untuk area kecil
+AREAS_PER_TASK = 8
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|]+')
+
+
+def _safe_filename(label):
+    return _UNSAFE_FILENAME.sub('_', str(label)).strip(' .') or 'unnamed'
+
+
+def kpi_frame(metrics):
+    return pd.DataFrame({'Metric': list(metrics), 'Value': list(metrics.values())})
+
+
+def subarea_performance(df):
+    """Team size, totals and achievement per SubArea (from the cube)."""
+    level = build_cube(df)['SubArea']
+    if level.empty:
+        return pd.DataFrame()
+    table = pd.DataFrame({
+        'Total_Target': level['Target_Sum'],
+        'Total_Sales': level['Sales_Sum'],
+        'Avg_Performance': level['Pct_Mean'],
+        'Team_Size': level['Nama_Count'],
+    }).round(2)
+    table['Achievement_Rate'] = (table['Total_Sales'] / table['Total_Target'] * 100).round(2)
+    return table.sort_values('Achievement_Rate', ascending=False)
+
+
+# ============================================================
+#   REPORTS (dijalankan di worker process)
+# ============================================================
+def write_period_report(df, path):
+    cube = build_cube(df)
+    write_workbook(path, {
+        'KPI': kpi_frame(calculate_team_metrics(df)),
+        'Area': get_area_performance(df, cube),
+        'Grade': get_grade_analysis(df, cube),
+        'Data': df[[column for column in EXPORT_COLUMNS if column in df.columns]],
+    })
+    return path
+
+
+def write_area_report(area, df, path):
+    # KPI per periode dari satu frame area, lewat mask (tanpa sub-frame per periode)
+    periods = df['Period'].cat.remove_unused_categories()
+    codes = periods.cat.codes.to_numpy()
+    kpis = pd.DataFrame(
+        [calculate_team_metrics(df, codes == code) for code in range(len(periods.cat.categories))],
+        index=pd.Index(periods.cat.categories, name='Period'),
+    )
+    subareas = pd.concat(
+        {period: subarea_performance(group) for period, group in df.groupby(periods, observed=True)},
+        names=['Period', 'SubArea'],
+    )
+    write_workbook(path, {
+        'KPI per Period': kpis,
+        'SubArea': subareas,
+        'Data': df[['Period'] + [column for column in EXPORT_COLUMNS if column in df.columns]],
+    })
+    return path
+
+
+def _period_task(source_path, period, path):
+    name = os.path.basename(source_path)
+    try:
+        with open(source_path, 'rb') as f:
+            buffer = io.BytesIO(f.read())
+        buffer.name = name
+        df = parse_sales_file(buffer)
+    except Exception as e:
+        return {'file': name, 'error': describe_file_error(e)}
+
+    try:
+        write_period_report(df, path)
+    except Exception as e:
+        # laporan gagal ditulis → periode dicatat gagal, batch jalan terus
+        return {'file': name, 'error': f"❌ Error writing {os.path.basename(path)}: {e}"}
+    return {'file': name, 'period': period, 'data': df, 'metrics': calculate_team_metrics(df), 'path': path}
+
+
+def _area_task(areas):
+    """{'file', 'path'} per written area report, {'file', 'error'} per area that failed."""
+    results = []
+    for area, df, path in areas:
+        try:
+            results.append({'file': os.path.basename(path), 'path': write_area_report(area, df, path)})
+        except Exception as e:
+            results.append({'file': os.path.basename(path), 'error': f"❌ Error writing area {area}: {e}"})
+    return results
+
+
+# ============================================================
+#   BATCH
+# ============================================================
+def _period_tasks(paths, out_dir):
+    """(source, period, report path) per file; periode ditentukan dari nama file, jadi bisa sebelum parse."""
+    tasks, used = [], set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        period = extract_period_from_filename(os.path.basename(path), default=stem)
+        name = _safe_filename(period)
+        if name in used:
+            # dua file dengan periode sama → nama file sumber ikut di nama laporan
+            name = f"{name} ({_safe_filename(stem)})"
+        used.add(name)
+        tasks.append((path, period, os.path.join(out_dir, 'periods', f"{name}.xlsx")))
+    return tasks
+
+
+def _area_paths(areas, out_dir):
+    """Report path per Area; 'Semarang' / 'SEMARANG' get distinct names (case-insensitive file systems)."""
+    paths, used = [], set()
+    for area in areas:
+        name, suffix = _safe_filename(area), 2
+        while name.lower() in used:
+            name = f"{_safe_filename(area)} ({suffix})"
+            suffix += 1
+        used.add(name.lower())
+        paths.append(os.path.join(out_dir, 'areas', f"{name}.xlsx"))
+    return paths
+
+
+def _run_tasks(fn, task_args, workers, on_error):
+    """
+    fn(*args) for every args tuple; yields results as they finish (inline with one worker).
+    A task that raises (or a worker that dies) yields on_error(args, error) instead of aborting the batch.
+    """
+    if workers <= 1 or len(task_args) <= 1:
+        for args in task_args:
+            try:
+                yield fn(*args)
+            except Exception as e:
+                yield on_error(args, e)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        futures = {pool.submit(fn, *args): args for args in task_args}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield on_error(futures[future], e)
+
+
+def _summary(period_results, combined, failed):
+    ordered = sorted(period_results, key=lambda result: period_sort_key(result['period']))
+    kpis = pd.DataFrame(
+        [result['metrics'] for result in ordered],
+        index=pd.Index([result['period'] for result in ordered], name='Period'),
+    )
+    sheets = {'KPI per Period': kpis}
+    if combined is not None:
+        grouped = combined.groupby(['Area', 'Period'], observed=True)[['Sales', 'Target']].sum()
+        achievement = (grouped['Sales'] / grouped['Target'].where(grouped['Target'] > 0) * 100).round(2)
+        sheets['Area x Period'] = achievement.unstack('Period')
+    files = [
+        {'File': result['file'], 'Period': result['period'], 'Rows': len(result['data']), 'Error': ''}
+        for result in ordered
+    ] + [{'File': result['file'], 'Period': '', 'Rows': 0, 'Error': result['error']} for result in failed]
+    sheets['Files'] = pd.DataFrame(files)
+    return sheets
+
+
+def run_batch(sources, out_dir=REPORT_DIR, workers=None, on_progress=print):
+    """
+    Period, area and summary reports for every roster file in `sources`.
+    Returns {'periods': [...], 'areas': [...], 'failed': [...], 'summary': path}.
+    """
+    paths = expand_sources(sources)
+    workers = workers or os.cpu_count() or 1
+    for folder in ('periods', 'areas'):
+        os.makedirs(os.path.join(out_dir, folder), exist_ok=True)
+
+    period_results, failed = [], []
+    def period_error(args, error):
+        return {'file': os.path.basename(args[0]), 'error': describe_file_error(error)}
+
+    def area_error(args, error):
+        (batch,) = args
+        return [{'file': os.path.basename(path), 'error': f"❌ Error writing area {area}: {error}"} for area, _, path in batch]
+
+    for result in _run_tasks(_period_task, _period_tasks(paths, out_dir), workers, period_error):
+        if 'error' in result:
+            failed.append(result)
+            on_progress(f"❌ {result['file']}: {result['error']}")
+        else:
+            period_results.append(result)
+            on_progress(f"✅ {result['file']} → {result['path']} ({len(result['data']):,} rows)")
+
+    period_results.sort(key=lambda result: period_sort_key(result['period']))
+    combined = concat_periods([(result['period'], result['data']) for result in period_results])
+    area_paths = []
+    if combined is not None:
+        groups = [(str(area), group) for area, group in combined.groupby('Area', observed=True)]
+        areas = [
+            (area, group, path) for (area, group), path in zip(groups, _area_paths([area for area, _ in groups], out_dir))
+        ]
+        batches = [areas[i:i + AREAS_PER_TASK] for i in range(0, len(areas), AREAS_PER_TASK)]
+        for results in _run_tasks(_area_task, [(batch,) for batch in batches], workers, area_error):
+            for result in results:
+                if 'error' in result:
+                    failed.append(result)
+                    on_progress(f"❌ {result['file']}: {result['error']}")
+                else:
+                    area_paths.append(result['path'])
+        on_progress(f"✅ {len(area_paths)} area reports → {os.path.join(out_dir, 'areas')}")
+
+    summary_path = write_workbook(os.path.join(out_dir, 'summary.xlsx'), _summary(period_results, combined, failed))
+    on_progress(f"✅ summary → {summary_path}")
+    return {
+        'periods': [result['path'] for result in period_results],
+        'areas': area_paths,
+        'failed': failed,
+        'summary': summary_path,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch period / area reports from roster files (no Streamlit)")
+    parser.add_argument('sources', nargs='*', default=['csv'], help="Files or folders (default: csv/)")
+    parser.add_argument('--out', default=REPORT_DIR, help="Output folder (default: reports/)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = run_batch(args.sources, args.out, args.workers)
+    print(f"⏱️ {len(result['periods'])} periods, {len(result['areas'])} areas in {time.perf_counter() - start:.1f}s")
+    return 1 if result['failed'] and not result['periods'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# src/data/column_resolver.py
+"""
+Header resolution for uploaded rosters.
+
+Regional files name the same column in many ways ("Sub Area", "NAMA SALES",
+"Tgt", "CA"). Every header is reduced to a normalized key (lowercase ASCII,
+letters and digits only) and looked up in a precompiled alias table; headers
+that still do not match get one close-match pass for typos. Generic headers
+("Kota", "Level") are weak aliases: they only fill a column nothing else
+matched, and are reported separately so the UI can warn about them. The
+mapping is cached per header layout, so repeat uploads with the same columns
+skip resolution entirely.
+"""
+import difflib
+import re
+import unicodedata
+
+from src.utils.cache import LRUCache
+
+REQUIRED_COLUMNS = ['Area', 'SubArea', 'Nama', 'Grade', 'Target', 'Sales']
+
+COLUMN_ALIASES = {
+    'Area': ['area', 'areasales', 'wilayah', 'region', 'regional'],
+    'SubArea': ['subarea', 'subareasales', 'subwilayah', 'subregion', 'cabang', 'branch', 'territory'],
+    'Nama': ['nama', 'name', 'namasales', 'salesname', 'namasalesman', 'salesman', 'salesperson',
+             'namakaryawan', 'karyawan', 'namalengkap'],
+    'Grade': ['grade', 'jabatan'],
+    'Target': ['target', 'tgt', 'trgt', 'targetsales', 'targetbulanan', 'kuota', 'quota'],
+    'Sales': ['sales', 'ca', 'penjualan', 'realisasi', 'aktual', 'actual', 'actualsales', 'omzet'],
+}
+
+# header generik yang di file lain bisa berarti kolom lain (kota domisili, level karyawan):
+# hanya dipakai kalau tidak ada kandidat lain, tidak ikut pencocokan fuzzy
+WEAK_ALIASES = {
+    'Area': ['kota', 'city'],
+    'Grade': ['level', 'posisi', 'position', 'role'],
+}
+
+FUZZY_CUTOFF = 0.8
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+_LAYOUT_CACHE = LRUCache(maxsize=32)
+
+
+def normalize_header(header):
+    text = unicodedata.normalize('NFKD', str(header)).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub('', text.lower())
+
+
+def _build_alias_index(aliases_by_column, include_column=True):
+    index = {}
+    for column, aliases in aliases_by_column.items():
+        for alias in ([column] if include_column else []) + aliases:
+            index[normalize_header(alias)] = column
+    return index
+
+
+_ALIAS_INDEX = _build_alias_index(COLUMN_ALIASES)
+_WEAK_INDEX = _build_alias_index(WEAK_ALIASES, include_column=False)
+_ALIAS_KEYS = list(_ALIAS_INDEX)
+# nama kolom standar yang persis selalu menang, lalu alias, lalu fuzzy, terakhir alias generik
+_MATCH_RANK = {'alias': 1, 'fuzzy': 2, 'weak': 3}
+
+
+def _match(key):
+    """(column, how) for one normalized header, or (None, None)."""
+    column = _ALIAS_INDEX.get(key)
+    if column is not None:
+        return column, 'alias'
+    column = _WEAK_INDEX.get(key)
+    if column is not None:
+        return column, 'weak'
+    if len(key) < 4:
+        # kunci pendek ("ca", "tgt") terlalu mudah tertukar kalau dicocokkan fuzzy
+        return None, None
+    close = difflib.get_close_matches(key, _ALIAS_KEYS, n=1, cutoff=FUZZY_CUTOFF)
+    if close:
+        return _ALIAS_INDEX[close[0]], 'fuzzy'
+    return None, None
+
+
+def header_column(header):
+    """Standard column a single header maps to (alias or fuzzy), or None. Not cached."""
+    if header is None:
+        return None
+    return _match(normalize_header(header))[0]
+
+
+def _resolve(headers):
+    chosen = {}
+    for header in headers:
+        column, how = _match(normalize_header(header))
+        if column is None:
+            continue
+        rank = 0 if header == column else _MATCH_RANK[how]
+        if column not in chosen or rank < chosen[column][1]:
+            chosen[column] = (header, rank, how)
+
+    rename_map = {header: column for column, (header, _, _) in chosen.items() if header != column}
+    matched_by = {column: how for column, (header, _, how) in chosen.items() if header != column}
+    missing = [column for column in REQUIRED_COLUMNS if column not in chosen]
+    return {'rename_map': rename_map, 'missing': missing, 'matched_by': matched_by}
+
+
+def resolve_headers(columns):
+    """
+    Resolve raw headers to REQUIRED_COLUMNS.
+    Returns {'rename_map', 'missing', 'matched_by', 'cached'}; `matched_by`
+    tells for each renamed column whether it came from the alias table, the
+    fuzzy pass or a weak (generic) alias.
+    """
+    layout = tuple(str(col).strip() for col in columns)
+    resolution = _LAYOUT_CACHE.get(layout)
+    cached = resolution is not None
+    if not cached:
+        resolution = _resolve(layout)
+        _LAYOUT_CACHE.put(layout, resolution)
+    return {
+        'rename_map': dict(resolution['rename_map']),
+        'missing': list(resolution['missing']),
+        'matched_by': dict(resolution['matched_by']),
+        'cached': cached,
+    }
+
+
+def describe_mapping(resolution, weak=False):
+    """
+    Short human-readable summary, e.g. "NAMA SALES → Nama, Tgt → Target";
+    only the weak-alias renames when `weak`, all the others otherwise.
+    """
+    return ', '.join(
+        f"{header} → {column}" for header, column in resolution['rename_map'].items()
+        if (resolution['matched_by'].get(column) == 'weak') == weak
+    )
+
+
+def layout_cache_stats():
+    return _LAYOUT_CACHE.stats()
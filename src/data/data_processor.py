@@ -1,78 +1,255 @@
-import streamlit as st
 import pandas as pd
 import numpy as np
 import re
+import io
+import os
+import hashlib
 import openpyxl
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
 
-def process_uploaded_file(uploaded_file):
+from src.analytics.bands import categorize_series
+from src.data.column_resolver import REQUIRED_COLUMNS, resolve_headers
+from src.data.excel_reader import read_roster_xlsx
+from src.utils.cache import LRUCache
+
+# Naikkan setiap kali aturan cleaning / kolom turunan berubah,
+# supaya hasil lama di cache tidak dipakai lagi.
+CLEANING_RULES_VERSION = 3
+
+_UPLOAD_CACHE = LRUCache(maxsize=8)
+
+def upload_cache_key(uploaded_file):
+    if hasattr(uploaded_file, 'getvalue'):
+        content = uploaded_file.getvalue()
+    else:
+        content = uploaded_file.read()
+        uploaded_file.seek(0)
+    digest = hashlib.sha256(content).hexdigest()
+    suffix = 'csv' if uploaded_file.name.endswith('.csv') else 'excel'
+    return (digest, suffix, CLEANING_RULES_VERSION)
+
+def upload_cache_stats():
+    return _UPLOAD_CACHE.stats()
+
+def process_uploaded_file(uploaded_file, on_error=None):
+    # Hasil parse dipakai ulang lintas rerun & session selama isi file sama.
+    # DataFrame yang dikembalikan di-share: perlakukan sebagai read-only.
+    # File yang gagal → None; `on_error(exception)` yang menampilkan pesannya (UI / CLI).
+    key = upload_cache_key(uploaded_file)
+    df = _UPLOAD_CACHE.get(key)
+    if df is not None:
+        return df
+
+    df = _parse_and_clean(uploaded_file, on_error)
+    if df is not None:
+        df.attrs['upload_key'] = key
+        _UPLOAD_CACHE.put(key, df)
+    return df
+
+def upload_dataset_source(frames):
+    # isi file (hash dari upload_cache_key), bukan nama + ukuran: file yang diedit dengan
+    # ukuran sama harus jadi dataset baru untuk cube, filter engine dan cache tab
+    return 'upload:' + '|'.join(df.attrs['upload_key'][0] for df in frames)
+
+# Di bawah ukuran total ini parse berurutan lebih cepat daripada menyalakan worker.
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+def _parse_bytes(name, content):
+    # dijalankan di worker process: input/output harus bisa di-pickle
+    buffer = io.BytesIO(content)
+    buffer.name = name
     try:
+        return parse_sales_file(buffer), None
+    except Exception as e:
+        return None, str(e)
+
+def process_uploaded_files(uploaded_files, on_progress=None, max_workers=None):
+    """
+    Parse several uploads, in a process pool when there is enough data to be
+    worth it. Returns one result per file, in upload order:
+    {'name', 'data', 'error', 'cached'}. A failed file does not stop the others.
+    `on_progress(done, total, name, error)` is called as each file finishes.
+    """
+    results = [{'name': f.name, 'data': None, 'error': None, 'cached': False} for f in uploaded_files]
+    total = len(results)
+    done = 0
+    pending = {}
+
+    for i, uploaded_file in enumerate(uploaded_files):
+        key = upload_cache_key(uploaded_file)
+        df = _UPLOAD_CACHE.get(key)
+        if df is not None:
+            results[i].update(data=df, cached=True)
+            done += 1
+            if on_progress:
+                on_progress(done, total, uploaded_file.name, None)
+        else:
+            pending[i] = (key, uploaded_file.getvalue())
+
+    def finish(i, df, error):
+        nonlocal done
+        results[i].update(data=df, error=error)
+        if df is not None:
+            df.attrs['upload_key'] = pending[i][0]
+            _UPLOAD_CACHE.put(pending[i][0], df)
+        done += 1
+        if on_progress:
+            on_progress(done, total, results[i]['name'], error)
+
+    total_bytes = sum(len(content) for _, content in pending.values())
+    workers = max_workers or min(len(pending), os.cpu_count() or 1)
+    if workers > 1 and total_bytes >= PARALLEL_MIN_BYTES:
+        # spawn: fork dari server Streamlit yang multi-thread bisa deadlock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            futures = {
+                pool.submit(_parse_bytes, results[i]['name'], content): i
+                for i, (_, content) in pending.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    df, error = future.result()
+                except BrokenProcessPool as e:
+                    df, error = None, f"❌ Worker crashed: {e}"
+                finish(futures[future], df, error)
+    else:
+        for i, (_, content) in pending.items():
+            finish(i, *_parse_bytes(results[i]['name'], content))
+
+    return results
+
+def concat_periods(period_frames):
+    """
+    [(period, df), ...] → one dataset with an ordered `Period` column
+    (chronological, via period_sort_key). Input frames are not modified.
+    """
+    frames = [df.assign(Period=period) for period, df in period_frames if df is not None]
+    if not frames:
+        return None
+    periods = sorted({period for period, df in period_frames if df is not None}, key=period_sort_key)
+    combined = pd.concat(frames, ignore_index=True)
+    combined['Period'] = pd.Categorical(combined['Period'], categories=periods, ordered=True)
+    # kategori Area/SubArea/Grade berbeda per file → jadi object setelah concat, diringkas ulang
+    return normalize_schema(combined)
+
+CSV_READ_OPTIONS = {
+    'delimiter': ',',
+    'skipinitialspace': True,
+    'encoding': 'utf-8',
+    'on_bad_lines': 'skip',
+}
+
+def resolve_required_columns(columns):
+    # returns (rename_map, missing_columns); lihat column_resolver untuk alias & cache per layout
+    resolution = resolve_headers(columns)
+    return resolution['rename_map'], resolution['missing']
+
+def add_derived_columns(df):
+    df['Minus/plus'] = df['Sales'] - df['Target']
+    df['Percentage'] = (df['Sales'] / df['Target'] * 100).round(2)
+    df['Performance_Category'] = categorize_series(df['Percentage'])
+    return df
+
+def clean_sales_frame(df):
+    # df sudah memakai nama kolom standar (REQUIRED_COLUMNS)
+    df = df.dropna(subset=REQUIRED_COLUMNS).copy()
+    df['Target'] = pd.to_numeric(df['Target'], errors='coerce')
+    df['Sales'] = pd.to_numeric(df['Sales'], errors='coerce')
+    df = df.dropna(subset=['Target', 'Sales'])
+    return add_derived_columns(df)
+
+# Kolom dengan kardinalitas rendah → category; Target/Sales → int32 bila semua bilangan bulat.
+CATEGORICAL_COLUMNS = ['Area', 'SubArea', 'Grade']
+INTEGER_COLUMNS = ['Target', 'Sales']
+
+def _downcast_integral(series):
+    values = series.to_numpy()
+    if len(values) == 0 or not np.isfinite(values).all():
+        return series
+    if not (values == np.round(values)).all():
+        return series  # pecahan tetap float64 supaya total tidak kehilangan presisi
+    if values.min() < np.iinfo('int32').min or values.max() > np.iinfo('int32').max:
+        return series
+    return series.astype('int32')
+
+def normalize_schema(df):
+    """
+    Enforce the compact roster schema in place of object / 64-bit columns.
+    The memory report ({'bytes_before', 'bytes_after', 'bytes_saved'}) is kept
+    in df.attrs['schema_report'].
+    """
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = _downcast_integral(df[col])
+    if 'Performance_Category' in df.columns and not isinstance(df['Performance_Category'].dtype, pd.CategoricalDtype):
+        df['Performance_Category'] = categorize_series(df['Percentage'])
+
+    bytes_after = int(df.memory_usage(deep=True).sum())
+    df.attrs['schema_report'] = {
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after,
+    }
+    return df
+
+class SalesFileError(ValueError):
+    """Upload that cannot be turned into a roster; str(error) is the message shown to the user."""
+
+class MissingColumnsError(SalesFileError):
+    def __init__(self, missing, available):
+        super().__init__(f"❌ Missing columns: {missing}")
+        self.missing = missing
+        self.available = available
+
+def parse_sales_file(uploaded_file):
+    # versi tanpa Streamlit: raise error, caller yang memutuskan cara menampilkannya
+    if uploaded_file.name.lower().endswith(('.xlsx', '.xlsm')):
+        # streaming read-only: hanya 6 kolom wajib, header dicari otomatis
+        df, resolution = read_roster_xlsx(uploaded_file)
+        if resolution['missing']:
+            raise MissingColumnsError(resolution['missing'], resolution['available'])
+    else:
         if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(
-                uploaded_file,
-                delimiter=',',
-                skipinitialspace=True,
-                encoding='utf-8',
-                on_bad_lines='skip'
-            )
+            df = pd.read_csv(uploaded_file, **CSV_READ_OPTIONS)
         else:
             df = pd.read_excel(uploaded_file, sheet_name=0, engine='openpyxl')
 
         df.columns = df.columns.str.strip()
-        required_columns = ['Area', 'SubArea', 'Nama', 'Grade', 'Target', 'Sales']
-        available_columns = [col.strip() for col in df.columns]
-        missing_columns = []
-
-        for req_col in required_columns:
-            if req_col not in available_columns:
-                found = False
-                for avail_col in available_columns:
-                    if req_col.lower() == avail_col.lower():
-                        df = df.rename(columns={avail_col: req_col})
-                        found = True
-                        break
-                if not found:
-                    missing_columns.append(req_col)
-
-        if missing_columns:
-            st.error(f"❌ Missing columns: {missing_columns}")
-            st.info(f"✅ Available columns: {list(df.columns)}")
-            return None
-
-        df = df.dropna(subset=required_columns)
+        resolution = resolve_headers(df.columns)
+        if resolution['missing']:
+            raise MissingColumnsError(resolution['missing'], list(df.columns))
 
-        try:
-            df['Target'] = pd.to_numeric(df['Target'], errors='coerce')
-            df['Sales'] = pd.to_numeric(df['Sales'], errors='coerce')
-        except Exception as e:
-            st.error(f"Error converting numeric columns: {e}")
-            return None
-
-        df = df.dropna(subset=['Target', 'Sales'])
-
-        df['Minus/plus'] = df['Sales'] - df['Target']
-        df['Percentage'] = (df['Sales'] / df['Target'] * 100).round(2)
-
-        def categorize_performance(percentage):
-            if percentage >= 120:
-                return 'Excellent'
-            elif percentage >= 100:
-                return 'Good'
-            elif percentage >= 80:
-                return 'Average'
-            elif percentage >= 60:
-                return 'Below Average'
-            else:
-                return 'Poor'
-
-        df['Performance_Category'] = df['Percentage'].apply(categorize_performance)
+        df = df.rename(columns=resolution['rename_map'])
 
-        return df
+    try:
+        df = normalize_schema(clean_sales_frame(df))
+    except Exception as e:
+        raise SalesFileError(f"Error converting numeric columns: {e}") from e
+
+    df.attrs['column_mapping'] = resolution
+    return df
 
+def _parse_and_clean(uploaded_file, on_error=None):
+    try:
+        return parse_sales_file(uploaded_file)
     except Exception as e:
-        st.error(f"❌ Error processing file: {str(e)}")
+        if on_error:
+            on_error(e)
         return None
 
-@st.cache_data(ttl=3600)
+def describe_file_error(error):
+    """User-facing message for a failed parse (MissingColumnsError also lists the available columns)."""
+    if isinstance(error, MissingColumnsError):
+        return f"{error}\n✅ Available columns: {error.available}"
+    if isinstance(error, SalesFileError):
+        return str(error)
+    return f"❌ Error processing file: {error}"
+
 def load_sample_data():
     sample_areas = ['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Semarang', 'Yogyakarta']
     sample_data = {
@@ -84,25 +261,10 @@ def load_sample_data():
         'Sales': np.random.randint(15, 60, 100)
     }
     df = pd.DataFrame(sample_data)
-    df['Minus/plus'] = df['Sales'] - df['Target']
-    df['Percentage'] = (df['Sales'] / df['Target'] * 100).round(2)
-
-    def categorize_performance(percentage):
-        if percentage >= 120:
-            return 'Excellent'
-        elif percentage >= 100:
-            return 'Good'
-        elif percentage >= 80:
-            return 'Average'
-        elif percentage >= 60:
-            return 'Below Average'
-        else:
-            return 'Poor'
+    return normalize_schema(add_derived_columns(df))
 
-    df['Performance_Category'] = df['Percentage'].apply(categorize_performance)
-    return df
-
-def extract_period_from_filename(filename):
+def extract_period_from_filename(filename, default=None):
+    # tanpa nama bulan di nama file → `default` (sidebar: periode yang sedang aktif)
     bulan_map = {
         'jan': 'Januari', 'feb': 'Februari', 'mar': 'Maret', 'apr': 'April',
         'mei': 'Mei', 'jun': 'Juni', 'jul': 'Juli', 'agu': 'Agustus',
@@ -135,4 +297,16 @@ def extract_period_from_filename(filename):
         except:
             return f"{found_months[0]} {tahun}"
     else:
-        return st.session_state.periode_data
+        return default
+
+def period_sort_key(period):
+    # "Juli - Agustus 2024" → (2024, 7); label tak dikenal diurutkan paling akhir
+    bulan_list = [
+        "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+        "Juli", "Agustus", "September", "Oktober", "November", "Desember"
+    ]
+    tahun_match = re.search(r'(20\d{2})', period or '')
+    first_word = (period or '').split(' ')[0]
+    if not tahun_match or first_word not in bulan_list:
+        return (9999, 99)
+    return (int(tahun_match.group(1)), bulan_list.index(first_word) + 1)
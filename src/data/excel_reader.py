@@ -0,0 +1,202 @@
+# src/data/excel_reader.py
+"""
+Fast XLSX ingest.
+
+An .xlsx file is a zip of XML parts. Instead of building the openpyxl object
+model (stylesheet, every worksheet's dimensions, cell objects) the sheet XML
+is streamed with iterparse: cached formula values are used as-is (no formula
+objects), styles are never read, the first rows are scanned for the header
+row, and after that only the six required columns are converted and kept.
+Workbooks whose parts cannot be located this way fall back to openpyxl in
+read-only mode.
+"""
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse, fromstring
+
+import openpyxl
+import pandas as pd
+
+from src.data.column_resolver import REQUIRED_COLUMNS, header_column, resolve_headers
+
+# baris judul / kop surat di atas header biasanya tidak lebih dari ini
+HEADER_SCAN_ROWS = 30
+
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_COLUMN_CACHE = {}
+
+
+def _column_index(cell_ref):
+    letters = cell_ref.rstrip('0123456789')
+    index = _COLUMN_CACHE.get(letters)
+    if index is None:
+        index = 0
+        for letter in letters:
+            index = index * 26 + (ord(letter) - 64)
+        index = _COLUMN_CACHE[letters] = index - 1
+    return index
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _shared_strings(archive):
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as part:
+        for _, elem in iterparse(part):
+            if elem.tag == _NS + 'si':
+                # teks biasa (<t>) atau rich text (<r><t>); <rPh> (fonetik) dilewati
+                text = elem.findtext(_NS + 't')
+                if text is None:
+                    text = ''.join(run.findtext(_NS + 't') or '' for run in elem.iter(_NS + 'r'))
+                strings.append(text)
+                elem.clear()
+    return strings
+
+
+def _sheet_part(archive, sheet):
+    workbook = fromstring(archive.read('xl/workbook.xml'))
+    sheets = workbook.find(_NS + 'sheets').findall(_NS + 'sheet')
+    entry = sheets[sheet] if isinstance(sheet, int) else next(s for s in sheets if s.get('name') == sheet)
+    rels = fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    target = next(r.get('Target') for r in rels.iter(_PKG_REL_NS + 'Relationship')
+                  if r.get('Id') == entry.get(_REL_NS + 'id'))
+    return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+
+
+def _iter_xml_rows(archive, part_name, strings, keep):
+    """Yield one {column_index: value} dict per non-empty <row>."""
+    with archive.open(part_name) as part:
+        for _, elem in iterparse(part):
+            if elem.tag != _NS + 'row':
+                continue
+            values = {}
+            position = 0
+            for cell in elem.iter(_NS + 'c'):
+                # atribut r (mis. "C5") opsional; tanpa r, sel berurutan
+                cell_ref = cell.get('r')
+                position = _column_index(cell_ref) if cell_ref else position
+                if keep and position not in keep:
+                    position += 1
+                    continue
+                cell_type = cell.get('t')
+                if cell_type == 'inlineStr':
+                    value = ''.join(t.text or '' for t in cell.iter(_NS + 't'))
+                else:
+                    text = cell.findtext(_NS + 'v')
+                    if not text:
+                        position += 1
+                        continue
+                    if cell_type == 's':
+                        value = strings[int(text)]
+                    elif cell_type in ('str', 'e', 'd'):
+                        value = text
+                    elif cell_type == 'b':
+                        value = text == '1'
+                    else:
+                        value = _number(text)
+                # teks kosong = sel kosong (seperti pd.read_excel / read_csv → NaN)
+                if value != '':
+                    values[position] = value
+                position += 1
+            elem.clear()
+            if values:
+                yield values
+
+
+def _iter_openpyxl_rows(source, sheet, keep):
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+        for row in worksheet.iter_rows(values_only=True):
+            values = {
+                i: value for i, value in enumerate(row)
+                if value is not None and value != '' and (not keep or i in keep)
+            }
+            if values:
+                yield values
+    finally:
+        workbook.close()
+
+
+def iter_sheet_rows(source, sheet=0, keep=None):
+    """
+    Sparse rows ({column_index: value}) of one sheet, cached formula values, no styles.
+    `keep` is a set the caller may fill while iterating (e.g. once the header
+    row is known); from then on only those column indexes are converted.
+    """
+    keep = set() if keep is None else keep
+    archive = zipfile.ZipFile(source)
+    try:
+        part_name = _sheet_part(archive, sheet)
+        strings = _shared_strings(archive)
+    except (KeyError, IndexError, StopIteration, AttributeError):
+        # layout part tidak standar → serahkan ke openpyxl
+        archive.close()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        yield from _iter_openpyxl_rows(source, sheet, keep)
+        return
+    with archive:
+        yield from _iter_xml_rows(archive, part_name, strings, keep)
+
+
+def _find_header(rows):
+    """(row_number, {column_index: header}) of the row matching the most required columns."""
+    best = (0, -1, {})
+    for row_number, values in enumerate(rows):
+        if row_number >= HEADER_SCAN_ROWS:
+            break
+        matched = {header_column(value) for value in values.values()} - {None}
+        if len(matched) > best[1]:
+            best = (row_number, len(matched), values)
+        if len(matched) == len(REQUIRED_COLUMNS):
+            break
+    return best[0], best[2]
+
+
+def read_roster_xlsx(source, sheet=0):
+    """
+    Read one sheet (index or name) of an .xlsx roster.
+    Returns (DataFrame with REQUIRED_COLUMNS only, header resolution); the
+    resolution's 'missing' is non-empty when no usable header row was found.
+    """
+    keep = set()
+    rows = iter_sheet_rows(source, sheet, keep)
+    try:
+        header_row, header_cells = _find_header(rows)
+        headers = {i: str(value).strip() for i, value in sorted(header_cells.items())}
+        resolution = resolve_headers(headers.values())
+        if resolution['missing']:
+            return None, dict(resolution, available=[h for h in headers.values() if h])
+
+        rename_map = resolution['rename_map']
+        positions = {}
+        for position, header in headers.items():
+            column = rename_map.get(header, header)
+            if column in REQUIRED_COLUMNS and column not in positions:
+                positions[column] = position
+        selected = [positions[column] for column in REQUIRED_COLUMNS]
+        keep.update(selected)
+
+        # generator `rows` sudah berada tepat setelah baris header
+        columns = [[] for _ in REQUIRED_COLUMNS]
+        for values in rows:
+            picked = [values.get(position) for position in selected]
+            if all(value is None for value in picked):
+                continue
+            for column, value in zip(columns, picked):
+                column.append(value)
+    finally:
+        rows.close()
+
+    df = pd.DataFrame(dict(zip(REQUIRED_COLUMNS, columns)), columns=REQUIRED_COLUMNS)
+    return df, dict(resolution, header_row=header_row)
@@ -0,0 +1,150 @@
+# src/data/export.py
+"""
+Excel / CSV export of the detailed data.
+
+The workbook is written with xlsxwriter in constant_memory mode: each row is
+flushed to a temporary sheet file as soon as it is written, so memory stays
+flat regardless of row count. Number formats are set per column (values
+stay numeric in Excel), and the rows can optionally be split into one sheet
+per Area.
+"""
+import io
+import re
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+EXPORT_COLUMNS = [
+    'Nama', 'Area', 'SubArea', 'Grade', 'Target',
+    'Sales', 'Minus/plus', 'Percentage', 'Performance_Category'
+]
+
+# format Excel per kolom (padanan format tampilan di tab Detailed Data)
+EXCEL_NUMBER_FORMATS = {
+    'Target': '#,##0',
+    'Sales': '#,##0',
+    'Minus/plus': '+#,##0;-#,##0;0',
+    'Percentage': '0.0"%"',
+}
+
+EXPORT_CHUNK_ROWS = 20_000
+
+# Target 0 → Percentage ±inf; tanpa nan_inf_to_errors xlsxwriter menolak selnya (TypeError).
+# inf ditulis sebagai #DIV/0! di Excel, NaN sudah jadi sel kosong lewat _column_values.
+WORKBOOK_OPTIONS = {'constant_memory': True, 'nan_inf_to_errors': True}
+
+_SHEET_NAME_INVALID = re.compile(r'[\[\]:*?/\\]')
+_SHEET_NAME_MAX = 31
+
+
+def _mixed_values(series):
+    # kolom campuran (mis. tabel KPI Metric/Value): angka tetap angka di Excel, sisanya str
+    values = []
+    for value in series.tolist():
+        if pd.isna(value):
+            values.append(None)
+        elif isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            values.append(value.item() if isinstance(value, np.generic) else value)
+        else:
+            values.append(str(value))
+    return values
+
+
+def _column_values(series):
+    """Column → Python list ready for write_row (NaN → None, categories → str)."""
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True).startswith('mixed'):
+        return _mixed_values(series)
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        values = series.astype(str).to_numpy(dtype=object)
+        values[series.isna().to_numpy()] = None
+        return values.tolist()
+    values = series.to_numpy(dtype='float64', na_value=np.nan)
+    if np.isnan(values).any():
+        return pd.Series(values).astype(object).where(~np.isnan(values), None).tolist()
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.to_numpy().tolist()
+    return values.tolist()
+
+
+def _sheet_names(labels):
+    names, used = [], set()
+    for label in labels:
+        base = _SHEET_NAME_INVALID.sub('_', str(label)).strip("'")[:_SHEET_NAME_MAX] or 'Sheet'
+        name, suffix = base, 2
+        while name.lower() in used:
+            tail = f" ({suffix})"
+            name = base[:_SHEET_NAME_MAX - len(tail)] + tail
+            suffix += 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _write_sheet(workbook, name, df, columns, header_format, column_formats):
+    worksheet = workbook.add_worksheet(name)
+    # constant_memory: format & lebar kolom harus di-set sebelum baris pertama ditulis
+    for i, column in enumerate(columns):
+        width = 28 if column in ('Nama', 'SubArea') else 14
+        worksheet.set_column(i, i, width, column_formats.get(column))
+    worksheet.write_row(0, 0, columns, header_format)
+    worksheet.freeze_panes(1, 0)
+    worksheet.autofilter(0, 0, max(len(df), 1), len(columns) - 1)
+
+    # konversi kolom → list per chunk, supaya memori tetap datar untuk jutaan baris
+    row_number = 1
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        for row in zip(*(_column_values(chunk[column]) for column in columns)):
+            worksheet.write_row(row_number, 0, row)
+            row_number += 1
+
+
+def to_excel_bytes(df, columns=None, per_area=False, sheet_name='Data'):
+    """
+    .xlsx bytes of `df` (rows in the given order). With `per_area`, one
+    sheet per Area (rows keep their order inside each sheet).
+    """
+    columns = [column for column in (columns or EXPORT_COLUMNS) if column in df.columns]
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, WORKBOOK_OPTIONS)
+    header_format = workbook.add_format({'bold': True, 'bg_color': '#D9E1F2', 'border': 1})
+    column_formats = {
+        column: workbook.add_format({'num_format': fmt}) for column, fmt in EXCEL_NUMBER_FORMATS.items()
+    }
+
+    if per_area and 'Area' in df.columns and not df.empty:
+        areas = df['Area'].astype(str)
+        labels = sorted(areas.unique())
+        positions = pd.Series(np.arange(len(df))).groupby(areas.to_numpy()).indices
+        for label, name in zip(labels, _sheet_names(labels)):
+            _write_sheet(workbook, name, df.iloc[positions[label]], columns, header_format, column_formats)
+    else:
+        _write_sheet(workbook, sheet_name, df, columns, header_format, column_formats)
+
+    workbook.close()
+    return buffer.getvalue()
+
+
+def write_workbook(path, sheets):
+    """
+    .xlsx at `path` with one sheet per {name: DataFrame} (report tables:
+    a named index is written as the first column).
+    """
+    workbook = xlsxwriter.Workbook(path, WORKBOOK_OPTIONS)
+    header_format = workbook.add_format({'bold': True, 'bg_color': '#D9E1F2', 'border': 1})
+    column_formats = {
+        column: workbook.add_format({'num_format': fmt}) for column, fmt in EXCEL_NUMBER_FORMATS.items()
+    }
+    for name, df in zip(_sheet_names(sheets), sheets.values()):
+        if any(level is not None for level in df.index.names):
+            df = df.reset_index()
+        df = df.set_axis([str(column) for column in df.columns], axis=1)
+        _write_sheet(workbook, name, df, list(df.columns), header_format, column_formats)
+    workbook.close()
+    return path
+
+
+def to_csv_bytes(df, columns=None):
+    columns = [column for column in (columns or df.columns) if column in df.columns]
+    return df[columns].to_csv(index=False).encode('utf-8')
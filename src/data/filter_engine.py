@@ -0,0 +1,116 @@
+# src/data/filter_engine.py
+"""
+Sidebar filter engine.
+
+Built once per dataset: every filter column is factorized into integer codes
+with a grouped index (row positions per value), and Percentage gets a sorted
+index. A filter combination then starts from the smallest candidate set and
+narrows it with code comparisons / a binary search, so the cost follows the
+size of the selection instead of the size of the file.
+"""
+import numpy as np
+import pandas as pd
+
+from src.data.search_index import NameSearchIndex
+from src.utils.cache import LRUCache
+
+FILTER_COLUMNS = ['Area', 'Grade', 'Performance_Category']
+# hanya ada di dataset multi-periode (concat_periods)
+PERIOD_COLUMN = 'Period'
+
+_ENGINE_CACHE = LRUCache(maxsize=4)
+
+
+class _ValueIndex:
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values, sort=False)
+        self.codes = codes.astype('int32')
+        self.lookup = {value: code for code, value in enumerate(uniques)}
+        # posisi baris per nilai: satu argsort stabil + offset per kode (NaN = -1 di depan)
+        self.positions = np.argsort(self.codes, kind='stable')
+        self.offsets = np.searchsorted(self.codes[self.positions], np.arange(len(uniques) + 1))
+
+    def rows(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self.positions[self.offsets[code]:self.offsets[code + 1]]
+
+    def code(self, value):
+        return self.lookup.get(value, -2)
+
+
+class FilterEngine:
+    def __init__(self, df):
+        self.df = df
+        self.n_rows = len(df)
+        self.indexes = {col: _ValueIndex(df[col]) for col in FILTER_COLUMNS + [PERIOD_COLUMN] if col in df.columns}
+        self.percentage = df['Percentage'].to_numpy(dtype='float64', na_value=np.nan)
+        self.pct_order = np.argsort(self.percentage, kind='stable')
+        self.pct_sorted = self.percentage[self.pct_order]
+        self._search_index = None
+
+    def select(self, area='All', grade='All', category='All', min_pct=None, max_pct=None, period='All'):
+        """Row positions (ascending) matching every active filter; `period` is ignored without a Period column."""
+        value_filters = [
+            (col, value) for col, value in zip(FILTER_COLUMNS + [PERIOD_COLUMN], (area, grade, category, period))
+            if value != 'All' and col in self.indexes
+        ]
+
+        if value_filters:
+            # mulai dari himpunan kandidat terkecil
+            candidate_sets = [(self.indexes[col].rows(value), col) for col, value in value_filters]
+            rows, first_col = min(candidate_sets, key=lambda item: len(item[0]))
+            for col, value in value_filters:
+                if col != first_col and len(rows):
+                    rows = rows[self.indexes[col].codes[rows] == self.indexes[col].code(value)]
+            if min_pct is not None:
+                rows = rows[self.percentage[rows] >= min_pct]
+            if max_pct is not None:
+                rows = rows[self.percentage[rows] <= max_pct]
+            return rows
+
+        lo = 0 if min_pct is None else np.searchsorted(self.pct_sorted, min_pct, side='left')
+        if max_pct is None:
+            # NaN ada di ujung array terurut dan tidak pernah lolos filter rentang
+            hi = self.n_rows - int(np.isnan(self.pct_sorted).sum()) if min_pct is not None else self.n_rows
+        else:
+            hi = np.searchsorted(self.pct_sorted, max_pct, side='right')
+        if lo == 0 and hi == self.n_rows:
+            return np.arange(self.n_rows)
+        return np.sort(self.pct_order[lo:hi])
+
+    def view(self, rows):
+        """Filtered frame; the full dataset is returned as-is (no copy) when nothing is excluded."""
+        if len(rows) == self.n_rows:
+            return self.df
+        return self.df.take(rows)
+
+    def search_index(self):
+        """Trigram name search index over the whole dataset, built on first use."""
+        if self._search_index is None:
+            self._search_index = NameSearchIndex(self.df)
+        return self._search_index
+
+    def apply(self, area='All', grade='All', category='All', min_pct=None, max_pct=None, period='All'):
+        return self.view(self.select(area, grade, category, min_pct, max_pct, period))
+
+    def periods(self):
+        """Periods of a multi-period dataset in chronological order ([] for a single period)."""
+        if PERIOD_COLUMN not in self.indexes:
+            return []
+        present = self.indexes[PERIOD_COLUMN].lookup
+        return [str(period) for period in self.df[PERIOD_COLUMN].cat.categories if period in present]
+
+
+def get_filter_engine(df, dataset_key):
+    engine = _ENGINE_CACHE.get(dataset_key)
+    if engine is None:
+        engine = FilterEngine(df)
+        _ENGINE_CACHE.put(dataset_key, engine)
+    return engine
+
+
+def cached_filter_engine(dataset_key):
+    """Engine already built for `dataset_key` (by the sidebar), or None."""
+    return _ENGINE_CACHE.get(dataset_key)
@@ -0,0 +1,180 @@
+# src/data/search_index.py
+"""
+Trigram search index for salesperson names (and optionally SubArea).
+
+Built once per dataset over the distinct values of each column. Every value
+is normalized (accents stripped, lowercase, punctuation → space) and split
+into character trigrams. Each trigram becomes an integer id, and the
+postings are stored CSR-style: one sorted array of term ids plus an offset
+array per trigram, all built with NumPy.
+
+Matches are exactly those of `str.contains(query, case=False, regex=False)`.
+A query of three or more letters, digits and single spaces resolves by
+intersecting the posting lists of its trigrams, smallest first; candidates
+(plus any non-ASCII values, which normalization may change) are then
+checked for a real case-insensitive substring match. Shorter queries and
+queries with punctuation scan the distinct values instead. When nothing
+matches as a substring, terms are ranked by the share of the padded query
+trigrams they contain (values are padded with a space on both sides, so
+word starts and ends get trigrams of their own), so typos still find the name.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ['Nama', 'SubArea']
+FUZZY_MIN_SCORE = 0.5
+
+_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789 '
+_CHAR_CODE = np.full(256, 255, dtype=np.uint8)
+_CHAR_CODE[np.frombuffer(_ALPHABET.encode('ascii'), dtype=np.uint8)] = np.arange(len(_ALPHABET))
+_BASE = len(_ALPHABET)
+_N_GRAMS = _BASE ** 3
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_text(text):
+    """Accent-insensitive search form: 'José  D’Souza' → 'jose d souza'."""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+
+def _gram_ids(normalized_terms):
+    """(gram_ids, term_ids) of every trigram occurrence, vectorized over all terms at once."""
+    # semua term disambung dengan separator (kode 255) → trigram yang melewati separator dibuang
+    joined = '\x00'.join(normalized_terms).encode('ascii')
+    codes = _CHAR_CODE[np.frombuffer(joined, dtype=np.uint8)].astype(np.int64)
+    lengths = np.fromiter((len(term) for term in normalized_terms), dtype=np.int64, count=len(normalized_terms))
+    term_of_char = np.repeat(np.arange(len(normalized_terms)), lengths + 1)[:len(codes)]
+
+    if len(codes) < 3:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    valid = (first != 255) & (second != 255) & (third != 255)
+    grams = (first * _BASE + second) * _BASE + third
+    return grams[valid], term_of_char[:-2][valid]
+
+
+def _query_grams(normalized_query):
+    grams, _ = _gram_ids([normalized_query])
+    return np.unique(grams)
+
+
+class TrigramIndex:
+    """Trigram postings over a list of distinct terms."""
+
+    def __init__(self, terms):
+        self.terms = np.asarray(terms, dtype=object)
+        self.normalized = np.asarray([normalize_text(term) for term in self.terms], dtype=object)
+        # bentuk pembanding str.contains(case=False): keduanya di-upper()
+        self.folded = [str(term).upper() for term in self.terms]
+        # normalisasi bisa mengubah nilai non-ASCII ('ß', ligatur) → selalu ikut jadi kandidat
+        self.non_ascii = np.flatnonzero([not str(term).isascii() for term in self.terms])
+
+        grams, term_ids = _gram_ids([f" {term} " for term in self.normalized])
+        # pasangan unik (gram, term), urut per gram lalu per term → postings CSR
+        pairs = np.unique(grams * len(self.terms) + term_ids)
+        pair_grams = pairs // max(len(self.terms), 1)
+        self.postings = (pairs % max(len(self.terms), 1)).astype(np.int32)
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(pair_grams, minlength=_N_GRAMS))])
+        self.gram_counts = np.bincount(self.postings, minlength=len(self.terms))
+        self.lengths = np.fromiter((len(term) for term in self.folded), dtype=np.int64, count=len(self.terms))
+
+    def _posting(self, gram):
+        return self.postings[self.offsets[gram]:self.offsets[gram + 1]]
+
+    def search(self, query, fuzzy=True, limit=None):
+        """
+        Ranked (term_index, score) pairs. Substring hits score 3 (exact),
+        2 (prefix), 1.5 (word prefix) or 1 (inside a word); fuzzy hits
+        score below 1 by the share of query trigrams they contain.
+        """
+        if not query or not len(self.terms):
+            return []
+        normalized_query = normalize_text(query)
+
+        if len(normalized_query) >= 3 and normalized_query == query.lower():
+            postings = sorted((self._posting(gram) for gram in _query_grams(normalized_query)), key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            candidates = np.union1d(candidates, self.non_ascii)
+        else:
+            # < 3 karakter atau ada tanda baca / spasi ganda: trigram tidak cukup → scan nilai unik
+            candidates = None
+        term_indexes, scores = self._substring_hits(candidates, query.upper())
+
+        if not len(term_indexes) and fuzzy and normalized_query:
+            grams = _query_grams(f" {normalized_query} ")
+            shared_terms, shared = np.unique(
+                np.concatenate([self._posting(gram) for gram in grams]), return_counts=True
+            )
+            # bagian trigram query yang ada di term (< 1, selalu di bawah hit substring)
+            coverage = shared / len(grams)
+            keep = coverage >= FUZZY_MIN_SCORE
+            term_indexes, scores = shared_terms[keep], 0.99 * coverage[keep]
+        return self._ranked(term_indexes, scores, limit)
+
+    def _ranked(self, term_indexes, scores, limit):
+        # skor tertinggi dulu, lalu nama terpendek (paling spesifik)
+        order = np.lexsort((self.lengths[term_indexes], -scores))
+        if limit:
+            order = order[:limit]
+        return list(zip(term_indexes[order].tolist(), scores[order].tolist()))
+
+    def _substring_hits(self, candidates, folded_query):
+        """Candidates (None = every term) containing the query, with their scores."""
+        folded = self.folded
+        if candidates is None:
+            positions = np.fromiter((term.find(folded_query) for term in folded), dtype=np.int64, count=len(folded))
+            candidates = np.arange(len(folded))
+        else:
+            candidates = np.asarray(candidates, dtype=np.int64)
+            positions = np.fromiter((folded[i].find(folded_query) for i in candidates), dtype=np.int64, count=len(candidates))
+        keep = positions >= 0
+        candidates, positions = candidates[keep], positions[keep]
+
+        word_query = ' ' + folded_query
+        word_prefix = np.fromiter((word_query in folded[i] for i in candidates), dtype=bool, count=len(candidates))
+        scores = np.select(
+            [self.lengths[candidates] == len(folded_query), positions == 0, word_prefix],
+            [3.0, 2.0, 1.5], default=1.0
+        )
+        return candidates, scores
+
+
+class NameSearchIndex:
+    """One TrigramIndex per searchable column of a dataset."""
+
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.indexes = {}
+        for column in columns:
+            if column in df.columns:
+                values = df[column].dropna()
+                self.indexes[column] = TrigramIndex(pd.unique(values.astype(str)))
+
+    def search(self, query, columns=('Nama',), fuzzy=True, limit=None):
+        """{column: [(value, score), ...]} ranked per column."""
+        results = {}
+        for column in columns:
+            index = self.indexes.get(column)
+            if index is not None:
+                results[column] = [(index.terms[i], score) for i, score in index.search(query, fuzzy, limit)]
+        return results
+
+    def match_scores(self, frame, query, columns=('Nama',), fuzzy=True):
+        """
+        Relevance per row of `frame` (0 = no match), best score over
+        `columns`; rows are matched by value, so `frame` may be any subset of
+        the indexed dataset.
+        """
+        scores = np.zeros(len(frame))
+        for column, hits in self.search(query, columns, fuzzy).items():
+            if hits:
+                column_scores = frame[column].astype(object).map(dict(hits)).to_numpy(dtype='float64', na_value=0.0)
+                scores = np.maximum(scores, np.nan_to_num(column_scores))
+        return scores
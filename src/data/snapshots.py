@@ -0,0 +1,227 @@
+# src/data/snapshots.py
+"""
+Columnar snapshot store for the monthly REKAPAN files.
+
+Each period is written once as an uncompressed Arrow IPC file with the derived
+columns already computed, so the dashboard can memory-map it instead of
+re-parsing CSV/XLSX on every cold start.
+
+    python -m src.data.snapshots csv/            # ingest every file in csv/
+    python -m src.data.snapshots excel/ --out snapshots
+"""
+import argparse
+import glob
+import hashlib
+import io
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from src.data.data_processor import (
+    process_uploaded_file, extract_period_from_filename, period_sort_key, CLEANING_RULES_VERSION,
+    CATEGORICAL_COLUMNS, INTEGER_COLUMNS, normalize_schema,
+)
+from src.analytics.bands import PERFORMANCE_CATEGORIES
+
+SNAPSHOT_DIR = 'snapshots'
+SNAPSHOT_SUFFIX = '.arrow'
+SOURCE_PATTERNS = ('*.csv', '*.xlsx', '*.xls')
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+
+def snapshot_schema(integral=True):
+    """
+    Arrow types matching normalize_schema: Area/SubArea/Grade dictionary-encoded,
+    Target/Sales int32. Rosters with fractional values use float64 for Target,
+    Sales and Minus/plus instead.
+    """
+    number = pa.int32() if integral else pa.float64()
+    return pa.schema([
+        ('Area', _CATEGORY),
+        ('SubArea', _CATEGORY),
+        ('Nama', pa.string()),
+        ('Grade', _CATEGORY),
+        ('Target', number),
+        ('Sales', number),
+        ('Minus/plus', pa.int64() if integral else pa.float64()),
+        ('Percentage', pa.float64()),
+        ('Performance_Category', pa.dictionary(pa.int8(), pa.string(), ordered=True)),
+    ])
+
+
+SNAPSHOT_SCHEMA = snapshot_schema()
+
+
+def snapshot_path(source_path, out_dir=SNAPSHOT_DIR):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(out_dir, stem + SNAPSHOT_SUFFIX)
+
+
+def _string_categories(series):
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.inferred_type == 'string':
+        return series
+    return series.astype(str).astype('category')
+
+
+def to_snapshot_table(df, schema=None, categories=None):
+    """
+    Roster frame → Arrow table. Without `schema` the int32 / float64 variant
+    follows the dtypes of `df`. `categories` ({column: [labels]}, updated in
+    place) keeps the dictionaries of consecutive tables prefix-compatible, so
+    one IPC file can take them as dictionary deltas (streaming ingest).
+    """
+    frame = df[SNAPSHOT_SCHEMA.names].copy()
+    if schema is None:
+        schema = snapshot_schema(all(frame[col].dtype == 'int32' for col in INTEGER_COLUMNS))
+    for col in CATEGORICAL_COLUMNS:
+        if categories is None:
+            frame[col] = _string_categories(frame[col])
+            continue
+        labels = frame[col].astype(str)
+        known = categories.setdefault(col, [])
+        seen = set(known)
+        known.extend(label for label in pd.unique(labels) if label not in seen)
+        frame[col] = pd.Categorical(labels, categories=known)
+    frame['Nama'] = frame['Nama'].astype(str)
+    return pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def snapshot_metadata(period, source_file='', source_sha256=''):
+    return {
+        'period': period,
+        'source_file': source_file,
+        'source_sha256': source_sha256,
+        'cleaning_rules_version': str(CLEANING_RULES_VERSION),
+    }
+
+
+def write_snapshot(df, path, period, source_file='', source_sha256=''):
+    table = to_snapshot_table(df).replace_schema_metadata(
+        snapshot_metadata(period, source_file, source_sha256)
+    )
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def ingest_file(source_path, out_dir=SNAPSHOT_DIR):
+    with open(source_path, 'rb') as f:
+        buffer = io.BytesIO(f.read())
+    filename = os.path.basename(source_path)
+    buffer.name = filename
+
+    df = process_uploaded_file(buffer)
+    if df is None:
+        return None
+
+    period = extract_period_from_filename(filename, default=os.path.splitext(filename)[0])
+    return write_snapshot(
+        df, snapshot_path(source_path, out_dir), period,
+        source_file=filename, source_sha256=hashlib.sha256(buffer.getvalue()).hexdigest()
+    )
+
+
+def read_snapshot_metadata(path):
+    with pa.memory_map(path, 'r') as source:
+        schema = pa.ipc.open_file(source).schema
+    return {k.decode(): v.decode() for k, v in (schema.metadata or {}).items()}
+
+
+def load_snapshot(path):
+    # memory_map: file tidak dibaca dulu ke buffer Python, tapi to_pandas tetap menyalin kolom
+    # ke block pandas. Tipe sudah sesuai normalize_schema (dictionary → category, int32), jadi
+    # tidak ada factorize / cast ulang.
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    df = table.to_pandas()
+    df['Performance_Category'] = pd.Categorical(
+        df['Performance_Category'], categories=PERFORMANCE_CATEGORIES, ordered=True
+    )
+    for col in CATEGORICAL_COLUMNS:
+        # snapshot streaming menyimpan dictionary dalam urutan kemunculan; samakan dengan hasil parse
+        if not df[col].cat.categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return normalize_schema(df), metadata
+
+
+def list_snapshots(snapshot_dir=SNAPSHOT_DIR):
+    snapshots = []
+    for path in glob.glob(os.path.join(snapshot_dir, '*' + SNAPSHOT_SUFFIX)):
+        try:
+            metadata = read_snapshot_metadata(path)
+        except (pa.ArrowInvalid, OSError):
+            continue
+        if metadata.get('cleaning_rules_version') != str(CLEANING_RULES_VERSION):
+            continue
+        snapshots.append({'path': path, 'period': metadata.get('period', os.path.basename(path))})
+    return sorted(snapshots, key=lambda s: period_sort_key(s['period']))
+
+
+def load_period_frames(snapshot_dir=SNAPSHOT_DIR, source_dir='csv'):
+    """All periods as [(period, df)]: snapshots if any, else parse `source_dir` directly."""
+    snapshots = list_snapshots(snapshot_dir)
+    if snapshots:
+        frames = []
+        for snap in snapshots:
+            df, metadata = load_snapshot(snap['path'])
+            frames.append((metadata.get('period', snap['period']), df))
+        return frames
+
+    frames = []
+    for pattern in SOURCE_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(source_dir, pattern))):
+            with open(path, 'rb') as f:
+                buffer = io.BytesIO(f.read())
+            buffer.name = os.path.basename(path)
+            df = process_uploaded_file(buffer)
+            if df is not None:
+                default_period = os.path.splitext(buffer.name)[0]
+                frames.append((extract_period_from_filename(buffer.name, default=default_period), df))
+    return sorted(frames, key=lambda item: period_sort_key(item[0]))
+
+
+def expand_sources(sources):
+    """Files and folders → file paths (folders: every SOURCE_PATTERNS file, sorted)."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            for pattern in SOURCE_PATTERNS:
+                paths.extend(sorted(glob.glob(os.path.join(source, pattern))))
+        else:
+            paths.append(source)
+    return paths
+
+
+def ingest_sources(sources, out_dir=SNAPSHOT_DIR):
+    results = []
+    for path in expand_sources(sources):
+        written = ingest_file(path, out_dir)
+        results.append((path, written))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert REKAPAN period files into Arrow snapshots")
+    parser.add_argument('sources', nargs='*', default=['csv'], help="Files or folders to ingest (default: csv/)")
+    parser.add_argument('--out', default=SNAPSHOT_DIR, help="Output folder (default: snapshots/)")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for source, written in ingest_sources(args.sources, args.out):
+        if written:
+            print(f"✅ {source} → {written} ({read_snapshot_metadata(written)['period']})")
+        else:
+            failed += 1
+            print(f"❌ {source}: could not be parsed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+# src/data/streaming.py
+"""
+Streaming CSV ingest with a fixed memory ceiling.
+
+The file is read in chunks; every chunk goes through the same header
+resolution, numeric coercion, bad-row rejection and derived columns as
+`process_uploaded_file`, then is folded into running aggregates (the
+additive cube grain + KPI counters). Optionally each cleaned chunk is
+appended to an Arrow snapshot so the dashboard can memory-map the rows later.
+Memory is bounded by the chunk size and the number of Area×SubArea×Grade
+groups, not by the number of rows.
+
+The running aggregates are saved next to the snapshot (`<snapshot>.aggregates`,
+the grain as Arrow IPC with the KPI counters in its metadata). When that
+snapshot is selected and no filter excludes rows, the dashboard takes its KPI
+cards and aggregation cube from them instead of scanning the rows.
+
+    python -m src.data.streaming big_export.csv --chunksize 200000 --out snapshots/big_export.arrow
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.analytics.bands import PERFORMANCE_CATEGORIES
+from src.analytics.cube import CUBE_GRAIN, cube_grain, merge_grains, cube_from_grain
+from src.data.data_processor import (
+    CSV_READ_OPTIONS, MissingColumnsError, resolve_required_columns, clean_sales_frame,
+    extract_period_from_filename
+)
+from src.data.snapshots import snapshot_schema, snapshot_path, snapshot_metadata, to_snapshot_table
+
+DEFAULT_CHUNKSIZE = 100_000
+AGGREGATES_SUFFIX = '.aggregates'
+# total kolom ini jadi int kalau semua nilainya bulat (seperti normalize_schema / metrics._total)
+_INTEGRAL_TOTALS = {'Target_Sum': 'Target', 'Sales_Sum': 'Sales'}
+
+
+def iter_clean_chunks(source, chunksize=DEFAULT_CHUNKSIZE, stats=None):
+    """Yield cleaned chunks; `stats` (dict) receives rows_read / rows_rejected / chunks."""
+    if stats is None:
+        stats = {}
+    stats.update({'rows_read': 0, 'rows_rejected': 0, 'chunks': 0})
+
+    columns, rename_map = None, None
+    for chunk in pd.read_csv(source, chunksize=chunksize, **CSV_READ_OPTIONS):
+        if columns is None:
+            columns = chunk.columns.str.strip()
+            rename_map, missing_columns = resolve_required_columns(columns)
+            if missing_columns:
+                raise MissingColumnsError(missing_columns, list(columns))
+        chunk.columns = columns
+        chunk = chunk.rename(columns=rename_map)
+
+        clean = clean_sales_frame(chunk)
+        stats['rows_read'] += len(chunk)
+        stats['rows_rejected'] += len(chunk) - len(clean)
+        stats['chunks'] += 1
+        yield clean
+
+
+class RunningAggregates:
+    """Aggregates that can be updated chunk by chunk and finalized at any time."""
+
+    def __init__(self):
+        self.grain = pd.DataFrame()
+        self.rows = 0
+        self.zero_sales = 0
+        self.category_counts = np.zeros(len(PERFORMANCE_CATEGORIES), dtype='int64')
+        self.top = (-np.inf, 'N/A')
+        self.bottom = (np.inf, 'N/A')
+        self.integral = dict.fromkeys(_INTEGRAL_TOTALS, True)
+
+    def update(self, chunk):
+        if chunk.empty:
+            return
+        self.grain = merge_grains([self.grain, cube_grain(chunk)])
+        for total, column in _INTEGRAL_TOTALS.items():
+            values = chunk[column].to_numpy(dtype='float64')
+            self.integral[total] = self.integral[total] and bool((values == np.round(values)).all())
+        self.rows += len(chunk)
+        self.zero_sales += int((chunk['Sales'] == 0).sum())
+        self.category_counts += np.bincount(
+            chunk['Performance_Category'].cat.codes.to_numpy(), minlength=len(PERFORMANCE_CATEGORIES)
+        )
+
+        pct = chunk['Percentage'].to_numpy(dtype='float64', na_value=np.nan)
+        if np.isnan(pct).all():
+            return
+        i_max, i_min = np.nanargmax(pct), np.nanargmin(pct)
+        # strict > / < → kemunculan pertama menang, sama seperti idxmax / idxmin
+        if pct[i_max] > self.top[0]:
+            self.top = (pct[i_max], chunk['Nama'].iloc[i_max])
+        if pct[i_min] < self.bottom[0]:
+            self.bottom = (pct[i_min], chunk['Nama'].iloc[i_min])
+
+    def cube(self):
+        return cube_from_grain(self.grain)
+
+    def _total(self, column):
+        # per kolom: grain.sum() atas baris campuran int/float meng-upcast semuanya ke float
+        total = self.grain[column].sum() if not self.grain.empty else 0
+        return int(total) if self.integral.get(column) else float(total)
+
+    def team_metrics(self):
+        """Same keys and types as `calculate_team_metrics`, computed from the running totals."""
+        totals = {
+            column: self._total(column)
+            for column in ['Target_Sum', 'Sales_Sum', 'Pct_Sum', 'Pct_SumSq', 'Pct_Count']
+        }
+        n = totals['Pct_Count']
+        mean = totals['Pct_Sum'] / n if n else 0
+        std = np.nan
+        if n > 1:
+            with np.errstate(invalid='ignore'):
+                # inf (Target 0) → NaN, seperti std dua-langkah di calculate_team_metrics
+                variance = (totals['Pct_SumSq'] - totals['Pct_Sum'] ** 2 / n) / (n - 1)
+            std = np.sqrt(max(variance, 0)) if not np.isnan(variance) else np.nan
+        counts = dict(zip(PERFORMANCE_CATEGORIES, self.category_counts.tolist()))
+        return {
+            'total_team_size': self.rows,
+            'total_target': totals['Target_Sum'],
+            'total_sales': totals['Sales_Sum'],
+            'overall_achievement': round(totals['Sales_Sum'] / totals['Target_Sum'] * 100, 2) if totals['Target_Sum'] > 0 else 0,
+            'avg_individual_performance': round(mean, 2),
+            'performance_std': round(std, 2) if n else 0,
+            'top_performer': self.top[1],
+            'top_performance': self.top[0] if self.rows else 0,
+            'bottom_performer': self.bottom[1],
+            'bottom_performance': self.bottom[0] if self.rows else 0,
+            'zero_sales_count': self.zero_sales,
+            'excellent_performers': counts['Excellent'],
+            'good_performers': counts['Good'],
+            'needs_improvement': counts['Below Average'] + counts['Poor'],
+        }
+
+    def to_table(self, metadata=None):
+        """The grain as an Arrow table; the KPI counters (and `metadata`) go in the schema metadata."""
+        counters = {
+            'rows': self.rows, 'zero_sales': self.zero_sales,
+            'category_counts': self.category_counts.tolist(),
+            'top': [float(self.top[0]), str(self.top[1])], 'bottom': [float(self.bottom[0]), str(self.bottom[1])],
+            'integral': self.integral,
+        }
+        grain = self.grain.reset_index() if not self.grain.empty else pd.DataFrame(columns=CUBE_GRAIN)
+        table = pa.Table.from_pandas(grain, preserve_index=False)
+        return table.replace_schema_metadata(dict(metadata or {}, aggregates=json.dumps(counters)))
+
+    @classmethod
+    def from_table(cls, table):
+        counters = json.loads(table.schema.metadata[b'aggregates'])
+        aggregates = cls()
+        aggregates.rows, aggregates.zero_sales = counters['rows'], counters['zero_sales']
+        aggregates.category_counts = np.asarray(counters['category_counts'], dtype='int64')
+        aggregates.top, aggregates.bottom = tuple(counters['top']), tuple(counters['bottom'])
+        aggregates.integral = counters['integral']
+        grain = table.to_pandas()
+        if not grain.empty:
+            for column in CUBE_GRAIN:
+                # dictionary streaming berurutan kemunculan; samakan dengan load_snapshot
+                grain[column] = grain[column].astype(str).astype('category')
+            aggregates.grain = grain.set_index(CUBE_GRAIN)
+        return aggregates
+
+
+def aggregates_path(snapshot):
+    return snapshot + AGGREGATES_SUFFIX
+
+
+def write_aggregates(aggregates, snapshot, metadata):
+    """Save `aggregates` next to `snapshot`, tagged with the snapshot metadata it belongs to."""
+    table = aggregates.to_table(metadata)
+    path = aggregates_path(snapshot)
+    with pa.OSFile(path + '.tmp', 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def load_aggregates(snapshot, metadata):
+    """RunningAggregates saved for `snapshot`, or None (no file, or written for other contents / rules)."""
+    path = aggregates_path(snapshot)
+    if not os.path.exists(path):
+        return None
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    saved = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    if any(saved.get(key) != metadata.get(key) for key in ('source_sha256', 'cleaning_rules_version', 'period')):
+        return None
+    return RunningAggregates.from_table(table)
+
+
+def _file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def ingest_csv_streaming(source, chunksize=DEFAULT_CHUNKSIZE, out_path=None, period=None):
+    """
+    Stream `source` (path or file object) through the cleaning rules.
+    Returns {'stats', 'aggregates', 'snapshot'}; rows are only kept on disk
+    (Arrow IPC, one record batch per chunk) when `out_path` is given.
+    """
+    stats = {}
+    aggregates = RunningAggregates()
+    writer = sink = None
+    categories = {}
+
+    if out_path:
+        source_name = os.path.basename(source) if isinstance(source, str) else getattr(source, 'name', '')
+        if period is None:
+            period = extract_period_from_filename(source_name, default=os.path.splitext(source_name)[0])
+        source_sha256 = _file_sha256(source) if isinstance(source, str) else ''
+        # float64: chunk berikutnya bisa saja berisi pecahan; load_snapshot meringkas ke int32 lagi
+        schema = snapshot_schema(integral=False).with_metadata(snapshot_metadata(period, source_name, source_sha256))
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        sink = pa.OSFile(out_path + '.tmp', 'wb')
+        writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    try:
+        for chunk in iter_clean_chunks(source, chunksize, stats):
+            aggregates.update(chunk)
+            if writer is not None and not chunk.empty:
+                writer.write_table(to_snapshot_table(chunk, schema, categories))
+    finally:
+        if writer is not None:
+            writer.close()
+            sink.close()
+
+    if out_path:
+        os.replace(out_path + '.tmp', out_path)
+        write_aggregates(aggregates, out_path, snapshot_metadata(period, source_name, source_sha256))
+    return {'stats': stats, 'aggregates': aggregates, 'snapshot': out_path}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a large CSV export through the cleaning rules")
+    parser.add_argument('source', help="CSV file to ingest")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    parser.add_argument('--out', nargs='?', const='', default=None,
+                        help="Write an Arrow snapshot (default path: snapshots/<file>.arrow)")
+    parser.add_argument('--period', default=None, help="Period label stored in the snapshot metadata")
+    args = parser.parse_args(argv)
+
+    out_path = snapshot_path(args.source) if args.out == '' else args.out
+    result = ingest_csv_streaming(args.source, args.chunksize, out_path, args.period)
+
+    stats = result['stats']
+    metrics = result['aggregates'].team_metrics()
+    print(f"📦 {stats['chunks']} chunks, {stats['rows_read']:,} rows read, {stats['rows_rejected']:,} rejected")
+    print(f"🎯 Achievement {metrics['overall_achievement']}% "
+          f"({metrics['total_sales']:,.0f} / {metrics['total_target']:,.0f}), "
+          f"team {metrics['total_team_size']:,}, zero sales {metrics['zero_sales_count']:,}")
+    if result['snapshot']:
+        print(f"✅ Snapshot → {result['snapshot']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+# src/data/synthetic.py
+"""
+Seeded synthetic rosters for load testing, at any scale.
+
+The profile is fitted once from the real rosters in csv/:
+- how Area is distributed, mapped onto the city gazetteer in
+  src/maps/geocoding.py so every generated Area geocodes;
+- team size per SubArea;
+- the grade mix and the Target values per grade;
+- the Sales/Target ratio, including the zero-sales share;
+- the name tokens.
+
+Generation is vectorized (array draws per column, no per-row Python), so a
+million rows take a few seconds. With `periods`, salespeople keep their
+identity (name, Area/SubArea, Grade, Target and skill) across periods, and
+a `churn` share is replaced by new hires each period.
+
+    python -m src.data.synthetic 1000000 --periods 3 --out synthetic/
+"""
+import argparse
+import glob
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_processor import (
+    add_derived_columns, concat_periods, normalize_schema, parse_sales_file
+)
+from src.maps.geocoding import COORDINATES_BY_ISLAND, get_indonesia_coordinates
+
+ROSTER_COLUMNS = ['Area', 'SubArea', 'Nama', 'Grade', 'Target', 'Sales']
+# relatif ke root repo, bukan cwd (benchmark / CLI bisa dijalankan dari folder mana saja)
+PROFILE_SOURCES = str(Path(__file__).resolve().parents[2] / 'csv' / '*.csv')
+
+# bobot kota gazetteer yang tidak muncul di data asli (relatif terhadap 1 baris asli)
+UNSEEN_AREA_WEIGHT = 1.0
+# variasi Sales antar periode untuk orang yang sama (lognormal sigma)
+PERIOD_NOISE = 0.1
+
+BULAN = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember"
+]
+
+
+# ============================================================
+#   PROFILE (fit sekali dari csv/)
+# ============================================================
+def _gazetteer_cities():
+    cities = {}
+    by_coords = {}
+    for island_cities in COORDINATES_BY_ISLAND.values():
+        for city, coords in island_cities.items():
+            cities.setdefault(city.lower(), city)
+            by_coords.setdefault((coords['lat'], coords['lon']), city)
+    return cities, by_coords
+
+
+def _gazetteer_city(area, cities, by_coords):
+    """Gazetteer city for a roster Area (exact name, else via the geocoder: 'Jogja', 'tng'); None if unknown."""
+    city = cities.get(str(area).lower().strip())
+    if city is not None:
+        return city
+    coords = get_indonesia_coordinates(str(area))
+    return by_coords.get((coords['lat'], coords['lon']))
+
+
+def _name_tokens(names):
+    tokens = pd.Series(names, dtype=object).str.title().str.replace(r'[^A-Za-z ]', ' ', regex=True).str.split()
+    tokens = tokens[tokens.str.len() > 0]
+    first = tokens.str[0].unique()
+    last = tokens[tokens.str.len() > 1].str[-1].unique()
+    return np.sort(first), np.sort(last)
+
+
+@lru_cache(maxsize=4)
+def fit_roster_profile(sources=PROFILE_SOURCES):
+    """Distributions fitted from the real rosters matching the glob `sources`."""
+    frames = []
+    for path in sorted(glob.glob(sources)):
+        with open(path, 'rb') as f:
+            frames.append(parse_sales_file(f))
+    if not frames:
+        raise FileNotFoundError(f"no roster files match {sources!r}")
+    df = pd.concat(frames, ignore_index=True)
+    df['Grade'] = df['Grade'].astype(str).str.strip().str.upper()
+
+    cities, by_coords = _gazetteer_cities()
+    gazetteer = sorted(by_coords.values())
+    real_city = df['Area'].astype(str).map(lambda area: _gazetteer_city(area, cities, by_coords))
+    area_weights = real_city.value_counts().reindex(gazetteer, fill_value=0) + UNSEEN_AREA_WEIGHT
+
+    team_sizes = df.groupby([df['Area'].astype(str), df['SubArea'].astype(str)], observed=True).size()
+    grades = df['Grade'].value_counts(normalize=True)
+    targets = {grade: group.to_numpy(dtype='float64') for grade, group in df.groupby('Grade')['Target']}
+    ratios = (df['Sales'] / df['Target']).replace([np.inf, -np.inf], np.nan).dropna()
+    first_names, last_names = _name_tokens(df['Nama'].astype(str))
+
+    return {
+        'areas': np.asarray(area_weights.index, dtype=object),
+        'area_p': (area_weights / area_weights.sum()).to_numpy(),
+        # satu file = satu periode → rata-rata orang per SubArea per periode
+        'team_size': float(team_sizes.mean() / len(frames)),
+        'grades': np.asarray(grades.index, dtype=object),
+        'grade_p': grades.to_numpy(),
+        'targets': targets,
+        'ratios': ratios.to_numpy(dtype='float64'),
+        'first_names': first_names,
+        'last_names': last_names,
+    }
+
+
+# ============================================================
+#   GENERATE
+# ============================================================
+def _names(rng, n_people, first_names, last_names):
+    """Distinct 'First Last' names (numbered once the token combinations run out)."""
+    n_combinations = len(first_names) * len(last_names)
+    picks = rng.choice(n_combinations, size=min(n_people, n_combinations), replace=False)
+    if n_people > n_combinations:
+        picks = np.concatenate([picks, rng.integers(0, n_combinations, n_people - n_combinations)])
+    names = pd.Series(first_names[picks // len(last_names)] + ' ' + last_names[picks % len(last_names)])
+    if n_people > n_combinations:
+        names.iloc[n_combinations:] += ' ' + pd.Series(np.arange(n_combinations, n_people)).astype(str).to_numpy()
+    return names.to_numpy(dtype=object)
+
+
+def _subareas(rng, area_codes, areas, team_size):
+    """SubArea per person: the first SubArea of an Area carries its name, the rest are numbered."""
+    counts = np.bincount(area_codes, minlength=len(areas))
+    n_subareas = np.maximum(np.ceil(counts / team_size), 1).astype('int64')
+    subarea_index = (rng.random(len(area_codes)) * n_subareas[area_codes]).astype('int64')
+    labels = pd.Series(areas[area_codes], dtype=object)
+    numbered = subarea_index > 0
+    labels[numbered] = labels[numbered] + ' ' + pd.Series(subarea_index[numbered] + 1).astype(str).to_numpy()
+    return labels.to_numpy(dtype=object)
+
+
+def _people(rng, n_people, profile):
+    """Persistent attributes per salesperson: Area, SubArea, Nama, Grade, Target and a skill ratio."""
+    area_codes = rng.choice(len(profile['areas']), size=n_people, p=profile['area_p'])
+    grade_codes = rng.choice(len(profile['grades']), size=n_people, p=profile['grade_p'])
+
+    targets = np.empty(n_people)
+    for code, grade in enumerate(profile['grades']):
+        rows = np.flatnonzero(grade_codes == code)
+        targets[rows] = rng.choice(profile['targets'][grade], size=len(rows))
+
+    return pd.DataFrame({
+        'Area': profile['areas'][area_codes],
+        'SubArea': _subareas(rng, area_codes, profile['areas'], profile['team_size']),
+        'Nama': _names(rng, n_people, profile['first_names'], profile['last_names']),
+        'Grade': profile['grades'][grade_codes],
+        'Target': targets.astype('int64'),
+        'skill': rng.choice(profile['ratios'], size=n_people),
+    })
+
+
+def _sales(rng, people, noise):
+    # nol tetap nol (share zero-sales dari data asli); selain itu skill × noise lognormal
+    ratio = people['skill'].to_numpy() * rng.lognormal(0.0, noise, len(people))
+    return np.round(people['Target'].to_numpy() * ratio).astype('int64')
+
+
+def period_labels(n_periods, start_month=7, start_year=2024):
+    """'Juli - Agustus 2024', ... — the labels extract_period_from_filename produces."""
+    labels = []
+    for i in range(n_periods):
+        month = (start_month - 1 + i) % 12
+        year = start_year + (start_month - 1 + i) // 12
+        labels.append(f"{BULAN[month]} - {BULAN[(month + 1) % 12]} {year}")
+    return labels
+
+
+def _dashboard_frame(roster):
+    return normalize_schema(add_derived_columns(roster))
+
+
+def generate_roster(n_rows, seed=42, periods=None, churn=0.1, raw=False, profile=None):
+    """
+    Synthetic roster of `n_rows` salespeople (per period).
+
+    Without `periods`, one dashboard-ready frame like process_uploaded_file
+    returns. With `periods` (a count or a list of labels), one frame with an
+    ordered Period column, as concat_periods builds. Each period keeps
+    (1 - churn) of the people from the previous one. With `raw`, only the
+    roster columns are returned (plus Period), as they would appear in an
+    uploaded file.
+    """
+    profile = profile or fit_roster_profile()
+    rng = np.random.default_rng(seed)
+
+    if periods is None:
+        people = _people(rng, n_rows, profile)
+        people['Sales'] = _sales(rng, people, PERIOD_NOISE)
+        roster = people[ROSTER_COLUMNS]
+        return roster if raw else _dashboard_frame(roster)
+
+    labels = period_labels(periods) if isinstance(periods, int) else list(periods)
+    # satu pool orang untuk semua periode: n_rows awal + pengganti churn per periode berikutnya
+    n_hires = int(round(n_rows * churn))
+    pool = _people(rng, n_rows + n_hires * (len(labels) - 1), profile)
+
+    active = np.arange(n_rows)
+    next_hire = n_rows
+    period_frames = []
+    for i, label in enumerate(labels):
+        if i:
+            leaving = rng.choice(n_rows, size=n_hires, replace=False)
+            active = active.copy()
+            active[leaving] = np.arange(next_hire, next_hire + n_hires)
+            next_hire += n_hires
+        people = pool.iloc[np.sort(active)].reset_index(drop=True)
+        people['Sales'] = _sales(rng, people, PERIOD_NOISE)
+        roster = people[ROSTER_COLUMNS]
+        period_frames.append((label, roster if raw else add_derived_columns(roster.copy())))
+
+    if raw:
+        return pd.concat([roster.assign(Period=label) for label, roster in period_frames], ignore_index=True)
+    return concat_periods(period_frames)
+
+
+def write_rosters(out_dir, n_rows, seed=42, periods=None, churn=0.1):
+    """One CSV per period in `out_dir`, named so the dashboard reads the period from the file name."""
+    os.makedirs(out_dir, exist_ok=True)
+    roster = generate_roster(n_rows, seed, periods or 1, churn, raw=True)
+    paths = []
+    for label, group in roster.groupby('Period', sort=False):
+        months, year = label.rsplit(' ', 1)
+        first, second = months.split(' - ')
+        if first == BULAN[-1]:
+            # "DESEMBER - JANUARI" dibaca extract_period_from_filename sebagai "Januari - Desember";
+            # bulan awal saja → "Desember - Januari <tahun>", sama dengan label & urutan period_sort_key
+            name = f"ROSTER SINTETIS 21 {first.upper()} {year}.csv"
+        else:
+            name = f"ROSTER SINTETIS 21 {first.upper()} - 20 {second.upper()} {year}.csv"
+        path = os.path.join(out_dir, name)
+        group[ROSTER_COLUMNS].to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic roster CSVs fitted from csv/")
+    parser.add_argument('rows', type=int, help="Salespeople per period")
+    parser.add_argument('--periods', type=int, default=1)
+    parser.add_argument('--churn', type=float, default=0.1, help="Share replaced by new hires each period")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='synthetic', help="Output directory")
+    args = parser.parse_args(argv)
+
+    for path in write_rosters(args.out, args.rows, args.seed, args.periods, args.churn):
+        print(f"→ {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
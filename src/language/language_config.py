@@ -19,6 +19,7 @@ LANGUAGES = {
         'data_filters': "Filter Data",
         'select_area': "Pilih Area",
         'select_grade': "Pilih Grade",
+        'select_period': "Pilih Periode",
         'performance_range': "Rentang Kinerja",
         'min_achievement': "Pencapaian Minimum (%)",
         'max_achievement': "Pencapaian Maksimum (%)",
@@ -43,7 +44,18 @@ LANGUAGES = {
         'search_name': "Cari berdasarkan Nama",
         'sort_by': "Urutkan berdasarkan",
         'export_format': "Format Ekspor",
+        'sheet_per_area': "Satu sheet per Area",
+        'search_subarea': "Cari juga di SubArea",
+        'debug_panel': "Debug: waktu per tahap",
+        'debug_cprofile': "cProfile (rerun berikutnya)",
+        'debug_tracemalloc': "tracemalloc (rerun berikutnya)",
+        'debug_top_functions': "Fungsi terlama (cProfile)",
+        'debug_log': "Log rerun",
+        'fuzzy_matches': "Tidak ada yang persis cocok, menampilkan nama yang mirip dengan",
+        'generate_export': "Buat File Ekspor",
         'records_shown': "Jumlah Record Ditampilkan",
+        'rows_per_page': "Baris per Halaman",
+        'page': "Halaman",
         'avg_achievement': "Rata-rata Pencapaian",
         'total_gap': "Total Minus/Plus",
         'group_achievement': "Pencapaian Group",
@@ -65,6 +77,10 @@ LANGUAGES = {
         'interactive_map': "Peta Interaktif",
         'heatmap': "Heatmap",
         'bubble_map': "Bubble Map",
+        'map_granularity': "Tingkat Detail Peta",
+        'province_map': "Peta Provinsi",
+        'map_zoom': "Zoom Peta",
+        'salesperson': "Salesperson",
         'map_legend': "Legenda Peta",
         'performance_color': "Kode Warna Performa",
         'bubble_size': "Ukuran Bubble",
@@ -72,7 +88,19 @@ LANGUAGES = {
         'area_summary': "Ringkasan Area",
         'regional_analysis': "Analisis Wilayah",
         'top_performing_areas': "Area Berkinerja Terbaik",
-        'areas_need_attention': "Area Perlu Perhatian"
+        'areas_need_attention': "Area Perlu Perhatian",
+        'snapshot_select': "Sumber Data",
+        'snapshot_loaded': "Snapshot dimuat",
+        'sample_data': "Data Contoh",
+        'trends': "Tren",
+        'trends_title': "Tren Kinerja Antar Periode",
+        'trend_identity': "Identitas Sales",
+        'rolling_window': "Jendela Rolling (periode)",
+        'streak_threshold': "Batas Streak",
+        'streak_periods': "Minimal Periode Berturut-turut",
+        'streak_alerts': "Peringatan Streak",
+        'top_improvers': "Kenaikan Terbesar",
+        'top_decliners': "Penurunan Terbesar"
     },
 
     'english': {
@@ -93,6 +121,7 @@ LANGUAGES = {
         'data_filters': "Data Filters",
         'select_area': "Select Area",
         'select_grade': "Select Grade",
+        'select_period': "Select Period",
         'performance_range': "Performance Range",
         'min_achievement': "Minimum Achievement (%)",
         'max_achievement': "Maximum Achievement (%)",
@@ -117,7 +146,18 @@ LANGUAGES = {
         'search_name': "Search Name",
         'sort_by': "Sort By",
         'export_format': "Export Format",
+        'sheet_per_area': "One sheet per Area",
+        'search_subarea': "Also search SubArea",
+        'debug_panel': "Debug: stage timings",
+        'debug_cprofile': "cProfile (next rerun)",
+        'debug_tracemalloc': "tracemalloc (next rerun)",
+        'debug_top_functions': "Slowest functions (cProfile)",
+        'debug_log': "Rerun log",
+        'fuzzy_matches': "No exact match, showing names similar to",
+        'generate_export': "Generate Export File",
         'records_shown': "Records Shown",
+        'rows_per_page': "Rows per Page",
+        'page': "Page",
         'avg_achievement': "Avg Achievement",
         'total_gap': "Total Gap",
         'group_achievement': "Group Achievement",
@@ -139,6 +179,10 @@ LANGUAGES = {
         'interactive_map': "Interactive Map",
         'heatmap': "Heatmap",
         'bubble_map': "Bubble Map",
+        'map_granularity': "Map Granularity",
+        'province_map': "Province Map",
+        'map_zoom': "Map Zoom",
+        'salesperson': "Salesperson",
         'map_legend': "Map Legend",
         'performance_color': "Performance Colors",
         'bubble_size': "Bubble Size",
@@ -146,7 +190,19 @@ LANGUAGES = {
         'area_summary': "Area Summary",
         'regional_analysis': "Regional Analysis",
         'top_performing_areas': "Top Performing Areas",
-        'areas_need_attention': "Areas Needing Attention"
+        'areas_need_attention': "Areas Needing Attention",
+        'snapshot_select': "Data Source",
+        'snapshot_loaded': "Snapshot loaded",
+        'sample_data': "Sample Data",
+        'trends': "Trends",
+        'trends_title': "Multi-Period Performance Trends",
+        'trend_identity': "Salesperson Identity",
+        'rolling_window': "Rolling Window (periods)",
+        'streak_threshold': "Streak Threshold",
+        'streak_periods': "Minimum Consecutive Periods",
+        'streak_alerts': "Streak Alerts",
+        'top_improvers': "Top Improvers",
+        'top_decliners': "Top Decliners"
     }
 }
 
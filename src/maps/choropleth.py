@@ -0,0 +1,261 @@
+# src/maps/choropleth.py
+"""
+Province-level choropleth of achievement.
+
+Geometry comes from the bundled, pre-simplified boundaries in
+province_shapes (loaded once per process). Areas are joined to provinces
+through an index built once per process: province names, a regency/city
+table and the geocoding gazetteer (point-in-polygon). Names the index does
+not know are geocoded and located individually (memoized per name).
+"""
+import re
+from functools import lru_cache
+
+import folium
+import numpy as np
+import pandas as pd
+
+from src.analytics.bands import classify_bands, MAP_COLOR_BANDS
+from src.analytics.cube import build_cube
+from src.maps.geocoding import COORDINATES_BY_ISLAND, ISLAND_CENTERS, INDONESIA_CENTER, _lookup
+from src.maps.province_shapes import load_province_bundle, province_geometries, locate_points
+from src.maps.maps import MAP_OPTIONS
+
+NO_DATA_COLOR = 'lightgray'
+
+# ============================================================
+#   NAMA PROVINSI (nama bundle → nama Indonesia + singkatan)
+#   nama pertama dipakai sebagai label di peta
+# ============================================================
+PROVINCE_ALIASES = {
+    'Aceh': ['Aceh', 'NAD', 'Nanggroe Aceh Darussalam'],
+    'Bali': ['Bali'],
+    'Bangka-Belitung Islands': ['Kepulauan Bangka Belitung', 'Bangka Belitung', 'Babel'],
+    'Banten': ['Banten'],
+    'Bengkulu': ['Bengkulu'],
+    'Central Java': ['Jawa Tengah', 'Jateng'],
+    'Central Kalimantan': ['Kalimantan Tengah', 'Kalteng'],
+    'Central Sulawesi': ['Sulawesi Tengah', 'Sulteng'],
+    'East Java': ['Jawa Timur', 'Jatim'],
+    'East Kalimantan': ['Kalimantan Timur', 'Kaltim'],
+    'East Nusa Tenggara': ['Nusa Tenggara Timur', 'NTT'],
+    'Gorontalo': ['Gorontalo'],
+    'Jakarta Special Capital Region': ['DKI Jakarta', 'Jakarta'],
+    'Jambi': ['Jambi'],
+    'Lampung': ['Lampung'],
+    'Maluku': ['Maluku'],
+    'North Kalimantan': ['Kalimantan Utara', 'Kaltara'],
+    'North Maluku': ['Maluku Utara', 'Malut'],
+    'North Sulawesi': ['Sulawesi Utara', 'Sulut'],
+    'North Sumatra': ['Sumatera Utara', 'Sumut'],
+    'Papua': ['Papua'],
+    'Riau': ['Riau'],
+    'Riau Islands': ['Kepulauan Riau', 'Kepri'],
+    'Southeast Sulawesi': ['Sulawesi Tenggara', 'Sultra'],
+    'South Kalimantan': ['Kalimantan Selatan', 'Kalsel'],
+    'South Sulawesi': ['Sulawesi Selatan', 'Sulsel'],
+    'South Sumatra': ['Sumatera Selatan', 'Sumsel'],
+    'Special Region of Yogyakarta': ['DI Yogyakarta', 'DIY', 'Yogyakarta', 'Jogja', 'Jogjakarta'],
+    'West Java': ['Jawa Barat', 'Jabar'],
+    'West Kalimantan': ['Kalimantan Barat', 'Kalbar'],
+    'West Nusa Tenggara': ['Nusa Tenggara Barat', 'NTB'],
+    'West Papua': ['Papua Barat', 'Papua Barat Daya', 'Pabar'],
+    'West Sulawesi': ['Sulawesi Barat', 'Sulbar'],
+    'West Sumatra': ['Sumatera Barat', 'Sumbar'],
+}
+
+# ============================================================
+#   KABUPATEN / KOTA / KECAMATAN → PROVINSI
+#   (nama area di roster yang tidak ada di gazetteer geocoding)
+# ============================================================
+AREA_PROVINCES = {
+    'Jakarta Special Capital Region': [
+        'Cengkareng', 'Kalideres', 'Kebon Jeruk', 'Grogol', 'Tanjung Priok', 'Kelapa Gading',
+        'Cakung', 'Cilincing', 'Pasar Minggu', 'Kebayoran', 'Cilandak', 'Jagakarsa', 'Cempaka Putih',
+    ],
+    'West Java': [
+        'Ciamis', 'Cianjur', 'Ciawi', 'Cileungsi', 'Cibinong', 'Citeureup', 'Klapanunggal', 'Parung',
+        'Majalengka', 'Kuningan', 'Sumedang', 'Tasik', 'Banjarsari', 'Pangandaran', 'Cikarang',
+        'Soreang', 'Lembang', 'Pelabuhan Ratu', 'Jatinangor', 'Cibubur', 'Gunung Putri',
+    ],
+    'Banten': [
+        'Tanggerang', 'Pandeglang', 'Lebak', 'Rangkasbitung', 'Balaraja', 'Cikupa', 'Ciputat',
+        'Pamulang', 'BSD', 'Serpong',
+    ],
+    'Central Java': [
+        'Demak', 'Kendal', 'Kebumen', 'Klaten', 'Purwokerto', 'Banyumas', 'Salatiga', 'Sragen',
+        'Boyolali', 'Sukoharjo', 'Karanganyar', 'Wonogiri', 'Jepara', 'Pati', 'Rembang', 'Blora',
+        'Grobogan', 'Purwodadi', 'Temanggung', 'Wonosobo', 'Purbalingga', 'Banjarnegara', 'Batang',
+        'Pemalang', 'Ungaran', 'Ambarawa',
+    ],
+    'Special Region of Yogyakarta': ['Sleman', 'Bantul', 'Gunung Kidul', 'Wonosari', 'Kulon Progo', 'Wates'],
+    'East Java': [
+        'Ponorogo', 'Pacitan', 'Ngawi', 'Magetan', 'Nganjuk', 'Tulungagung', 'Blitar', 'Trenggalek',
+        'Jombang', 'Mojokerto', 'Pasuruan', 'Probolinggo', 'Lumajang', 'Bondowoso', 'Situbondo',
+        'Lamongan', 'Tuban', 'Bojonegoro', 'Bangkalan', 'Sampang', 'Pamekasan', 'Sumenep', 'Batu',
+    ],
+    'Bali': ['Badung', 'Tabanan', 'Negara', 'Jembrana', 'Gianyar', 'Klungkung', 'Bangli', 'Karangasem',
+             'Buleleng', 'Singaraja', 'Kuta'],
+    'North Sumatra': ['Binjai', 'Deli Serdang', 'Pematangsiantar', 'Siantar', 'Tebing Tinggi', 'Sibolga'],
+    'Bangka-Belitung Islands': ['Pangkal Pinang', 'Pangkalpinang', 'Bangka', 'Belitung'],
+    'Papua': ['Jayapura', 'Merauke', 'Timika', 'Nabire', 'Wamena', 'Biak'],
+}
+
+# prefix administratif yang dibuang sebelum lookup ("KAB TASIK" → "tasik")
+_ADMIN_PREFIX = re.compile(r'^(kabupaten|kab|kota|kec|kecamatan|kodya|prov|provinsi)\b\.?\s*')
+_ADMIN_SUFFIX = re.compile(r'\s+(kota|kab|kabupaten)$')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+# titik tengah pulau/negara dari geocoding bukan lokasi kota → tidak dipakai untuk join
+_ISLAND_LEVEL_COORDS = {(c['lat'], c['lon']) for c in [INDONESIA_CENTER, *ISLAND_CENTERS.values()]}
+
+
+def area_key(name):
+    text = str(name).lower().strip()
+    text = _ADMIN_SUFFIX.sub('', _ADMIN_PREFIX.sub('', text))
+    return _NON_ALNUM.sub('', text)
+
+
+@lru_cache(maxsize=1)
+def province_index():
+    """normalized area/province name → province index (bundle order), built once per process."""
+    names = load_province_bundle()['names']
+    position = {name: i for i, name in enumerate(names)}
+    index = {}
+
+    # gazetteer kota → provinsi lewat point-in-polygon (prioritas terendah, ditimpa tabel eksplisit)
+    cities = [(city, coords) for island in COORDINATES_BY_ISLAND.values() for city, coords in island.items()]
+    located = locate_points([c['lat'] for _, c in cities], [c['lon'] for _, c in cities])
+    for (city, _), province in zip(cities, located):
+        if province >= 0:
+            index[area_key(city)] = int(province)
+
+    for province, areas in AREA_PROVINCES.items():
+        for area in areas:
+            index[area_key(area)] = position[province]
+    for province, aliases in PROVINCE_ALIASES.items():
+        for alias in [province] + aliases:
+            index[area_key(alias)] = position[province]
+    return index
+
+
+@lru_cache(maxsize=4096)
+def _locate_area(name):
+    province = province_index().get(area_key(name))
+    if province is not None:
+        return province
+    coords = _lookup(str(name).lower().strip())
+    if (coords['lat'], coords['lon']) in _ISLAND_LEVEL_COORDS:
+        return -1
+    return int(locate_points([coords['lat']], [coords['lon']])[0])
+
+
+def area_provinces(areas):
+    """Province name per area (None when unknown), aligned to `areas`."""
+    areas = pd.Series(areas)
+    codes, uniques = pd.factorize(areas)
+    names = np.asarray(load_province_bundle()['names'] + [None], dtype=object)
+    located = np.array([_locate_area(str(area)) for area in uniques] + [-1], dtype='int64')
+    # kode -1 (NaN / tidak dikenal) → elemen terakhir (None)
+    return pd.Series(names[located[codes]], index=areas.index)
+
+
+def tolerance_for_zoom(zoom):
+    """
+    Level index of the coarsest tolerance that stays under one screen pixel
+    at `zoom` (256 px Web Mercator tiles; degrees per pixel at the equator).
+    """
+    tolerances = load_province_bundle()['tolerances']
+    pixel = 360.0 / (256 * 2 ** zoom)
+    fitting = [level for level, tolerance in enumerate(tolerances) if tolerance <= pixel]
+    return max(fitting, key=lambda level: tolerances[level]) if fitting else int(np.argmin(tolerances))
+
+
+PROVINCE_STAT_COLUMNS = ['Sales', 'Target', 'Team', 'Achievement_Rate', 'Avg_Performance', 'Areas']
+
+
+def province_stats(df, cube=None):
+    """Per-province Sales/Target/Team/achievement from the Area level of the cube."""
+    level = (cube if cube is not None else build_cube(df))['Area']
+    if level.empty:
+        # seleksi kosong → level cube tanpa kolom
+        empty = pd.DataFrame(columns=PROVINCE_STAT_COLUMNS, dtype='float64')
+        empty['Areas'] = empty['Areas'].astype(object)
+        empty.attrs['unmatched_areas'] = []
+        return empty
+    provinces = area_provinces(level.index.to_series().astype(str))
+    known = provinces.notna().to_numpy()
+    grouped = level[known].groupby(provinces[known].to_numpy()).agg(
+        Sales=('Sales_Sum', 'sum'), Target=('Target_Sum', 'sum'), Team=('Nama_Count', 'sum'),
+        Pct_Sum=('Pct_Sum', 'sum'), Pct_Count=('Pct_Count', 'sum'),
+    )
+    grouped['Achievement_Rate'] = (grouped['Sales'] / grouped['Target'].where(grouped['Target'] > 0) * 100).round(2)
+    grouped['Avg_Performance'] = (grouped['Pct_Sum'] / grouped['Pct_Count'].where(grouped['Pct_Count'] > 0)).round(2)
+    grouped['Areas'] = pd.Series(level.index[known].astype(str), index=provinces[known].to_numpy()).groupby(level=0).agg(', '.join)
+    grouped.attrs['unmatched_areas'] = level.index[~known].astype(str).tolist()
+    return grouped.drop(columns=['Pct_Sum', 'Pct_Count'])
+
+
+def _province_features(stats, level):
+    names = load_province_bundle()['names']
+    stats = stats.reindex(names)
+    colors = np.where(stats['Achievement_Rate'].notna(),
+                      classify_bands(stats['Achievement_Rate'].to_numpy(dtype='float64'), MAP_COLOR_BANDS),
+                      NO_DATA_COLOR)
+    features = []
+    # geometri dipakai bersama (tidak dicopy), hanya properties yang baru per render
+    for i, (name, geometry, color, row) in enumerate(zip(names, province_geometries(level), colors,
+                                                          stats.itertuples(index=False))):
+        has_data = row.Achievement_Rate == row.Achievement_Rate
+        features.append({
+            'type': 'Feature',
+            'id': i,
+            'geometry': geometry,
+            'properties': {
+                'name': PROVINCE_ALIASES.get(name, [name])[0],
+                'color': color,
+                'achievement': f"{row.Achievement_Rate:.1f}%" if has_data else '-',
+                'performance': f"{row.Avg_Performance:.1f}%" if has_data else '-',
+                'sales': f"{row.Sales:,.0f}" if has_data else '-',
+                'target': f"{row.Target:,.0f}" if has_data else '-',
+                'team': f"{row.Team:,.0f}" if has_data else '-',
+                'areas': row.Areas if isinstance(row.Areas, str) else '-',
+            },
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def _province_style(feature):
+    color = feature['properties']['color']
+    return {
+        'fillColor': color, 'color': '#555555', 'weight': 1,
+        'fillOpacity': 0.25 if color == NO_DATA_COLOR else 0.7,
+    }
+
+
+def create_province_choropleth(df, cube=None, zoom_start=5, tiles=None, stats=None):
+    """
+    Folium map with one polygon per province, colored by achievement rate
+    (MAP_COLOR_BANDS). `zoom_start` picks the simplification tolerance;
+    `stats` may be a precomputed province_stats() result.
+    """
+    province_map = folium.Map(
+        location=[-2.5489, 118.0149],
+        zoom_start=zoom_start,
+        tiles=tiles or MAP_OPTIONS['tiles']
+    )
+    if df.empty:
+        return province_map
+
+    stats = stats if stats is not None else province_stats(df, cube)
+    folium.GeoJson(
+        _province_features(stats, tolerance_for_zoom(zoom_start)),
+        name='Provinsi',
+        style_function=_province_style,
+        highlight_function=lambda feature: {'weight': 3, 'color': '#222222'},
+        tooltip=folium.GeoJsonTooltip(fields=['name', 'achievement'], aliases=['Provinsi', 'Achievement']),
+        popup=folium.GeoJsonPopup(
+            fields=['name', 'achievement', 'performance', 'sales', 'target', 'team', 'areas'],
+            aliases=['Provinsi', 'Achievement', 'Avg Performance', 'Sales', 'Target', 'Team', 'Area'],
+        ),
+    ).add_to(province_map)
+    return province_map
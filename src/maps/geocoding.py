@@ -0,0 +1,320 @@
+# src/maps/geocoding.py
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+#   MASTER KOORDINAT KOTA INDONESIA — LENGKAP & AKURAT
+#   (tabel dibangun sekali per proses, bukan per panggilan)
+# ============================================================
+
+COORDINATES_BY_ISLAND = {
+
+    # =======================
+    #        JAWA
+    # =======================
+    'JAWA': {
+        # DKI Jakarta
+        'Jakarta': {'lat': -6.2088, 'lon': 106.8456},
+        'Jakarta Pusat': {'lat': -6.1821, 'lon': 106.8415},
+        'Jakarta Utara': {'lat': -6.1380, 'lon': 106.8823},
+        'Jakarta Barat': {'lat': -6.1767, 'lon': 106.7559},
+        'Jakarta Selatan': {'lat': -6.2660, 'lon': 106.8133},
+        'Jakarta Timur': {'lat': -6.2250, 'lon': 106.9000},
+
+        # Jawa Barat
+        'Bandung': {'lat': -6.9175, 'lon': 107.6191},
+        'Bekasi': {'lat': -6.2349, 'lon': 106.9920},
+        'Depok': {'lat': -6.4025, 'lon': 106.7942},
+        'Bogor': {'lat': -6.5944, 'lon': 106.7892},
+        'Cirebon': {'lat': -6.7320, 'lon': 108.5523},
+        'Sukabumi': {'lat': -6.9270, 'lon': 106.9310},
+        'Tasikmalaya': {'lat': -7.3274, 'lon': 108.2207},
+        'Banjar': {'lat': -7.1955, 'lon': 108.5346},
+        'Garut': {'lat': -7.2279, 'lon': 107.9087},
+        'Subang': {'lat': -6.5750, 'lon': 107.7576},
+        'Karawang': {'lat': -6.3050, 'lon': 107.3050},
+        'Cimahi': {'lat': -6.8722, 'lon': 107.5422},
+        'Purwakarta': {'lat': -6.5569, 'lon': 107.4434},
+        'Indramayu': {'lat': -6.3364, 'lon': 108.3250},
+
+        # Jawa Tengah
+        'Semarang': {'lat': -6.9667, 'lon': 110.4167},
+        'Solo': {'lat': -7.5666, 'lon': 110.8167},
+        'Surakarta': {'lat': -7.5666, 'lon': 110.8167},
+        'Tegal': {'lat': -6.8698, 'lon': 109.1256},
+        'Brebes': {'lat': -6.8783, 'lon': 109.0484},
+        'Cilacap': {'lat': -7.7325, 'lon': 109.0139},
+        'Magelang': {'lat': -7.4705, 'lon': 110.2170},
+        'Kudus': {'lat': -6.8041, 'lon': 110.8405},
+        'Pekalongan': {'lat': -6.8898, 'lon': 109.6753},
+
+        # Jawa Timur
+        'Surabaya': {'lat': -7.2575, 'lon': 112.7521},
+        'Malang': {'lat': -7.9666, 'lon': 112.6326},
+        'Sidoarjo': {'lat': -7.4469, 'lon': 112.7183},
+        'Gresik': {'lat': -7.1630, 'lon': 112.6550},
+        'Madiun': {'lat': -7.6297, 'lon': 111.5130},
+        'Kediri': {'lat': -7.8480, 'lon': 112.0178},
+        'Jember': {'lat': -8.1724, 'lon': 113.7000},
+        'Banyuwangi': {'lat': -8.2196, 'lon': 114.3695},
+
+        # DIY
+        'Yogyakarta': {'lat': -7.7956, 'lon': 110.3695},
+
+        # Banten
+        'Tangerang': {'lat': -6.1783, 'lon': 106.6319},
+        'Tangerang Selatan': {'lat': -6.2886, 'lon': 106.7176},
+        'Serang': {'lat': -6.1120, 'lon': 106.1503},
+        'Cilegon': {'lat': -6.0023, 'lon': 106.0113},
+    },
+
+    # =======================
+    #      SUMATERA
+    # =======================
+    'SUMATERA': {
+        'Medan': {'lat': 3.5952, 'lon': 98.6722},
+        'Pekanbaru': {'lat': 0.5071, 'lon': 101.4478},
+        'Padang': {'lat': -0.9492, 'lon': 100.3543},
+        'Palembang': {'lat': -2.9761, 'lon': 104.7754},
+        'Jambi': {'lat': -1.6101, 'lon': 103.6131},
+        'Banda Aceh': {'lat': 5.5483, 'lon': 95.3238},
+        'Batam': {'lat': 1.0456, 'lon': 104.0305},
+        'Tanjungpinang': {'lat': 0.9181, 'lon': 104.4586},
+        'Lampung': {'lat': -5.4500, 'lon': 105.2667},
+        'Bandar Lampung': {'lat': -5.4500, 'lon': 105.2667}
+    },
+
+    # =======================
+    #   KALIMANTAN
+    # =======================
+    'KALIMANTAN': {
+        'Balikpapan': {'lat': -1.2680, 'lon': 116.8283},
+        'Banjarmasin': {'lat': -3.3186, 'lon': 114.5944},
+        'Pontianak': {'lat': -0.0374, 'lon': 109.3441},
+        'Samarinda': {'lat': -0.5022, 'lon': 117.1536},
+        'Tarakan': {'lat': 3.3270, 'lon': 117.5785},
+    },
+
+    # =======================
+    #    SULAWESI
+    # =======================
+    'SULAWESI': {
+        'Makassar': {'lat': -5.1477, 'lon': 119.4327},
+        'Manado': {'lat': 1.4748, 'lon': 124.8421},
+        'Palu': {'lat': -0.9000, 'lon': 119.8700},
+        'Kendari': {'lat': -3.9670, 'lon': 122.5947},
+        'Gorontalo': {'lat': 0.5400, 'lon': 123.0600},
+    },
+
+    # =======================
+    #   BALI – NUSA TENGGARA
+    # =======================
+    'BALI_NUSA_TENGGARA': {
+        'Denpasar': {'lat': -8.6705, 'lon': 115.2126},
+        'Bali': {'lat': -8.4095, 'lon': 115.1889},
+        'Mataram': {'lat': -8.5833, 'lon': 116.1167},
+        'Kupang': {'lat': -10.1772, 'lon': 123.6070},
+        'Lombok': {'lat': -8.6500, 'lon': 116.3249},
+    },
+
+    # =======================
+    #     MALUKU – PAPUA
+    # =======================
+    'MALUKU_PAPUA': {
+        'Ambon': {'lat': -3.6954, 'lon': 128.1814},
+        'Jayapura': {'lat': -2.5333, 'lon': 140.7167},
+        'Sorong': {'lat': -0.8762, 'lon': 131.2558},
+        'Manokwari': {'lat': -0.8615, 'lon': 134.0620},
+        'Ternate': {'lat': 0.7900, 'lon': 127.3800},
+    }
+}
+
+# =====================================================
+#  ABBREVIATION MAP (biar "tng" → Tangerang)
+# =====================================================
+ABBREV_MAP = {
+    # Jawa Barat / Banten
+    'tgr': ('Tangerang', 'JAWA'),
+    'tng': ('Tangerang', 'JAWA'),
+    'tngsel': ('Tangerang Selatan', 'JAWA'),
+    'bdg': ('Bandung', 'JAWA'),
+    'bgr': ('Bogor', 'JAWA'),
+    'dpk': ('Depok', 'JAWA'),
+    'tsm': ('Tasikmalaya', 'JAWA'),
+    'cmi': ('Cimahi', 'JAWA'),
+    'cjr': ('Cirebon', 'JAWA'),
+
+    # Jawa Tengah
+    'slo': ('Solo', 'JAWA'),
+    'skt': ('Surakarta', 'JAWA'),
+
+    # Jawa Timur
+    'sby': ('Surabaya', 'JAWA'),
+    'mlg': ('Malang', 'JAWA'),
+
+    # Sumatera
+    'mdn': ('Medan', 'SUMATERA'),
+    'pku': ('Pekanbaru', 'SUMATERA'),
+    'plg': ('Palembang', 'SUMATERA'),
+
+    # Kalimantan
+    'bjm': ('Banjarmasin', 'KALIMANTAN'),
+    'bpn': ('Balikpapan', 'KALIMANTAN'),
+    'smr': ('Samarinda', 'KALIMANTAN'),
+
+    # Sulawesi
+    'mks': ('Makassar', 'SULAWESI'),
+    'mnd': ('Manado', 'SULAWESI'),
+
+    # Bali
+    'dps': ('Denpasar', 'BALI_NUSA_TENGGARA'),
+}
+
+# =====================================================
+#  KEYWORD PULAU (fallback) + TITIK TENGAH PULAU
+# =====================================================
+ISLAND_KEYWORDS = {
+    'JAWA': ['jawa', 'jabar', 'jateng', 'jatim', 'bandung', 'jakarta'],
+    'SUMATERA': ['sumatera', 'aceh', 'padang', 'palembang'],
+    'KALIMANTAN': ['kalimantan', 'banjar', 'balikpapan'],
+    'SULAWESI': ['sulawesi'],
+    'BALI_NUSA_TENGGARA': ['bali', 'lombok', 'kupang', 'ntb', 'ntt'],
+    'MALUKU_PAPUA': ['papua', 'maluku', 'ambon']
+}
+
+ISLAND_CENTERS = {
+    'JAWA': {'lat': -7.5, 'lon': 110.0},
+    'SUMATERA': {'lat': 0.0, 'lon': 101.0},
+    'KALIMANTAN': {'lat': -2.0, 'lon': 114.0},
+    'SULAWESI': {'lat': -2.5, 'lon': 121.0},
+    'BALI_NUSA_TENGGARA': {'lat': -8.5, 'lon': 116.5},
+    'MALUKU_PAPUA': {'lat': -4.0, 'lon': 138.0},
+}
+
+INDONESIA_CENTER = {'lat': -2.5489, 'lon': 118.0149}
+
+
+# ============================================================
+#   AHO-CORASICK — semua keyword (abbrev, kota, pulau) di-scan
+#   sekali jalan; tiap pattern punya rank = urutan prioritas lama
+# ============================================================
+class _KeywordAutomaton:
+    def __init__(self, patterns):
+        # patterns: list of (keyword, rank)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for keyword, rank in patterns:
+            state = 0
+            for ch in keyword:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append(rank)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0) if state else 0
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def matched_ranks(self, text):
+        ranks = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            ranks.update(self.output[state])
+        return ranks
+
+
+def _build_index():
+    exact = {}
+    patterns = []   # (keyword, rank)
+    results = []    # rank → coords
+
+    # Tahap 1 — abbreviation, urutan sesuai ABBREV_MAP
+    for abbr, (full_name, island) in ABBREV_MAP.items():
+        patterns.append((abbr, len(results)))
+        results.append(COORDINATES_BY_ISLAND[island][full_name])
+    abbrev_end = len(results)
+
+    # Tahap 2 & 3 — exact (hash) dan partial (substring) nama kota
+    for island, cities in COORDINATES_BY_ISLAND.items():
+        for city, coords in cities.items():
+            exact.setdefault(city.lower(), coords)
+            patterns.append((city.lower(), len(results)))
+            results.append(coords)
+    city_end = len(results)
+
+    # Tahap 4 — keyword pulau
+    for island, keywords in ISLAND_KEYWORDS.items():
+        for keyword in keywords:
+            patterns.append((keyword, len(results)))
+            results.append(ISLAND_CENTERS[island])
+
+    return exact, _KeywordAutomaton(patterns), results, abbrev_end, city_end
+
+
+_EXACT_INDEX, _AUTOMATON, _RANK_RESULTS, _ABBREV_END, _CITY_END = _build_index()
+
+
+@lru_cache(maxsize=4096)
+def _lookup(area_lower):
+    ranks = _AUTOMATON.matched_ranks(area_lower)
+
+    abbrev_hits = [r for r in ranks if r < _ABBREV_END]
+    if abbrev_hits:
+        return _RANK_RESULTS[min(abbrev_hits)]
+
+    if area_lower in _EXACT_INDEX:
+        return _EXACT_INDEX[area_lower]
+
+    if ranks:
+        # rank kota < rank pulau, jadi min() otomatis mengikuti prioritas lama
+        return _RANK_RESULTS[min(ranks)]
+
+    return INDONESIA_CENTER
+
+
+def get_indonesia_coordinates(area_name):
+    return dict(_lookup(area_name.lower().strip()))
+
+
+def geocode_series(areas, fallback=None):
+    """
+    Vectorized geocoding: one lookup per unique area, returns a lat/lon DataFrame aligned to `areas`.
+    Names that are not recognized take the coordinates of `fallback` (aligned
+    series, e.g. the Area of each SubArea) instead of the center of Indonesia.
+    """
+    areas = pd.Series(areas)
+    codes, uniques = pd.factorize(areas)
+    lat = np.empty(len(uniques) + 1)
+    lon = np.empty(len(uniques) + 1)
+    unknown = np.ones(len(uniques) + 1, dtype=bool)
+    for i, area in enumerate(uniques):
+        coords = _lookup(str(area).lower().strip())
+        lat[i], lon[i] = coords['lat'], coords['lon']
+        unknown[i] = coords is INDONESIA_CENTER
+    # kode -1 (NaN) → titik tengah Indonesia
+    lat[-1], lon[-1] = INDONESIA_CENTER['lat'], INDONESIA_CENTER['lon']
+    result = pd.DataFrame({'lat': lat[codes], 'lon': lon[codes]}, index=areas.index)
+
+    if fallback is not None:
+        use_fallback = unknown[codes]
+        if use_fallback.any():
+            fallback_coords = geocode_series(pd.Series(np.asarray(fallback), index=areas.index)[use_fallback])
+            result.loc[use_fallback, ['lat', 'lon']] = fallback_coords[['lat', 'lon']].to_numpy()
+    return result
@@ -1,274 +1,64 @@
+import time
+import hashlib
 import folium
-from streamlit_folium import st_folium
+from folium.plugins import MarkerCluster
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 
-# ============================================================
-#   MASTER KOORDINAT KOTA INDONESIA — LENGKAP & AKURAT
-# ============================================================
-
-def get_indonesia_coordinates(area_name):
-    area_lower = area_name.lower().strip()
-
-    # ============================
-    #  PETA PROVINSI / PULAU
-    # ============================
-    coordinates_by_island = {
-
-        # =======================
-        #        JAWA
-        # =======================
-        'JAWA': {
-            # DKI Jakarta
-            'Jakarta': {'lat': -6.2088, 'lon': 106.8456},
-            'Jakarta Pusat': {'lat': -6.1821, 'lon': 106.8415},
-            'Jakarta Utara': {'lat': -6.1380, 'lon': 106.8823},
-            'Jakarta Barat': {'lat': -6.1767, 'lon': 106.7559},
-            'Jakarta Selatan': {'lat': -6.2660, 'lon': 106.8133},
-            'Jakarta Timur': {'lat': -6.2250, 'lon': 106.9000},
-
-            # Jawa Barat
-            'Bandung': {'lat': -6.9175, 'lon': 107.6191},
-            'Bekasi': {'lat': -6.2349, 'lon': 106.9920},
-            'Depok': {'lat': -6.4025, 'lon': 106.7942},
-            'Bogor': {'lat': -6.5944, 'lon': 106.7892},
-            'Cirebon': {'lat': -6.7320, 'lon': 108.5523},
-            'Sukabumi': {'lat': -6.9270, 'lon': 106.9310},
-            'Tasikmalaya': {'lat': -7.3274, 'lon': 108.2207},
-            'Banjar': {'lat': -7.1955, 'lon': 108.5346},
-            'Garut': {'lat': -7.2279, 'lon': 107.9087},
-            'Subang': {'lat': -6.5750, 'lon': 107.7576},
-            'Karawang': {'lat': -6.3050, 'lon': 107.3050},
-            'Cimahi': {'lat': -6.8722, 'lon': 107.5422},
-            'Purwakarta': {'lat': -6.5569, 'lon': 107.4434},
-            'Indramayu': {'lat': -6.3364, 'lon': 108.3250},
-
-            # Jawa Tengah
-            'Semarang': {'lat': -6.9667, 'lon': 110.4167},
-            'Solo': {'lat': -7.5666, 'lon': 110.8167},
-            'Surakarta': {'lat': -7.5666, 'lon': 110.8167},
-            'Tegal': {'lat': -6.8698, 'lon': 109.1256},
-            'Brebes': {'lat': -6.8783, 'lon': 109.0484},
-            'Cilacap': {'lat': -7.7325, 'lon': 109.0139},
-            'Magelang': {'lat': -7.4705, 'lon': 110.2170},
-            'Kudus': {'lat': -6.8041, 'lon': 110.8405},
-            'Pekalongan': {'lat': -6.8898, 'lon': 109.6753},
-
-            # Jawa Timur
-            'Surabaya': {'lat': -7.2575, 'lon': 112.7521},
-            'Malang': {'lat': -7.9666, 'lon': 112.6326},
-            'Sidoarjo': {'lat': -7.4469, 'lon': 112.7183},
-            'Gresik': {'lat': -7.1630, 'lon': 112.6550},
-            'Madiun': {'lat': -7.6297, 'lon': 111.5130},
-            'Kediri': {'lat': -7.8480, 'lon': 112.0178},
-            'Jember': {'lat': -8.1724, 'lon': 113.7000},
-            'Banyuwangi': {'lat': -8.2196, 'lon': 114.3695},
-
-            # DIY
-            'Yogyakarta': {'lat': -7.7956, 'lon': 110.3695},
-
-            # Banten
-            'Tangerang': {'lat': -6.1783, 'lon': 106.6319},
-            'Tangerang Selatan': {'lat': -6.2886, 'lon': 106.7176},
-            'Serang': {'lat': -6.1120, 'lon': 106.1503},
-            'Cilegon': {'lat': -6.0023, 'lon': 106.0113},
-        },
-
-        # =======================
-        #      SUMATERA
-        # =======================
-        'SUMATERA': {
-            'Medan': {'lat': 3.5952, 'lon': 98.6722},
-            'Pekanbaru': {'lat': 0.5071, 'lon': 101.4478},
-            'Padang': {'lat': -0.9492, 'lon': 100.3543},
-            'Palembang': {'lat': -2.9761, 'lon': 104.7754},
-            'Jambi': {'lat': -1.6101, 'lon': 103.6131},
-            'Banda Aceh': {'lat': 5.5483, 'lon': 95.3238},
-            'Batam': {'lat': 1.0456, 'lon': 104.0305},
-            'Tanjungpinang': {'lat': 0.9181, 'lon': 104.4586},
-            'Lampung': {'lat': -5.4500, 'lon': 105.2667},
-            'Bandar Lampung': {'lat': -5.4500, 'lon': 105.2667}
-        },
-
-        # =======================
-        #   KALIMANTAN
-        # =======================
-        'KALIMANTAN': {
-            'Balikpapan': {'lat': -1.2680, 'lon': 116.8283},
-            'Banjarmasin': {'lat': -3.3186, 'lon': 114.5944},
-            'Pontianak': {'lat': -0.0374, 'lon': 109.3441},
-            'Samarinda': {'lat': -0.5022, 'lon': 117.1536},
-            'Tarakan': {'lat': 3.3270, 'lon': 117.5785},
-        },
-
-        # =======================
-        #    SULAWESI
-        # =======================
-        'SULAWESI': {
-            'Makassar': {'lat': -5.1477, 'lon': 119.4327},
-            'Manado': {'lat': 1.4748, 'lon': 124.8421},
-            'Palu': {'lat': -0.9000, 'lon': 119.8700},
-            'Kendari': {'lat': -3.9670, 'lon': 122.5947},
-            'Gorontalo': {'lat': 0.5400, 'lon': 123.0600},
-        },
-
-        # =======================
-        #   BALI – NUSA TENGGARA
-        # =======================
-        'BALI_NUSA_TENGGARA': {
-            'Denpasar': {'lat': -8.6705, 'lon': 115.2126},
-            'Bali': {'lat': -8.4095, 'lon': 115.1889},
-            'Mataram': {'lat': -8.5833, 'lon': 116.1167},
-            'Kupang': {'lat': -10.1772, 'lon': 123.6070},
-            'Lombok': {'lat': -8.6500, 'lon': 116.3249},
-        },
-
-        # =======================
-        #     MALUKU – PAPUA
-        # =======================
-        'MALUKU_PAPUA': {
-            'Ambon': {'lat': -3.6954, 'lon': 128.1814},
-            'Jayapura': {'lat': -2.5333, 'lon': 140.7167},
-            'Sorong': {'lat': -0.8762, 'lon': 131.2558},
-            'Manokwari': {'lat': -0.8615, 'lon': 134.0620},
-            'Ternate': {'lat': 0.7900, 'lon': 127.3800},
-        }
-    }
-
-    # =====================================================
-    #  ABBREVIATION MAP (biar "tng" → Tangerang)
-    # =====================================================
-    abbrev_map = {
-        # Jawa Barat / Banten
-        'tgr': ('Tangerang', 'JAWA'),
-        'tng': ('Tangerang', 'JAWA'),
-        'tngsel': ('Tangerang Selatan', 'JAWA'),
-        'bdg': ('Bandung', 'JAWA'),
-        'bgr': ('Bogor', 'JAWA'),
-        'dpk': ('Depok', 'JAWA'),
-        'tsm': ('Tasikmalaya', 'JAWA'),
-        'cmi': ('Cimahi', 'JAWA'),
-        'cjr': ('Cirebon', 'JAWA'),
-
-        # Jawa Tengah
-        'slo': ('Solo', 'JAWA'),
-        'skt': ('Surakarta', 'JAWA'),
-
-        # Jawa Timur
-        'sby': ('Surabaya', 'JAWA'),
-        'mlg': ('Malang', 'JAWA'),
-
-        # Sumatera
-        'mdn': ('Medan', 'SUMATERA'),
-        'pku': ('Pekanbaru', 'SUMATERA'),
-        'plg': ('Palembang', 'SUMATERA'),
-
-        # Kalimantan
-        'bjm': ('Banjarmasin', 'KALIMANTAN'),
-        'bpn': ('Balikpapan', 'KALIMANTAN'),
-        'smr': ('Samarinda', 'KALIMANTAN'),
-
-        # Sulawesi
-        'mks': ('Makassar', 'SULAWESI'),
-        'mnd': ('Manado', 'SULAWESI'),
-
-        # Bali
-        'dps': ('Denpasar', 'BALI_NUSA_TENGGARA'),
-    }
-
-    # =====================================
-    #   PENCARIAN 1 — Abbreviation
-    # =====================================
-    for abbr, (full_name, island) in abbrev_map.items():
-        if abbr in area_lower:
-            return coordinates_by_island[island][full_name]
-
-    # =====================================
-    #   PENCARIAN 2 — Exact Match
-    # =====================================
-    for island, cities in coordinates_by_island.items():
-        for city, coords in cities.items():
-            if area_lower == city.lower():
-                return coords
-
-    # =====================================
-    #   PENCARIAN 3 — Partial Match
-    # =====================================
-    for island, cities in coordinates_by_island.items():
-        for city, coords in cities.items():
-            if city.lower() in area_lower:
-                return coords
-
-    # =====================================
-    #   PENCARIAN 4 — Pulau (Fallback)
-    # =====================================
-    island_keywords = {
-        'JAWA': ['jawa', 'jabar', 'jateng', 'jatim', 'bandung', 'jakarta'],
-        'SUMATERA': ['sumatera', 'aceh', 'padang', 'palembang'],
-        'KALIMANTAN': ['kalimantan', 'banjar', 'balikpapan'],
-        'SULAWESI': ['sulawesi'],
-        'BALI_NUSA_TENGGARA': ['bali', 'lombok', 'kupang', 'ntb', 'ntt'],
-        'MALUKU_PAPUA': ['papua', 'maluku', 'ambon']
-    }
-
-    for island, keywords in island_keywords.items():
-        if any(keyword in area_lower for keyword in keywords):
-            island_centers = {
-                'JAWA': {'lat': -7.5, 'lon': 110.0},
-                'SUMATERA': {'lat': 0.0, 'lon': 101.0},
-                'KALIMANTAN': {'lat': -2.0, 'lon': 114.0},
-                'SULAWESI': {'lat': -2.5, 'lon': 121.0},
-                'BALI_NUSA_TENGGARA': {'lat': -8.5, 'lon': 116.5},
-                'MALUKU_PAPUA': {'lat': -4.0, 'lon': 138.0},
-            }
-            return island_centers[island]
-
-    # FINAL fallback — Indonesia Center
-    return {'lat': -2.5489, 'lon': 118.0149}
+from src.analytics.bands import band_of, classify_bands, MAP_COLOR_BANDS
+from src.analytics.cube import build_cube
+from src.maps.geocoding import get_indonesia_coordinates, geocode_series
+from src.utils.cache import LRUCache
 
+# mode 'geojson': satu FeatureCollection; 'markers': satu CircleMarker per area (cara lama)
+MAP_OPTIONS = {'zoom_start': 5, 'tiles': 'cartodbpositron', 'radius': 10, 'mode': 'geojson', 'granularity': 'Area'}
+MAP_GRANULARITIES = ['Area', 'SubArea', 'Nama']
 
+_MAP_HTML_CACHE = LRUCache(maxsize=16)
+_MAP_RENDER_STATS = {'render_seconds': 0.0, 'seconds_saved': 0.0}
 
 # ============================================================
 #  GENERATE FOLIUM MAP
 # ============================================================
-def create_performance_map(df):
+def _area_map_stats(df, cube):
+    level = (cube if cube is not None else build_cube(df))['Area']
+    return pd.DataFrame({
+        'Percentage': level['Pct_Mean'],
+        'Sales': level['Sales_Sum'],
+        'Target': level['Target_Sum'],
+        'Nama': level['Nama_Count']
+    }).round(2)
+
+
+def create_performance_map(df, cube=None, options=None):
     if df.empty:
         return folium.Map(location=[-2.5489, 118.0149], zoom_start=4)
+    return _performance_map_from_stats(_area_map_stats(df, cube), options)
 
-    area_stats = df.groupby('Area').agg({
-        'Percentage': 'mean',
-        'Sales': 'sum',
-        'Target': 'sum',
-        'Nama': 'count'
-    }).round(2)
+
+def _performance_map_from_stats(area_stats, options=None):
+    options = dict(MAP_OPTIONS, **(options or {}))
 
     performance_map = folium.Map(
         location=[-2.5489, 118.0149],
-        zoom_start=5,
-        tiles='cartodbpositron'
+        zoom_start=options['zoom_start'],
+        tiles=options['tiles']
     )
 
+    coords = geocode_series(area_stats.index.to_series())
+
     for area in area_stats.index:
         avg_performance = area_stats.loc[area, 'Percentage']
         total_sales = area_stats.loc[area, 'Sales']
         team_size = area_stats.loc[area, 'Nama']
 
-        coords = get_indonesia_coordinates(area)
-
         # Color
-        if avg_performance >= 120:
-            color = 'green'
-        elif avg_performance >= 100:
-            color = 'lightgreen'
-        elif avg_performance >= 80:
-            color = 'orange'
-        else:
-            color = 'red'
+        color = band_of(avg_performance, MAP_COLOR_BANDS)
 
         folium.CircleMarker(
-            radius=10,
-            location=[coords['lat'], coords['lon']],
+            radius=options['radius'],
+            location=[coords.loc[area, 'lat'], coords.loc[area, 'lon']],
             color=color,
             fill=True,
             fill_color=color,
@@ -279,32 +69,190 @@ def create_performance_map(df):
     return performance_map
 
 
+# ============================================================
+#  GEOJSON MAP (satu layer, data-driven style)
+# ============================================================
+def map_points(df, cube=None, granularity='Area'):
+    """One row per map point: Name, Area, Percentage, Sales, Target, Team, lat, lon."""
+    if df.empty:
+        return pd.DataFrame(columns=['Name', 'Area', 'Percentage', 'Sales', 'Target', 'Team', 'lat', 'lon'])
+
+    if granularity == 'Area':
+        stats = _area_map_stats(df, cube)
+        points = pd.DataFrame({
+            'Name': stats.index.astype(str), 'Area': stats.index.astype(str),
+            'Percentage': stats['Percentage'].to_numpy(), 'Sales': stats['Sales'].to_numpy(),
+            'Target': stats['Target'].to_numpy(), 'Team': stats['Nama'].to_numpy(),
+        })
+        coords = geocode_series(points['Name'])
+    elif granularity == 'SubArea':
+        grain = (cube if cube is not None else build_cube(df))['grain']
+        level = grain.groupby(level=['Area', 'SubArea'], observed=True).sum()
+        points = pd.DataFrame({
+            'Name': level.index.get_level_values('SubArea').astype(str),
+            'Area': level.index.get_level_values('Area').astype(str),
+            'Percentage': (level['Pct_Sum'] / level['Pct_Count'].where(level['Pct_Count'] > 0)).round(2).to_numpy(),
+            'Sales': level['Sales_Sum'].to_numpy(), 'Target': level['Target_Sum'].to_numpy(),
+            'Team': level['Nama_Count'].to_numpy(),
+        })
+        coords = geocode_series(points['Name'], fallback=points['Area'])
+    else:
+        points = pd.DataFrame({
+            'Name': df['Nama'].astype(str).to_numpy(), 'Area': df['Area'].astype(str).to_numpy(),
+            'Percentage': df['Percentage'].to_numpy(), 'Sales': df['Sales'].to_numpy(),
+            'Target': df['Target'].to_numpy(), 'Team': 1,
+        })
+        # sales diletakkan di titik SubArea-nya (Area bila SubArea tidak dikenal)
+        coords = geocode_series(df['SubArea'].astype(str).to_numpy(), fallback=points['Area'])
+
+    points['lat'] = coords['lat'].to_numpy()
+    points['lon'] = coords['lon'].to_numpy()
+    return points
+
+
+def feature_collection(points):
+    colors = classify_bands(points['Percentage'].to_numpy(dtype='float64'), MAP_COLOR_BANDS)
+    columns = zip(
+        points['Name'], points['Area'], points['Percentage'].to_numpy(dtype='float64'),
+        points['Sales'].to_numpy(dtype='float64'), points['Target'].to_numpy(dtype='float64'),
+        points['Team'].to_numpy(), points['lat'].to_numpy(), points['lon'].to_numpy(), colors,
+    )
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {
+                'type': 'Feature',
+                'id': i,
+                'geometry': {'type': 'Point', 'coordinates': [float(lon), float(lat)]},
+                'properties': {
+                    'name': name, 'area': area, 'color': color,
+                    'achievement': '-' if pct != pct else f"{pct:.1f}%",
+                    'sales': f"{sales:,.0f}", 'target': f"{target:,.0f}", 'team': int(team),
+                },
+            }
+            for i, (name, area, pct, sales, target, team, lat, lon, color) in enumerate(columns)
+        ],
+    }
+
+
+def _feature_style(feature):
+    color = feature['properties']['color']
+    return {'color': color, 'fillColor': color}
+
+
+def _geojson_map_from_points(points, options=None):
+    options = dict(MAP_OPTIONS, **(options or {}))
+    granularity = options['granularity']
+
+    performance_map = folium.Map(
+        location=[-2.5489, 118.0149],
+        zoom_start=options['zoom_start'],
+        tiles=options['tiles']
+    )
+
+    layer = folium.GeoJson(
+        feature_collection(points),
+        name=granularity,
+        marker=folium.CircleMarker(radius=options['radius'], fill=True, fill_opacity=0.8, weight=1),
+        style_function=_feature_style,
+        popup=folium.GeoJsonPopup(
+            fields=['name', 'area', 'achievement', 'sales', 'target', 'team'],
+            aliases=['Nama', 'Area', 'Achievement', 'Sales', 'Target', 'Team'],
+        ),
+    )
+
+    if granularity == 'Area':
+        layer.add_to(performance_map)
+    else:
+        # SubArea / salesperson: ribuan titik → cluster, spiderfy di zoom maksimum
+        cluster = MarkerCluster(name=f"{granularity} cluster")
+        layer.add_to(cluster)
+        cluster.add_to(performance_map)
+
+    folium.LayerControl().add_to(performance_map)
+    return performance_map
+
+
+# ============================================================
+#  CACHED MAP HTML
+# ============================================================
+def area_stats_hash(area_stats):
+    # hash isi tabel agregat (index + nilai), bukan identitas objek
+    row_hashes = pd.util.hash_pandas_object(area_stats, index=True).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes() + repr(list(area_stats.columns)).encode()).hexdigest()
+
+
+def _map_table(df, cube, options):
+    if df.empty:
+        return pd.DataFrame()
+    if options['mode'] == 'geojson':
+        return map_points(df, cube, options['granularity'])
+    return _area_map_stats(df, cube)
+
+
+def performance_map_html(df, cube=None, options=None, fingerprint=None):
+    """
+    Serialized HTML of the performance map (GeoJSON or per-area markers,
+    see MAP_OPTIONS). Keyed on the filter-state fingerprint + map options
+    when one is given (a hit then skips building the point table too, which
+    is one row per salesperson at 'Nama' granularity), otherwise on the hash
+    of the point/aggregate table + map options.
+    """
+    options = dict(MAP_OPTIONS, **(options or {}))
+    table = None
+    if fingerprint is None:
+        table = _map_table(df, cube, options)
+        key = (area_stats_hash(table), tuple(sorted(options.items())))
+    else:
+        key = (fingerprint, tuple(sorted(options.items())))
+
+    entry = _MAP_HTML_CACHE.get(key)
+    if entry is not None:
+        _MAP_RENDER_STATS['seconds_saved'] += entry['render_seconds']
+        return entry['html']
+
+    start = time.perf_counter()
+    if table is None:
+        table = _map_table(df, cube, options)
+    if table.empty:
+        performance_map = folium.Map(location=[-2.5489, 118.0149], zoom_start=4)
+    elif options['mode'] == 'geojson':
+        performance_map = _geojson_map_from_points(table, options)
+    else:
+        performance_map = _performance_map_from_stats(table, options)
+    html = performance_map.get_root().render()
+    render_seconds = time.perf_counter() - start
+
+    _MAP_RENDER_STATS['render_seconds'] += render_seconds
+    _MAP_HTML_CACHE.put(key, {'html': html, 'render_seconds': render_seconds})
+    return html
+
+
+def map_cache_stats():
+    stats = _MAP_HTML_CACHE.stats()
+    stats.update({k: round(v, 3) for k, v in _MAP_RENDER_STATS.items()})
+    return stats
+
+
 # ============================================================
 #  HEATMAP DATA
 # ============================================================
-def create_heatmap_data(df):
+def create_heatmap_data(df, cube=None):
     if df.empty:
         return pd.DataFrame()
 
-    area_stats = df.groupby('Area').agg({
-        'Percentage': 'mean',
-        'Sales': 'sum',
-        'Nama': 'count'
-    }).round(2)
+    area_stats = _area_map_stats(df, cube)
 
-    records = []
-    for area in area_stats.index:
-        coords = get_indonesia_coordinates(area)
-        records.append({
-            'Area': area,
-            'lat': coords['lat'],
-            'lon': coords['lon'],
-            'Percentage': area_stats.loc[area, 'Percentage'],
-            'Sales': area_stats.loc[area, 'Sales'],
-            'Nama': int(area_stats.loc[area, 'Nama'])
-        })
+    coords = geocode_series(area_stats.index.to_series())
 
-    return pd.DataFrame(records)
+    return pd.DataFrame({
+        'Area': area_stats.index,
+        'lat': coords['lat'].to_numpy(),
+        'lon': coords['lon'].to_numpy(),
+        'Percentage': area_stats['Percentage'].to_numpy(),
+        'Sales': area_stats['Sales'].to_numpy(),
+        'Nama': area_stats['Nama'].astype(int).to_numpy()
+    })
 
 
 # ============================================================
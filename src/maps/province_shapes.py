@@ -0,0 +1,198 @@
+# src/maps/province_shapes.py
+"""
+Bundled Indonesia province boundaries.
+
+`data/provinces.npz` holds the 34 province outlines, each pre-simplified
+(Douglas-Peucker) at every tolerance in the file. Coordinates are stored
+as int32 at 1e-4° next to flat ring/part offset arrays. The bundle is read
+once per process, and the GeoJSON for each tolerance is built once.
+
+Rebuild from any province GeoJSON (properties.name = province name):
+    python -m src.maps.province_shapes source.geojson
+"""
+import json
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+BUNDLE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'provinces.npz')
+
+# derajat; makin besar makin kasar (dipilih sesuai zoom, lihat choropleth.tolerance_for_zoom)
+TOLERANCES = (0.005, 0.02, 0.06)
+COORD_SCALE = 10_000
+
+
+# ============================================================
+#   BUILD (offline, sekali) — Douglas-Peucker per ring
+# ============================================================
+def _segment_distance(points, start, end):
+    """Distance of each point to the segment start→end (all in degrees)."""
+    direction = end - start
+    length_sq = float(direction @ direction)
+    if length_sq == 0.0:
+        return np.hypot(*(points - start).T)
+    t = np.clip(((points - start) @ direction) / length_sq, 0.0, 1.0)
+    projection = start + t[:, None] * direction
+    return np.hypot(*(points - projection).T)
+
+
+def simplify_ring(ring, tolerance):
+    """Douglas-Peucker on one closed ring; returns a closed ring (possibly < 4 points)."""
+    ring = np.asarray(ring, dtype='float64')
+    if len(ring) < 5:
+        return ring
+    open_ring = ring[:-1] if np.array_equal(ring[0], ring[-1]) else ring
+    # ring tertutup: pecah di titik terjauh dari titik awal supaya segmen awal tidak nol
+    far = int(np.argmax(np.hypot(*(open_ring - open_ring[0]).T)))
+    keep = np.zeros(len(open_ring) + 1, dtype=bool)
+    keep[[0, far, len(open_ring)]] = True
+    closed = np.vstack([open_ring, open_ring[:1]])
+
+    stack = [(0, far), (far, len(open_ring))]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _segment_distance(closed[first + 1:last], closed[first], closed[last])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return closed[keep]
+
+
+def _feature_polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    return geometry['coordinates']
+
+
+def _simplify_feature(polygons, tolerance):
+    simplified = []
+    for polygon in polygons:
+        rings = [simplify_ring(ring, tolerance) for ring in polygon]
+        if len(rings[0]) >= 4:
+            simplified.append([ring for ring in rings if len(ring) >= 4])
+    if not simplified:
+        # pulau kecil semua kolaps → pertahankan poligon terbesar saja, tanpa simplifikasi
+        largest = max(polygons, key=lambda polygon: len(polygon[0]))
+        simplified = [[np.asarray(ring, dtype='float64') for ring in largest]]
+    return simplified
+
+
+def build_province_bundle(source_path, out_path=BUNDLE_PATH, tolerances=TOLERANCES):
+    with open(source_path, encoding='utf-8') as source:
+        features = json.load(source)['features']
+    features = sorted(features, key=lambda feature: feature['properties']['name'])
+
+    arrays = {
+        'names': np.array([feature['properties']['name'] for feature in features]),
+        'tolerances': np.asarray(tolerances, dtype='float64'),
+    }
+    for level, tolerance in enumerate(tolerances):
+        coords, ring_offsets, ring_parts, part_features = [], [0], [], []
+        for feature_index, feature in enumerate(features):
+            for polygon in _simplify_feature(_feature_polygons(feature['geometry']), tolerance):
+                for ring in polygon:
+                    coords.append(np.round(ring * COORD_SCALE).astype('int32'))
+                    ring_offsets.append(ring_offsets[-1] + len(ring))
+                    ring_parts.append(len(part_features))
+                part_features.append(feature_index)
+        arrays[f'coords_{level}'] = np.vstack(coords)
+        arrays[f'ring_offsets_{level}'] = np.asarray(ring_offsets, dtype='int32')
+        arrays[f'ring_parts_{level}'] = np.asarray(ring_parts, dtype='int32')
+        arrays[f'part_features_{level}'] = np.asarray(part_features, dtype='int16')
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    np.savez_compressed(out_path, **arrays)
+    return {tolerance: len(arrays[f'coords_{level}']) for level, tolerance in enumerate(tolerances)}
+
+
+# ============================================================
+#   LOAD (sekali per proses)
+# ============================================================
+@lru_cache(maxsize=1)
+def load_province_bundle(path=BUNDLE_PATH):
+    with np.load(path) as bundle:
+        levels = []
+        for level in range(len(bundle['tolerances'])):
+            levels.append({
+                'coords': bundle[f'coords_{level}'].astype('float64') / COORD_SCALE,
+                'ring_offsets': bundle[f'ring_offsets_{level}'],
+                'ring_parts': bundle[f'ring_parts_{level}'],
+                'part_features': bundle[f'part_features_{level}'],
+            })
+        return {
+            'names': bundle['names'].tolist(),
+            'tolerances': bundle['tolerances'].tolist(),
+            'levels': levels,
+        }
+
+
+def province_names():
+    return load_province_bundle()['names']
+
+
+@lru_cache(maxsize=None)
+def province_geometries(level):
+    """GeoJSON MultiPolygon geometry per province (bundle order) at one tolerance level."""
+    bundle = load_province_bundle()
+    data = bundle['levels'][level]
+    offsets = data['ring_offsets']
+    parts = [[] for _ in data['part_features']]
+    for ring_index, part in enumerate(data['ring_parts']):
+        parts[part].append(np.round(data['coords'][offsets[ring_index]:offsets[ring_index + 1]], 4).tolist())
+
+    geometries = [{'type': 'MultiPolygon', 'coordinates': []} for _ in bundle['names']]
+    for part, feature in zip(parts, data['part_features']):
+        geometries[feature]['coordinates'].append(part)
+    return geometries
+
+
+def locate_points(lat, lon, level=0):
+    """
+    Province index per point (-1 when outside every province), by even-odd
+    ray casting against all ring edges of one level at once.
+    """
+    data = load_province_bundle()['levels'][level]
+    coords, offsets = data['coords'], data['ring_offsets']
+    # edge i→i+1 dalam ring yang sama (buang edge yang menyambung antar ring)
+    starts = np.arange(len(coords) - 1)
+    valid = np.ones(len(starts), dtype=bool)
+    valid[offsets[1:-1] - 1] = False
+    starts = starts[valid]
+    x1, y1 = coords[starts].T
+    x2, y2 = coords[starts + 1].T
+    ring_of_edge = np.searchsorted(offsets, starts, side='right') - 1
+    feature_of_edge = data['part_features'][data['ring_parts'][ring_of_edge]]
+
+    n_features = len(load_province_bundle()['names'])
+    result = np.full(len(lat), -1, dtype='int64')
+    for i, (py, px) in enumerate(zip(np.asarray(lat, dtype='float64'), np.asarray(lon, dtype='float64'))):
+        crosses = (y1 > py) != (y2 > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        hits = crosses & (px < x_cross)
+        inside = np.bincount(feature_of_edge[hits], minlength=n_features) % 2 == 1
+        if inside.any():
+            result[i] = int(np.argmax(inside))
+    return result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(__doc__)
+        return 1
+    for tolerance, n_points in build_province_bundle(argv[0]).items():
+        print(f"tolerance {tolerance:g}°: {n_points:,} points")
+    print(f"→ {BUNDLE_PATH} ({os.path.getsize(BUNDLE_PATH) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# src/ui/debug_panel.py
+import pandas as pd
+import streamlit as st
+
+from src.language.language_config import get_text
+from src.ui.table_styles import render_table
+from src.utils.profiling import PROFILE_LOG_PATH
+
+STAGE_FORMATS = {'ms': '{:.1f}', 'share': '{:.1f}%', 'peak_mb': '{:.2f}'}
+FUNCTION_FORMATS = {'own_ms': '{:.1f}', 'cumulative_ms': '{:.1f}'}
+
+
+def _stage_table(record):
+    total = record['total_seconds'] or 1.0
+    stages = pd.DataFrame(record['stages'])
+    if stages.empty:
+        return stages
+    table = pd.DataFrame({
+        # indentasi = kedalaman stage (tab di dalam render_tabs, dst.)
+        'stage': stages['depth'].map(lambda depth: '   ' * (depth - 1) + '↳ ' if depth else '') + stages['stage'],
+        'ms': stages['seconds'] * 1000,
+        'share': stages['seconds'] / total * 100,
+    })
+    if 'peak_mb' in stages.columns:
+        table['peak_mb'] = stages['peak_mb']
+    return table
+
+
+def render_debug_panel(record):
+    """Collapsible stage timings of the rerun that just finished (+ cProfile / tracemalloc when enabled)."""
+    if record is None:
+        return
+    with st.expander(f"🐞 {get_text('debug_panel')} · {record['total_seconds'] * 1000:.0f} ms"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.checkbox(get_text('debug_cprofile'), key='debug_cprofile')
+        with col2:
+            st.checkbox(get_text('debug_tracemalloc'), key='debug_tracemalloc')
+
+        render_table(_stage_table(record), formats=STAGE_FORMATS, hide_index=True, use_container_width=True)
+        if 'traced_peak_mb' in record:
+            # tracemalloc global: ikut menghitung alokasi thread sesi lain selama rerun ini
+            st.caption(f"tracemalloc peak (process-wide): {record['traced_peak_mb']:.1f} MB")
+        for note in record.get('notes', []):
+            st.caption(f"⚠️ {note}")
+
+        if record.get('profile'):
+            st.write(f"**{get_text('debug_top_functions')}**")
+            functions = pd.DataFrame(record['profile'])
+            functions = pd.DataFrame({
+                'function': functions['function'],
+                'calls': functions['calls'],
+                'own_ms': functions['own_seconds'] * 1000,
+                'cumulative_ms': functions['cumulative_seconds'] * 1000,
+            })
+            render_table(functions, formats=FUNCTION_FORMATS, hide_index=True, use_container_width=True)
+
+        if PROFILE_LOG_PATH:
+            log_note = " ⚠️" if record.get('log_error') else ""
+            st.caption(f"📝 {get_text('debug_log')}: `{PROFILE_LOG_PATH}`{log_note}")
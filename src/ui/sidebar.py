@@ -1,33 +1,149 @@
+import os
 import streamlit as st
 from src.language.language_config import get_text
-from src.data.data_processor import process_uploaded_file, load_sample_data, extract_period_from_filename
+from src.data.data_processor import (
+    process_uploaded_file, process_uploaded_files, concat_periods, load_sample_data,
+    extract_period_from_filename, upload_cache_stats, upload_dataset_source, MissingColumnsError,
+    describe_file_error
+)
+from src.data.column_resolver import describe_mapping
+from src.data.snapshots import list_snapshots, load_snapshot
+from src.data.streaming import load_aggregates
+from src.data.filter_engine import get_filter_engine
 from src.analytics.metrics import get_area_performance, get_grade_analysis
+from src.analytics.cube import get_aggregation_cube, dataset_fingerprint
+from src.utils.profiling import stage
+
+@st.cache_resource(show_spinner=False)
+def _load_snapshot_cached(path, mtime):
+    # mtime ikut jadi key supaya snapshot yang di-ingest ulang terbaca lagi
+    return load_snapshot(path)
+
+@st.cache_resource(show_spinner=False)
+def _load_aggregates_cached(path, mtime, metadata):
+    return load_aggregates(path, dict(metadata))
+
+@st.cache_data(ttl=3600)
+def _sample_data():
+    return load_sample_data()
+
+def show_file_error(error):
+    if isinstance(error, MissingColumnsError):
+        st.error(str(error))
+        st.info(f"✅ Available columns: {error.available}")
+    else:
+        st.error(describe_file_error(error))
+
+def _load_multiple_uploads(uploaded_files):
+    # satu file per periode → diparse paralel, digabung dengan kolom Period
+    progress = st.sidebar.progress(0.0, text=f"0/{len(uploaded_files)} files")
+
+    def on_progress(done, total, name, error):
+        progress.progress(done / total, text=f"{done}/{total} files · {'❌' if error else '✅'} {name}")
+
+    results = process_uploaded_files(uploaded_files, on_progress=on_progress)
+    loaded = [r for r in results if r['data'] is not None]
+    for result in results:
+        if result['error']:
+            st.sidebar.error(f"{result['name']}: {result['error']}")
+
+    period_frames = [
+        (extract_period_from_filename(r['name'], default=st.session_state.periode_data), r['data']) for r in loaded
+    ]
+    data = concat_periods(period_frames)
+    if data is None:
+        st.sidebar.warning("⚠️ Using sample data")
+        return _sample_data(), 'sample'
+
+    st.sidebar.success(f"✅ {get_text('file_loaded')}: {len(loaded)}/{len(results)} files")
+    st.sidebar.info(f"📊 {get_text('data_records')}: {len(data)} records")
+    for (period, df), result in zip(period_frames, loaded):
+        cached_note = " ⚡" if result['cached'] else ""
+        st.sidebar.caption(f"📄 {result['name']} → {period} ({len(df)} rows){cached_note}")
+
+    periods = list(data['Period'].cat.categories)
+    st.session_state.periode_data = periods[0] if len(periods) == 1 else f"{periods[0]} → {periods[-1]}"
+    st.sidebar.info(f"📅 {get_text('period_detected')}: {st.session_state.periode_data}")
+
+    return data, upload_dataset_source([r['data'] for r in loaded])
 
 def render_sidebar():
     st.sidebar.header(f"🎯 {get_text('dashboard_controls')}")
     st.sidebar.markdown("---")
 
     st.sidebar.subheader(f"📁 {get_text('upload_data')}")
-    uploaded_file = st.sidebar.file_uploader(
+    aggregates = None
+    uploaded_files = st.sidebar.file_uploader(
         get_text('upload_help'),
         type=['xlsx', 'xls', 'csv'],
-        help=get_text('upload_help')
+        help=get_text('upload_help'),
+        accept_multiple_files=True
     )
 
-    if uploaded_file is not None:
-        data = process_uploaded_file(uploaded_file)
+    if len(uploaded_files) > 1:
+        with stage('load_uploads'):
+            data, dataset_source = _load_multiple_uploads(uploaded_files)
+    elif uploaded_files:
+        uploaded_file = uploaded_files[0]
+        with stage('load_upload'):
+            data = process_uploaded_file(uploaded_file, on_error=show_file_error)
         if data is not None:
+            dataset_source = upload_dataset_source([data])
             st.sidebar.success(f"✅ {get_text('file_loaded')}: {uploaded_file.name}")
             st.sidebar.info(f"📊 {get_text('data_records')}: {len(data)} records")
-            auto_period = extract_period_from_filename(uploaded_file.name)
+            cache_stats = upload_cache_stats()
+            st.sidebar.caption(
+                f"⚡ Upload cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                f"({cache_stats['size']}/{cache_stats['maxsize']} files)"
+            )
+            column_mapping = data.attrs.get('column_mapping')
+            if column_mapping and column_mapping['rename_map']:
+                layout_note = " (cached layout)" if column_mapping['cached'] else ""
+                mapped = describe_mapping(column_mapping)
+                if mapped:
+                    st.sidebar.caption(f"🔤 Columns mapped{layout_note}: {mapped}")
+                if 'weak' in column_mapping['matched_by'].values():
+                    # header generik (Kota, Level, ...) bisa saja kolom lain: minta user memeriksa
+                    st.sidebar.warning(
+                        f"⚠️ Generic headers used, check the columns: {describe_mapping(column_mapping, weak=True)}"
+                    )
+            schema_report = data.attrs.get('schema_report')
+            if schema_report:
+                st.sidebar.caption(
+                    f"🗜️ Compact dtypes: {schema_report['bytes_after'] / 1e6:.1f} MB "
+                    f"({schema_report['bytes_saved'] / 1e6:.1f} MB saved)"
+                )
+            auto_period = extract_period_from_filename(uploaded_file.name, default=st.session_state.periode_data)
             st.session_state.periode_data = auto_period
             st.sidebar.info(f"📅 {get_text('period_detected')}: {auto_period}")
         else:
             st.sidebar.warning("⚠️ Using sample data")
-            data = load_sample_data()
+            data = _sample_data()
+            dataset_source = 'sample'
     else:
-        st.sidebar.info("📝 Please upload data file or use sample data")
-        data = load_sample_data()
+        snapshots = list_snapshots()
+        snapshot_periods = [snap['period'] for snap in snapshots]
+        selected_source = get_text('sample_data')
+        if snapshots:
+            selected_source = st.sidebar.selectbox(
+                f"📦 {get_text('snapshot_select')}:",
+                [get_text('sample_data')] + snapshot_periods,
+                index=len(snapshot_periods)
+            )
+
+        if selected_source in snapshot_periods:
+            snapshot = snapshots[snapshot_periods.index(selected_source)]
+            mtime = os.path.getmtime(snapshot['path'])
+            data, metadata = _load_snapshot_cached(snapshot['path'], mtime)
+            # snapshot dari streaming ingest: KPI & cube tanpa filter diambil dari agregat berjalan
+            aggregates = _load_aggregates_cached(snapshot['path'], mtime, tuple(sorted(metadata.items())))
+            dataset_source = f"snapshot:{snapshot['path']}"
+            st.session_state.periode_data = metadata.get('period', selected_source)
+            st.sidebar.info(f"📦 {get_text('snapshot_loaded')}: {len(data)} records")
+        else:
+            st.sidebar.info("📝 Please upload data file or use sample data")
+            data = _sample_data()
+            dataset_source = 'sample'
 
     st.sidebar.markdown("---")
     st.sidebar.subheader(f"📅 {get_text('period_config')}")
@@ -59,8 +175,29 @@ def render_sidebar():
     st.sidebar.markdown("---")
     st.sidebar.subheader(f"📊 {get_text('data_filters')}")
 
-    areas = ['All'] + sorted(data['Area'].unique().tolist())
-    area_performance = get_area_performance(data)
+    dataset_key = dataset_fingerprint(data, dataset_source)
+    st.session_state.dataset_aggregates = aggregates
+    with stage('filter_index'):
+        filter_engine = get_filter_engine(data, dataset_key)
+
+    # Multi-periode: default periode terbaru, supaya KPI & tab tidak menjumlah lintas periode
+    periods = filter_engine.periods()
+    selected_period = 'All'
+    period_data = data
+    if periods:
+        selected_period = st.sidebar.selectbox(f"🗓️ {get_text('select_period')}:",
+                                               ['All'] + periods, index=len(periods))
+        period_data = filter_engine.apply(period=selected_period)
+        st.session_state.periode_data = (
+            selected_period if selected_period != 'All' else f"{periods[0]} → {periods[-1]}"
+        )
+
+    areas = ['All'] + sorted(period_data['Area'].unique().tolist())
+    data_cube = get_aggregation_cube(
+        period_data, (dataset_key, 'unfiltered', selected_period),
+        grain=aggregates.grain if aggregates is not None and period_data is data else None
+    )
+    area_performance = get_area_performance(period_data, data_cube)
     area_options = []
     for area in areas:
         if area == 'All':
@@ -73,8 +210,8 @@ def render_sidebar():
                                                  area_options)
     selected_area = selected_area_display.split(' (')[0] if '(' in selected_area_display else selected_area_display
 
-    grades = ['All'] + sorted(data['Grade'].unique().tolist())
-    grade_analysis = get_grade_analysis(data)
+    grades = ['All'] + sorted(period_data['Grade'].unique().tolist())
+    grade_analysis = get_grade_analysis(period_data, data_cube)
     grade_options = []
     for grade in grades:
         if grade == 'All':
@@ -94,34 +231,34 @@ def render_sidebar():
                                        0, 200, 200)
 
     st.sidebar.subheader(f"📈 {get_text('performance_category')}")
-    categories = ['All'] + data['Performance_Category'].unique().tolist()
+    categories = ['All'] + period_data['Performance_Category'].unique().tolist()
     selected_category = st.sidebar.selectbox(f"📊 {get_text('performance_category')}:",
                                              categories)
 
-    # APPLY FILTERS
-    filtered_data = data.copy()
-    if selected_area != 'All':
-        filtered_data = filtered_data[filtered_data['Area'] == selected_area]
-    if selected_grade != 'All':
-        filtered_data = filtered_data[filtered_data['Grade'] == selected_grade]
-    if selected_category != 'All':
-        filtered_data = filtered_data[filtered_data['Performance_Category'] == selected_category]
-
-    filtered_data = filtered_data[
-        (filtered_data['Percentage'] >= min_achievement) &
-        (filtered_data['Percentage'] <= max_achievement)
-    ]
+    # APPLY FILTERS (index dibangun sekali per dataset, tanpa data.copy())
+    with stage('filter'):
+        filtered_rows = filter_engine.select(
+            selected_area, selected_grade, selected_category, min_achievement, max_achievement, selected_period
+        )
+        filtered_data = filter_engine.view(filtered_rows)
+
+    # Fingerprint filter → kunci memo cube agregasi di main/tabs
+    st.session_state.filter_fingerprint = (
+        dataset_key, selected_area, selected_grade, selected_category, min_achievement, max_achievement,
+        selected_period
+    )
 
     # Filter summary
     st.sidebar.markdown("---")
     st.sidebar.subheader(f"📋 {get_text('filter_summary')}")
+    period_line = f"\n    - Period: {selected_period}" if periods else ""
     st.sidebar.info(f"""
     **Data yang ditampilkan:**
     - Total Records: {len(filtered_data):,}
     - Area: {selected_area}
     - Grade: {selected_grade}
     - Performance: {min_achievement}% - {max_achievement}%
-    - Category: {selected_category}
+    - Category: {selected_category}{period_line}
     """)
 
     # Download template
@@ -0,0 +1,124 @@
+# src/ui/table_styles.py
+"""
+Shared table styling.
+
+Colors come from the band thresholds in src/analytics/bands.py. The CSS for
+a whole column is computed in one vectorized pass, and the whole frame is
+styled with a single Styler.apply(axis=None), so no Python callback runs per
+row or cell. Tables too large for a Styler, or with no colors at all, are
+shown as plain frames with native column formats (st.column_config), so
+pandas never generates the Styler HTML. The printf formats of column_config
+have no thousands separator, so small tables with '{:,}' formats still go
+through the Styler.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.analytics.bands import band_codes, band_labels
+
+# di atas ini (baris × kolom) Styler terlalu mahal → format native tanpa warna
+STYLER_MAX_CELLS = 20_000
+
+# teks kontras untuk background band (palet alert bootstrap)
+TEXT_ON_BACKGROUND = {
+    '#d4edda': '#155724',
+    '#cce5ff': '#004085',
+    '#fff3cd': '#856404',
+    '#ffeaa7': '#856404',
+    '#f8d7da': '#721c24',
+}
+
+_PY_FORMAT = re.compile(r'^(?P<prefix>[^{]*)\{:(?P<sign>\+?),?\.(?P<precision>\d+)f\}(?P<suffix>[^}]*)$')
+
+
+def _as_float(values):
+    return pd.Series(values).to_numpy(dtype='float64', na_value=np.nan)
+
+
+def band_colors(values, bands):
+    """Band color per value ('' = no color), one np.select for the whole column."""
+    labels = np.asarray(band_labels(bands), dtype=object)
+    return labels[band_codes(_as_float(values), bands)]
+
+
+def _css(colors, prop):
+    colors = np.asarray(colors, dtype=object)
+    return np.where(colors != '', prop + ': ' + colors, '')
+
+
+def background_css(values, bands, contrast_text=True):
+    codes = band_codes(_as_float(values), bands)
+    labels = band_labels(bands)
+    css = _css(np.asarray(labels, dtype=object)[codes], 'background-color')
+    if contrast_text:
+        # warna teks per band (bukan per nilai), lalu diindeks dengan kode band yang sama
+        text = np.asarray([TEXT_ON_BACKGROUND.get(label, '') for label in labels], dtype=object)[codes]
+        css = _join_css(css, _css(text, 'color'))
+    return css
+
+
+def text_css(values, bands, bold=True):
+    css = _css(band_colors(values, bands), 'color')
+    return _join_css(css, np.where(css != '', 'font-weight: bold', '')) if bold else css
+
+
+def _join_css(left, right):
+    joined = np.where((left != '') & (right != ''), left + '; ' + right, left + right)
+    return joined.astype(object)
+
+
+def table_css(df, cell_css=None, row_css=None):
+    """
+    CSS frame for `df`: `row_css` (array, one entry per row) is applied to
+    every column, `cell_css` ({column: array}) is added on top per column.
+    """
+    n_rows = len(df)
+    base = np.asarray(row_css, dtype=object) if row_css is not None else np.full(n_rows, '', dtype=object)
+    columns = {}
+    for column in df.columns:
+        css = base
+        if cell_css and column in cell_css:
+            css = _join_css(base, np.asarray(cell_css[column], dtype=object))
+        columns[column] = css
+    return pd.DataFrame(columns, index=df.index, columns=df.columns)
+
+
+def style_table(df, formats=None, cell_css=None, row_css=None, na_rep=None):
+    css = table_css(df, cell_css, row_css)
+    return df.style.format(formats or {}, na_rep=na_rep).apply(lambda _: css, axis=None)
+
+
+def column_config(formats):
+    """Python format strings ('{:.1f}%', 'Rp {:,.0f}') → st.column_config number formats."""
+    config = {}
+    for column, fmt in (formats or {}).items():
+        match = _PY_FORMAT.match(fmt) if isinstance(fmt, str) else None
+        if match is None:
+            continue
+        # printf tidak punya pemisah ribuan; '%' literal di-escape
+        printf = (
+            match['prefix'].replace('%', '%%') + f"%{match['sign']}.{match['precision']}f"
+            + match['suffix'].replace('%', '%%')
+        )
+        config[column] = st.column_config.NumberColumn(format=printf)
+    return config
+
+
+def _needs_styler(formats):
+    # pemisah ribuan ('{:,.0f}') tidak bisa diungkapkan dengan format printf column_config
+    return any(isinstance(fmt, str) and ',' in fmt for fmt in (formats or {}).values())
+
+
+def render_table(df, formats=None, cell_css=None, row_css=None, na_rep=None, **dataframe_kwargs):
+    """
+    st.dataframe through a Styler when the table is small enough and has band
+    colors or thousands separators; otherwise native column formatting only.
+    """
+    has_colors = bool(cell_css) or row_css is not None
+    if (has_colors or _needs_styler(formats)) and df.size <= STYLER_MAX_CELLS:
+        st.dataframe(style_table(df, formats, cell_css, row_css, na_rep), **dataframe_kwargs)
+    else:
+        st.dataframe(df, column_config=column_config(formats), **dataframe_kwargs)
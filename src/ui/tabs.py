@@ -1,11 +1,29 @@
 # src/ui/tabs.py
 import streamlit as st
+import streamlit.components.v1 as components
 from src.language.language_config import get_text
 from src.analytics.metrics import get_area_performance
-from src.maps.maps import create_performance_map, create_heatmap_data, create_bubble_map_figure
+from src.analytics.cube import get_aggregation_cube
+from src.utils.cache import LRUCache
+from src.utils.profiling import stage
+from src.analytics.bands import ROW_HIGHLIGHT_BANDS, TOP_HIGHLIGHT_BANDS, BOTTOM_HIGHLIGHT_BANDS
+from src.ui.table_styles import render_table, background_css
+from src.analytics.trends import (
+    stack_periods, compute_trends, filter_trend_rows, period_summary, streak_alerts,
+    ROLLING_WINDOW, STREAK_THRESHOLD, STREAK_MIN_PERIODS
+)
+from src.data.snapshots import list_snapshots, load_period_frames
+from src.data.export import to_excel_bytes, to_csv_bytes
+from src.data.filter_engine import cached_filter_engine
+from src.data.search_index import NameSearchIndex
+from src.maps.maps import performance_map_html, map_cache_stats, MAP_GRANULARITIES, create_heatmap_data, create_bubble_map_figure
+from src.maps.choropleth import create_province_choropleth, province_stats
 from datetime import datetime
+import os
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
 
 def render_kpis_card_block(team_metrics):
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -32,415 +50,758 @@ def render_kpis_card_block(team_metrics):
         needs_improvement = team_metrics['needs_improvement']
         st.metric(f"⚠️ {get_text('needs_attention')}", f"{needs_improvement} people", f"{zero_sales} zero sales", delta_color="inverse" if needs_improvement > 0 else "normal")
 
-def render_tabs(filtered_data, team_metrics):
-    render_kpis_card_block(team_metrics)
-    st.markdown("---")
+TREND_KEY_OPTIONS = {
+    'Nama + SubArea + Area': ('Nama', 'SubArea', 'Area'),
+    'Nama + SubArea': ('Nama', 'SubArea'),
+    'Nama': ('Nama',),
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_trend_table(keys, window, streak_threshold, source_fingerprint):
+    # source_fingerprint hanya untuk invalidasi cache ketika snapshot berubah
+    long_df = stack_periods(load_period_frames(), list(keys))
+    return compute_trends(long_df, window=window, streak_threshold=streak_threshold)
+
+_UPLOAD_TREND_CACHE = LRUCache(maxsize=4)
+
+def _upload_trend_table(dataset, dataset_key, keys, window, streak_threshold):
+    # multi-upload: periode diambil dari kolom Period dataset yang di-upload, bukan dari snapshot di disk
+    cache_key = (dataset_key, keys, window, streak_threshold)
+    trend_df = _UPLOAD_TREND_CACHE.get(cache_key)
+    if trend_df is None:
+        period_frames = [(str(period), frame) for period, frame in dataset.groupby('Period', observed=True)]
+        long_df = stack_periods(period_frames, list(keys))
+        trend_df = compute_trends(long_df, window=window, streak_threshold=streak_threshold)
+        _UPLOAD_TREND_CACHE.put(cache_key, trend_df)
+    return trend_df
+
+_TAB_CACHE = LRUCache(maxsize=32)
+
+def _tab_key(name, options):
+    return (st.session_state.get('filter_fingerprint'), name, st.session_state.get('language'), options)
+
+def _tab_cached(name, *options):
+    """Result already built by `_tab_result` for the current filter state, or None."""
+    if st.session_state.get('filter_fingerprint') is None:
+        return None
+    return _TAB_CACHE.get(_tab_key(name, options))
+
+def _tab_result(name, build, *options):
+    """
+    `build()` memoized on the sidebar filter fingerprint (+ tab options and
+    language), so switching back to a tab reuses its figures / tables.
+    """
+    fingerprint = st.session_state.get('filter_fingerprint')
+    if fingerprint is None:
+        return build()
+    key = _tab_key(name, options)
+    result = _TAB_CACHE.get(key)
+    if result is None:
+        result = build()
+        _TAB_CACHE.put(key, result)
+    return result
+
+def _heatmap_figure(filtered_data, cube):
+    area_data = create_heatmap_data(filtered_data, cube)
+    if area_data.empty:
+        return None
+    fig = px.density_mapbox(
+        area_data,
+        lat='lat', lon='lon', z='Percentage',
+        radius=30, center=dict(lat=-2.5489, lon=118.0149),
+        zoom=4, mapbox_style="carto-positron",
+        hover_data=['Area', 'Sales', 'Nama'],
+        title='Heatmap Performa Berdasarkan Area',
+        color_continuous_scale='RdYlGn_r',
+        range_color=[filtered_data['Percentage'].min(), filtered_data['Percentage'].max()],
+        labels={'Percentage': 'Rata-rata Performa (%)', 'Sales': 'Total Penjualan', 'Nama': 'Jumlah Sales'}
+    )
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=40, b=0),
+        height=500,
+        coloraxis_colorbar=dict(title="Performa (%)", thickness=20)
+    )
+    return fig
+
+def _bubble_figure(filtered_data, cube):
+    area_data = create_heatmap_data(filtered_data, cube)
+    if area_data.empty:
+        return None
+    return create_bubble_map_figure(area_data)
+
+def _province_map(filtered_data, cube, zoom):
+    stats = province_stats(filtered_data, cube)
+    html = create_province_choropleth(filtered_data, cube, zoom_start=zoom, stats=stats).get_root().render()
+    return html, stats.attrs['unmatched_areas']
+
+def _render_maps_tab(filtered_data, cube):
+    st.subheader(f"🗺️ {get_text('geographic_distribution')}")
+    map_labels = {
+        'interactive': get_text('interactive_map'),
+        'heatmap': get_text('heatmap'),
+        'bubble': get_text('bubble_map'),
+        'province': get_text('province_map'),
+    }
+    map_type = st.radio(
+        f"📍 {get_text('map_type')}:",
+        list(map_labels), format_func=map_labels.get,
+        horizontal=True, key='map_type'
+    )
 
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        f"🗺️ {get_text('area_maps')}",
-        f"📈 {get_text('overview')}",
-        f"🏆 {get_text('performers')}",
-        f"📋 {get_text('detailed_data')}",
-        f"🎯 {get_text('recommendations')}"
-    ])
-
-    # TAB 1: MAPS
-    with tab1:
-        st.subheader(f"🗺️ {get_text('geographic_distribution')}")
-        map_type = st.radio(
-            f"📍 {get_text('map_type')}:",
-            [get_text('interactive_map'), get_text('heatmap'), get_text('bubble_map')],
-            horizontal=True
-        )
+    col_map, col_legend = st.columns([3, 1])
+
+    with col_map:
+        if map_type == 'interactive':
+            st.write(f"**📍 {get_text('interactive_map')}**")
+            st.caption("Klik marker untuk detail performa setiap area")
+            granularity_labels = {
+                'Area': 'Area',
+                'SubArea': 'SubArea',
+                'Nama': get_text('salesperson'),
+            }
+            granularity = st.selectbox(
+                f"🔎 {get_text('map_granularity')}:",
+                MAP_GRANULARITIES, format_func=granularity_labels.get, key='map_granularity'
+            )
+            # satu layer GeoJSON (SubArea/Nama di-cluster); HTML di-cache per fingerprint filter + granularity
+            map_html = performance_map_html(
+                filtered_data, cube, {'granularity': granularity},
+                fingerprint=st.session_state.get('filter_fingerprint')
+            )
+            components.html(map_html, width=800, height=600)
+            map_stats = map_cache_stats()
+            st.caption(
+                f"⚡ Map cache: {map_stats['hits']} hits / {map_stats['misses']} misses, "
+                f"{map_stats['seconds_saved']:.2f}s render saved"
+            )
+
+            unique_areas = filtered_data['Area'].nunique()
+            st.info(f"📍 **{unique_areas} area unik** ditemukan dalam data")
 
-        col_map, col_legend = st.columns([3, 1])
-
-        with col_map:
-            if map_type == get_text('interactive_map'):
-                st.write(f"**📍 {get_text('interactive_map')}**")
-                st.caption("Klik marker untuk detail performa setiap area")
-                performance_map = create_performance_map(filtered_data)
-
-                st_folium = None
-                try:
-                    from streamlit_folium import st_folium as _stf
-                    st_folium = _stf
-                except Exception:
-                    st.write("streamlit_folium not installed - cannot render interactive folium map")
-
-                if st_folium:
-                    st_folium(performance_map, width=800, height=600, returned_objects=[])
-
-                unique_areas = filtered_data['Area'].nunique()
-                st.info(f"📍 **{unique_areas} area unik** ditemukan dalam data")
-
-            elif map_type == get_text('heatmap'):
-                st.write(f"**🔥 {get_text('heatmap')}**")
-                st.caption("Area dengan warna lebih merah membutuhkan perhatian khusus")
-
-                area_data = create_heatmap_data(filtered_data)
-
-                if not area_data.empty:
-                    fig = px.density_mapbox(
-                        area_data,
-                        lat='lat', lon='lon', z='Percentage',
-                        radius=30, center=dict(lat=-2.5489, lon=118.0149),
-                        zoom=4, mapbox_style="carto-positron",
-                        hover_data=['Area', 'Sales', 'Nama'],
-                        title='Heatmap Performa Berdasarkan Area',
-                        color_continuous_scale='RdYlGn_r',
-                        range_color=[filtered_data['Percentage'].min(), filtered_data['Percentage'].max()],
-                        labels={'Percentage': 'Rata-rata Performa (%)', 'Sales': 'Total Penjualan', 'Nama': 'Jumlah Sales'}
-                    )
-                    fig.update_layout(
-                        margin=dict(l=0, r=0, t=40, b=0),
-                        height=500,
-                        coloraxis_colorbar=dict(title="Performa (%)", thickness=20)
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("⚠️ Tidak cukup data untuk membuat heatmap")
+        elif map_type == 'heatmap':
+            st.write(f"**🔥 {get_text('heatmap')}**")
+            st.caption("Area dengan warna lebih merah membutuhkan perhatian khusus")
 
+            fig = _tab_result('maps_heatmap', lambda: _heatmap_figure(filtered_data, cube))
+            if fig is not None:
+                st.plotly_chart(fig, use_container_width=True)
             else:
-                st.write(f"**🌀 {get_text('bubble_map')}**")
-                st.caption("Ukuran bubble menunjukkan jumlah sales person di area tersebut")
-
-                area_data = create_heatmap_data(filtered_data)
-
-                if not area_data.empty:
-                    fig = create_bubble_map_figure(area_data)
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("⚠️ Tidak cukup data untuk membuat bubble map")
-
-        with col_legend:
-            st.write(f"**📊 {get_text('map_legend')}**")
-            st.markdown("### 🎯 Performance Color Legend:")
-            st.markdown("""
-            - 🟢 **Hijau**: ≥120% (Excellent)
-            - 🟡 **Hijau Muda**: 100-119% (Good)
-            - 🟠 **Oranye**: 80-99% (Average)
-            - 🔴 **Merah**: <80% (Perlu Perhatian)
-            """)
-
-            if not filtered_data.empty:
-                st.write(f"**📋 {get_text('area_summary')}:**")
-                area_stats = filtered_data.groupby('Area').agg({'Percentage': 'mean', 'Sales': 'sum'}).round(1)
-
-                for area in area_stats.index[:3]:
-                    perf = area_stats.loc[area, 'Percentage']
-                    sales = area_stats.loc[area, 'Sales']
-                    st.metric(label=area, value=f"{perf:.1f}%", delta=f"Rp {sales:,.0f}")
-
-    # TAB 2: OVERVIEW
-    with tab2:
-        st.subheader("📊 Performance Overview & Analytics")
+                st.warning("⚠️ Tidak cukup data untuk membuat heatmap")
+
+        elif map_type == 'province':
+            st.write(f"**🗾 {get_text('province_map')}**")
+            st.caption("Warna provinsi = achievement rate (total sales / total target)")
+            st.session_state.setdefault('province_zoom', 5)
+            zoom = st.select_slider(f"🔍 {get_text('map_zoom')}:", options=[4, 5, 6, 7, 8], key='province_zoom')
+            if filtered_data.empty:
+                st.info("📊 Tidak ada data untuk ditampilkan")
+            else:
+                # geometri provinsi sudah disederhanakan per zoom; HTML di-cache per filter + zoom
+                map_html, unmatched = _tab_result('maps_province', lambda: _province_map(filtered_data, cube, zoom), zoom)
+                components.html(map_html, width=800, height=600)
+                if unmatched:
+                    st.caption(f"⚠️ Area tanpa provinsi: {', '.join(unmatched)}")
 
-        if not filtered_data.empty:
-            area_stats = get_area_performance(filtered_data)
-
-            if not area_stats.empty:
-                area_stats_reset = area_stats.reset_index()
-
-                fig = px.bar(
-                    area_stats_reset,
-                    x='Area', y='Achievement_Rate',
-                    title='🏆 Achievement Rate by Area',
-                    color='Achievement_Rate',
-                    color_continuous_scale='RdYlGn',
-                    text='Achievement_Rate',
-                    hover_data=['Team_Size', 'Total_Sales', 'Total_Target']
-                )
-                fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-                fig.update_layout(
-                    xaxis_title="Area", yaxis_title="Achievement Rate (%)",
-                    showlegend=False
-                )
+        else:
+            st.write(f"**🌀 {get_text('bubble_map')}**")
+            st.caption("Ukuran bubble menunjukkan jumlah sales person di area tersebut")
+
+            fig = _tab_result('maps_bubble', lambda: _bubble_figure(filtered_data, cube))
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.warning("⚠️ Tidak cukup data untuk membuat bubble map")
+
+    with col_legend:
+        st.write(f"**📊 {get_text('map_legend')}**")
+        st.markdown("### 🎯 Performance Color Legend:")
+        st.markdown("""
+        - 🟢 **Hijau**: ≥120% (Excellent)
+        - 🟡 **Hijau Muda**: 100-119% (Good)
+        - 🟠 **Oranye**: 80-99% (Average)
+        - 🔴 **Merah**: <80% (Perlu Perhatian)
+        """)
 
         if not filtered_data.empty:
-            subarea_stats = (
-                filtered_data.groupby('SubArea')
-                .agg({'Sales': 'sum', 'Target': 'sum', 'Nama': 'count'})
-                .reset_index()
+            st.write(f"**📋 {get_text('area_summary')}:**")
+            area_level = cube['Area']
+            area_stats = pd.DataFrame({
+                'Percentage': area_level['Pct_Mean'], 'Sales': area_level['Sales_Sum']
+            }).round(1)
+
+            for area in area_stats.index[:3]:
+                perf = area_stats.loc[area, 'Percentage']
+                sales = area_stats.loc[area, 'Sales']
+                st.metric(label=area, value=f"{perf:.1f}%", delta=f"Rp {sales:,.0f}")
+
+def _overview_figures(filtered_data, cube):
+    area_fig = None
+    area_stats = get_area_performance(filtered_data, cube)
+
+    if not area_stats.empty:
+        area_stats_reset = area_stats.reset_index()
+
+        area_fig = px.bar(
+            area_stats_reset,
+            x='Area', y='Achievement_Rate',
+            title='🏆 Achievement Rate by Area',
+            color='Achievement_Rate',
+            color_continuous_scale='RdYlGn',
+            text='Achievement_Rate',
+            hover_data=['Team_Size', 'Total_Sales', 'Total_Target']
+        )
+        area_fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+        area_fig.update_layout(
+            xaxis_title="Area", yaxis_title="Achievement Rate (%)",
+            showlegend=False
+        )
+
+    subarea_level = cube['SubArea']
+    subarea_stats = pd.DataFrame({
+        'Sales': subarea_level['Sales_Sum'],
+        'Target': subarea_level['Target_Sum'],
+        'Nama': subarea_level['Nama_Count'],
+    }).reset_index()
+
+    subarea_stats['Achievement'] = (
+        subarea_stats['Sales'] / subarea_stats['Target'] * 100
+    ).round(1)
+
+    subarea_stats = subarea_stats.sort_values('Achievement', ascending=True)
+
+    fig_bar = go.Figure()
+    fig_bar.add_trace(go.Bar(
+        name='Target',
+        x=subarea_stats['SubArea'],
+        y=subarea_stats['Target'],
+        text=subarea_stats['Target'],
+        textposition='auto'
+    ))
+    fig_bar.add_trace(go.Bar(
+        name='Sales',
+        x=subarea_stats['SubArea'],
+        y=subarea_stats['Sales'],
+        text=subarea_stats['Sales'],
+        textposition='auto'
+    ))
+
+    fig_bar.update_layout(
+        title='Sales vs Target by Sub-Area (Sorted by Achievement)',
+        barmode='group',
+        xaxis_title="Sub-Area",
+        yaxis_title="Amount",
+        xaxis_tickangle=-45,
+        height=500
+    )
+    return area_fig, fig_bar
+
+def _render_overview_tab(filtered_data, cube):
+    st.subheader("📊 Performance Overview & Analytics")
+
+    if not filtered_data.empty:
+        area_fig, subarea_fig = _tab_result('overview', lambda: _overview_figures(filtered_data, cube))
+        if area_fig is not None:
+            st.plotly_chart(area_fig, use_container_width=True)
+        st.plotly_chart(subarea_fig, use_container_width=True)
+
+PERFORMER_COLUMNS = ['Nama', 'SubArea', 'Grade', 'Sales', 'Target', 'Percentage', 'Performance_Category']
+PERFORMER_FORMATS = {'Sales': '{:.0f}', 'Target': '{:.0f}', 'Percentage': '{:.1f}%'}
+
+def _performer_tables(filtered_data):
+    category_counts = filtered_data['Performance_Category'].value_counts()
+    return {
+        'excellent': int(category_counts.get('Excellent', 0)),
+        'good': int(category_counts.get('Good', 0)),
+        'average': int(category_counts.get('Average', 0)),
+        'poor': int(category_counts.get('Below Average', 0) + category_counts.get('Poor', 0)),
+        'top_10': filtered_data.nlargest(10, 'Percentage')[PERFORMER_COLUMNS],
+        'bottom_10': filtered_data.nsmallest(10, 'Percentage')[PERFORMER_COLUMNS],
+    }
+
+def _render_performers_tab(filtered_data, cube):
+    st.subheader("🏆 Top Performers Analysis & Insights")
+
+    if not filtered_data.empty:
+        performers = _tab_result('performers', lambda: _performer_tables(filtered_data))
+        team_size = len(filtered_data)
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            excellent_performers = performers['excellent']
+            st.metric(get_text('excellent_performers'), excellent_performers, f"{excellent_performers / team_size * 100:.1f}%")
+
+        with col2:
+            good_performers = performers['good']
+            st.metric(get_text('good_performers'), good_performers, f"{good_performers / team_size * 100:.1f}%")
+
+        with col3:
+            avg_performers = performers['average']
+            st.metric(get_text('average_performers'), avg_performers, f"{avg_performers / team_size * 100:.1f}%")
+
+        with col4:
+            poor_performers = performers['poor']
+            st.metric(get_text('needs_improvement'), poor_performers, f"{poor_performers / team_size * 100:.1f}%")
+
+        st.markdown("---")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write(f"**🏅 {get_text('top_performers')}:**")
+            top_10 = performers['top_10']
+            render_table(
+                top_10, PERFORMER_FORMATS,
+                cell_css={'Percentage': background_css(top_10['Percentage'], TOP_HIGHLIGHT_BANDS)},
+                use_container_width=True
             )
 
-            subarea_stats['Achievement'] = (
-                subarea_stats['Sales'] / subarea_stats['Target'] * 100
-            ).round(1)
-
-            subarea_stats = subarea_stats.sort_values('Achievement', ascending=True)
-
-            fig_bar = go.Figure()
-            fig_bar.add_trace(go.Bar(
-                name='Target',
-                x=subarea_stats['SubArea'],
-                y=subarea_stats['Target'],
-                text=subarea_stats['Target'],
-                textposition='auto'
-            ))
-            fig_bar.add_trace(go.Bar(
-                name='Sales',
-                x=subarea_stats['SubArea'],
-                y=subarea_stats['Sales'],
-                text=subarea_stats['Sales'],
-                textposition='auto'
-            ))
-
-            fig_bar.update_layout(
-                title='Sales vs Target by Sub-Area (Sorted by Achievement)',
-                barmode='group',
-                xaxis_title="Sub-Area",
-                yaxis_title="Amount",
-                xaxis_tickangle=-45,
-                height=500
+        with col2:
+            st.write(f"**⚠️ {get_text('bottom_performers')}:**")
+            bottom_10 = performers['bottom_10']
+            render_table(
+                bottom_10, PERFORMER_FORMATS,
+                cell_css={'Percentage': background_css(bottom_10['Percentage'], BOTTOM_HIGHLIGHT_BANDS)},
+                use_container_width=True
             )
-            st.plotly_chart(fig_bar, use_container_width=True)
 
-    # TAB 3: PERFORMERS
-    with tab3:
-        st.subheader("🏆 Top Performers Analysis & Insights")
+DETAIL_SORT_COLUMNS = {
+    'Percentage DESC': ['Percentage', False],
+    'Percentage ASC': ['Percentage', True],
+    'Sales DESC': ['Sales', False],
+    'Sales ASC': ['Sales', True],
+    'Target DESC': ['Target', False],
+    'Target ASC': ['Target', True],
+    'Name A-Z': ['Nama', True],
+    'Name Z-A': ['Nama', False],
+    'Area A-Z': ['Area', True],
+    'Relevance': ['Percentage', False],
+}
+
+DETAIL_COLUMNS = [
+    'Nama', 'Area', 'SubArea', 'Grade', 'Target',
+    'Sales', 'Minus/plus', 'Percentage', 'Performance_Category'
+]
+DETAIL_PAGE_SIZES = [50, 100, 250, 500, 1000]
+DETAIL_FORMATS = {'Target': '{:.0f}', 'Sales': '{:.0f}', 'Minus/plus': '{:+.0f}', 'Percentage': '{:.1f}%'}
+
+def _search_index(filtered_data):
+    # index trigram dibangun sekali per dataset (milik filter engine sidebar)
+    fingerprint = st.session_state.get('filter_fingerprint')
+    engine = cached_filter_engine(fingerprint[0]) if fingerprint else None
+    return engine.search_index() if engine is not None else NameSearchIndex(filtered_data)
+
+def _detail_view(filtered_data, search_name, sort_by, search_subarea=False):
+    # sort sekali (argsort satu kolom); halaman diambil lewat iloc[order[start:stop]]
+    display_df = filtered_data
+    relevance = None
+    fuzzy = False
+
+    if search_name:
+        columns = ('Nama', 'SubArea') if search_subarea else ('Nama',)
+        scores = _search_index(filtered_data).match_scores(display_df, search_name, columns)
+        matched = scores > 0
+        display_df = display_df[matched]
+        relevance = scores[matched]
+        fuzzy = bool(len(relevance)) and relevance.max() < 1
+
+    sort_col, ascending = DETAIL_SORT_COLUMNS[sort_by]
+    order = (
+        display_df[sort_col].reset_index(drop=True)
+        .sort_values(ascending=ascending, kind='stable', na_position='last')
+        .index.to_numpy()
+    )
+    if sort_by == 'Relevance' and relevance is not None:
+        # skor tertinggi dulu, seri tetap urut Percentage DESC
+        order = order[np.argsort(-relevance[order], kind='stable')]
+
+    total_sales = display_df['Sales'].sum()
+    total_target = display_df['Target'].sum()
+    return {
+        'display_df': display_df,
+        'order': order,
+        'fuzzy': fuzzy,
+        'total_sales': total_sales,
+        'total_target': total_target,
+        'avg_achievement': display_df['Percentage'].mean(),
+        'total_gap': display_df['Minus/plus'].sum(),
+        'achievement_rate': total_sales / total_target * 100 if total_target > 0 else 0,
+    }
+
+def _detail_page(detail, page, page_size):
+    start = (page - 1) * page_size
+    rows = detail['order'][start:start + page_size]
+    return detail['display_df'][DETAIL_COLUMNS].iloc[rows], start
+
+def _render_detailed_tab(filtered_data, cube):
+    st.subheader("📋 Detailed Data View & Analysis")
+
+    if not filtered_data.empty:
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            search_name = st.text_input(f"🔍 {get_text('search_name')}:", key='detail_search')
+
+        with col2:
+            sort_by = st.selectbox(
+                f"📊 {get_text('sort_by')}:",
+                [
+                    'Percentage DESC', 'Percentage ASC',
+                    'Sales DESC', 'Sales ASC',
+                    'Target DESC', 'Target ASC',
+                    'Name A-Z', 'Name Z-A',
+                    'Area A-Z', 'Relevance'
+                ],
+                key='detail_sort'
+            )
 
-        if not filtered_data.empty:
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                excellent_performers = len(filtered_data[filtered_data['Performance_Category'] == 'Excellent'])
-                st.metric(get_text('excellent_performers'), excellent_performers, f"{excellent_performers / len(filtered_data) * 100:.1f}%")
-
-            with col2:
-                good_performers = len(filtered_data[filtered_data['Performance_Category'] == 'Good'])
-                st.metric(get_text('good_performers'), good_performers, f"{good_performers / len(filtered_data) * 100:.1f}%")
-
-            with col3:
-                avg_performers = len(filtered_data[filtered_data['Performance_Category'] == 'Average'])
-                st.metric(get_text('average_performers'), avg_performers, f"{avg_performers / len(filtered_data) * 100:.1f}%")
-
-            with col4:
-                poor_performers = len(filtered_data[filtered_data['Performance_Category'].isin(['Below Average', 'Poor'])])
-                st.metric(get_text('needs_improvement'), poor_performers, f"{poor_performers / len(filtered_data) * 100:.1f}%")
-
-            st.markdown("---")
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                top_10 = filtered_data.nlargest(10, 'Percentage')[[
-                    'Nama', 'SubArea', 'Grade', 'Sales', 'Target', 'Percentage', 'Performance_Category'
-                ]]
-                st.write(f"**🏅 {get_text('top_performers')}:**")
-                st.dataframe(
-                    top_10.style.format({
-                        'Sales': '{:.0f}', 'Target': '{:.0f}', 'Percentage': '{:.1f}%'
-                    }),
-                    use_container_width=True
-                )
-
-            with col2:
-                bottom_10 = filtered_data.nsmallest(10, 'Percentage')[[
-                    'Nama', 'SubArea', 'Grade', 'Sales', 'Target', 'Percentage', 'Performance_Category'
-                ]]
-                st.write(f"**⚠️ {get_text('bottom_performers')}:**")
-                st.dataframe(
-                    bottom_10.style.format({
-                        'Sales': '{:.0f}', 'Target': '{:.0f}', 'Percentage': '{:.1f}%'
-                    }),
-                    use_container_width=True
-                )
-
-    # TAB 4: DETAILED DATA
-    with tab4:
-        st.subheader("📋 Detailed Data View & Analysis")
+        with col3:
+            export_format = st.selectbox(
+                f"📤 {get_text('export_format')}:",
+                ['View Only', 'CSV Download', 'Excel Download'],
+                key='detail_export'
+            )
 
-        if not filtered_data.empty:
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                search_name = st.text_input(f"🔍 {get_text('search_name')}:")
-
-            with col2:
-                sort_by = st.selectbox(
-                    f"📊 {get_text('sort_by')}:",
-                    [
-                        'Percentage DESC', 'Percentage ASC',
-                        'Sales DESC', 'Sales ASC',
-                        'Target DESC', 'Target ASC',
-                        'Name A-Z', 'Name Z-A',
-                        'Area A-Z'
-                    ]
-                )
-
-            with col3:
-                export_format = st.selectbox(
-                    f"📤 {get_text('export_format')}:",
-                    ['View Only', 'CSV Download', 'Excel Download']
-                )
-
-            display_df = filtered_data.copy()
-
-            if search_name:
-                display_df = display_df[
-                    display_df['Nama'].str.contains(search_name, case=False, na=False)
-                ]
-
-            sort_columns = {
-                'Percentage DESC': ['Percentage', False],
-                'Percentage ASC': ['Percentage', True],
-                'Sales DESC': ['Sales', False],
-                'Sales ASC': ['Sales', True],
-                'Target DESC': ['Target', False],
-                'Target ASC': ['Target', True],
-                'Name A-Z': ['Nama', True],
-                'Name Z-A': ['Nama', False],
-                'Area A-Z': ['Area', True]
-            }
+        search_subarea = st.checkbox(f"🏢 {get_text('search_subarea')}", key='detail_search_subarea')
 
-            sort_col, ascending = sort_columns[sort_by]
-            display_df = display_df.sort_values(sort_col, ascending=ascending)
+        detail = _tab_result(
+            'detailed', lambda: _detail_view(filtered_data, search_name, sort_by, search_subarea),
+            search_name, sort_by, search_subarea
+        )
+        if detail['fuzzy']:
+            st.caption(f"🔎 {get_text('fuzzy_matches')} \"{search_name}\"")
+        display_df = detail['display_df']
 
-            col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4 = st.columns(4)
 
-            with col1:
-                st.metric(get_text('records_shown'), len(display_df))
+        with col1:
+            st.metric(get_text('records_shown'), len(display_df))
 
-            with col2:
-                avg_achievement = display_df['Percentage'].mean()
-                st.metric(get_text('avg_achievement'), f"{avg_achievement:.1f}%")
+        with col2:
+            st.metric(get_text('avg_achievement'), f"{detail['avg_achievement']:.1f}%")
 
-            with col3:
-                total_gap = display_df['Minus/plus'].sum()
-                st.metric(get_text('total_gap'), f"{total_gap:+.0f}")
+        with col3:
+            st.metric(get_text('total_gap'), f"{detail['total_gap']:+.0f}")
 
-            with col4:
-                achievement_rate = (
-                    display_df['Sales'].sum() / display_df['Target'].sum() * 100
-                    if display_df['Target'].sum() > 0
-                    else 0
-                )
-                st.metric(get_text('group_achievement'), f"{achievement_rate:.1f}%")
+        with col4:
+            st.metric(get_text('group_achievement'), f"{detail['achievement_rate']:.1f}%")
 
-            st.write(f"**📊 Showing {len(display_df)} of {len(filtered_data)} records**")
+        col_size, col_page = st.columns([1, 3])
+        with col_size:
+            page_size = st.selectbox(f"📄 {get_text('rows_per_page')}:", DETAIL_PAGE_SIZES, index=1, key='detail_page_size')
+        n_pages = max(1, -(-len(display_df) // page_size))
 
-            display_columns = [
-                'Nama', 'Area', 'SubArea', 'Grade', 'Target',
-                'Sales', 'Minus/plus', 'Percentage', 'Performance_Category'
-            ]
+        # halaman kembali ke 1 kalau filter / pencarian / urutan / ukuran halaman berubah
+        page_state = (st.session_state.get('filter_fingerprint'), search_name, search_subarea, sort_by, page_size)
+        if st.session_state.get('detail_page_state') != page_state:
+            st.session_state.detail_page_state = page_state
+            st.session_state.detail_page = 1
+        st.session_state.detail_page = min(max(1, st.session_state.get('detail_page', 1)), n_pages)
 
-            styled_df = display_df[display_columns].style.format({
-                'Target': '{:.0f}', 'Sales': '{:.0f}',
-                'Minus/plus': '{:+.0f}', 'Percentage': '{:.1f}%'
-            })
+        with col_page:
+            page = st.number_input(
+                f"📑 {get_text('page')} (1-{n_pages}):", min_value=1, max_value=n_pages, step=1, key='detail_page'
+            )
 
-            st.dataframe(styled_df, use_container_width=True, height=500)
+        # hanya halaman yang terlihat yang di-slice dan di-format
+        page_df, start = _detail_page(detail, page, page_size)
+        st.write(
+            f"**📊 Showing {start + 1 if len(page_df) else 0}-{start + len(page_df)} of {len(display_df):,} records "
+            f"({len(filtered_data):,} in selection)**"
+        )
+        st.caption(
+            f"Σ Sales {detail['total_sales']:,.0f} · Σ Target {detail['total_target']:,.0f} "
+            f"(computed on all {len(display_df):,} matching records)"
+        )
 
-            if export_format == 'CSV Download':
-                csv = display_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download CSV",
-                    data=csv,
-                    file_name=f"sales_performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-        else:
-            st.info("📊 Tidak ada data untuk ditampilkan")
+        render_table(
+            page_df, DETAIL_FORMATS,
+            row_css=background_css(page_df['Percentage'], ROW_HIGHLIGHT_BANDS, contrast_text=False),
+            use_container_width=True, height=min(500, 38 + 35 * len(page_df))
+        )
 
-    # TAB 5: RECOMMENDATIONS
-    with tab5:
-        st.subheader("🎯 Strategic Recommendations & Action Plans")
+        if export_format != 'View Only':
+            _render_detail_export(detail, export_format, (search_name, search_subarea), sort_by)
+    else:
+        st.info("📊 Tidak ada data untuk ditampilkan")
+
+def _render_detail_export(detail, export_format, search, sort_by):
+    # file hanya dibuat saat user menekan tombol, lalu di-cache per fingerprint filter + opsi
+    if export_format == 'Excel Download':
+        per_area = st.checkbox(f"🗂️ {get_text('sheet_per_area')}", key='detail_export_per_area')
+        options = ('xlsx', search, sort_by, per_area)
+        build = lambda: to_excel_bytes(detail['display_df'].iloc[detail['order']], per_area=per_area)
+        extension, mime = 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        options = ('csv', search, sort_by)
+        build = lambda: to_csv_bytes(detail['display_df'].iloc[detail['order']])
+        extension, mime = 'csv', 'text/csv'
+
+    export_data = _tab_cached('detail_export', *options)
+    if export_data is None and st.button(f"⚙️ {get_text('generate_export')}", key='detail_export_generate'):
+        with st.spinner(f"{len(detail['display_df']):,} records..."):
+            export_data = _tab_result('detail_export', build, *options)
+
+    if export_data is not None:
+        st.download_button(
+            label=f"📥 Download {extension.upper()} ({len(export_data) / 1e6:.1f} MB)",
+            data=export_data,
+            file_name=f"sales_performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            mime=mime
+        )
 
-        if not filtered_data.empty:
-            critical_areas = filtered_data.groupby('SubArea')['Percentage'].mean().nsmallest(3)
-            zero_sales = filtered_data[filtered_data['Sales'] == 0]
-            poor_performers = filtered_data[
-                filtered_data['Performance_Category'].isin(['Below Average', 'Poor'])
-            ]
-            excellent_performers = filtered_data[
-                filtered_data['Performance_Category'] == 'Excellent'
-            ]
-
-            st.markdown(f"### 📋 {get_text('executive_summary')}")
-
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                overall_achievement = (
-                    filtered_data['Sales'].sum()
-                    / filtered_data['Target'].sum() * 100
-                    if filtered_data['Target'].sum() > 0
-                    else 0
-                )
-                status = (
-                    "🟢 Good" if overall_achievement >= 100
-                    else "🟡 Needs Attention" if overall_achievement >= 80
-                    else "🔴 Critical"
-                )
-                st.metric(get_text('overall_status'), status, f"{overall_achievement:.1f}%")
-
-            with col2:
-                risk_level = len(poor_performers) / len(filtered_data) * 100
-                risk_status = (
-                    "🔴 High" if risk_level > 30
-                    else "🟡 Medium" if risk_level > 15
-                    else "🟢 Low"
-                )
-                st.metric(get_text('risk_level'), risk_status, f"{risk_level:.1f}%")
-
-            with col3:
-                improvement_potential = len(
-                    filtered_data[
-                        (filtered_data['Percentage'] >= 50)
-                        & (filtered_data['Percentage'] < 80)
-                    ]
-                )
-                st.metric(
-                    get_text('quick_wins'),
-                    f"{improvement_potential} people",
-                    "Medium performers"
-                )
-
-            with col4:
-                benchmark_performers = len(excellent_performers)
-                st.metric(
-                    get_text('benchmarks'),
-                    f"{benchmark_performers} people",
-                    "Excellent performers"
-                )
-
-            st.markdown("---")
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.write(f"### 🔴 {get_text('immediate_actions')}")
-
-                if len(critical_areas) > 0:
-                    st.markdown(f"""
-                    **1. 🚨 Critical Areas Intervention:**
-                    - **{critical_areas.index[0] if len(critical_areas) > 0 else 'N/A'}**: {(critical_areas.iloc[0] if len(critical_areas) > 0 else 0):.1f}% achievement
-                    - **{critical_areas.index[1] if len(critical_areas) > 1 else 'N/A'}**: {(critical_areas.iloc[1] if len(critical_areas) > 1 else 0):.1f}% achievement
-                    - **{critical_areas.index[2] if len(critical_areas) > 2 else 'N/A'}**: {(critical_areas.iloc[2] if len(critical_areas) > 2 else 0):.1f}% achievement
-
-                    **📋 Action Items:**
-                    - Immediate area manager meetings
-                    - Resource reallocation assessment
-                    - Market condition analysis
-                    """)
-
-                if len(zero_sales) > 0:
-                    st.markdown(f"""
-                    **2. 🎯 Zero-Sales Intervention:**
-                    - **{len(zero_sales)} people** with zero sales
-                    - Immediate 1-on-1 coaching required
-                    - Performance improvement plans (PIP)
-
-                    **📋 Action Items:**
-                    - Daily check-ins for 2 weeks
-                    - Skills assessment and training
-                    - Mentorship pairing
-                    """)
+def _recommendation_summary(filtered_data, cube):
+    percentage = filtered_data['Percentage']
+    category = filtered_data['Performance_Category']
+    return {
+        'critical_areas': cube['SubArea']['Pct_Mean'].nsmallest(3),
+        'zero_sales': int((filtered_data['Sales'] == 0).sum()),
+        'poor_performers': int(category.isin(['Below Average', 'Poor']).sum()),
+        'excellent_performers': int((category == 'Excellent').sum()),
+        'improvement_potential': int(((percentage >= 50) & (percentage < 80)).sum()),
+        'overall_achievement': (
+            filtered_data['Sales'].sum()
+            / filtered_data['Target'].sum() * 100
+            if filtered_data['Target'].sum() > 0
+            else 0
+        ),
+    }
+
+def _render_recommendations_tab(filtered_data, cube):
+    st.subheader("🎯 Strategic Recommendations & Action Plans")
+
+    if not filtered_data.empty:
+        summary = _tab_result('recommendations', lambda: _recommendation_summary(filtered_data, cube))
+        critical_areas = summary['critical_areas']
+
+        st.markdown(f"### 📋 {get_text('executive_summary')}")
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            overall_achievement = summary['overall_achievement']
+            status = (
+                "🟢 Good" if overall_achievement >= 100
+                else "🟡 Needs Attention" if overall_achievement >= 80
+                else "🔴 Critical"
+            )
+            st.metric(get_text('overall_status'), status, f"{overall_achievement:.1f}%")
+
+        with col2:
+            risk_level = summary['poor_performers'] / len(filtered_data) * 100
+            risk_status = (
+                "🔴 High" if risk_level > 30
+                else "🟡 Medium" if risk_level > 15
+                else "🟢 Low"
+            )
+            st.metric(get_text('risk_level'), risk_status, f"{risk_level:.1f}%")
+
+        with col3:
+            improvement_potential = summary['improvement_potential']
+            st.metric(
+                get_text('quick_wins'),
+                f"{improvement_potential} people",
+                "Medium performers"
+            )
 
-        else:
-            st.info("📊 Tidak ada data untuk rekomendasi")
+        with col4:
+            benchmark_performers = summary['excellent_performers']
+            st.metric(
+                get_text('benchmarks'),
+                f"{benchmark_performers} people",
+                "Excellent performers"
+            )
+
+        st.markdown("---")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write(f"### 🔴 {get_text('immediate_actions')}")
+
+            if len(critical_areas) > 0:
+                st.markdown(f"""
+                **1. 🚨 Critical Areas Intervention:**
+                - **{critical_areas.index[0] if len(critical_areas) > 0 else 'N/A'}**: {(critical_areas.iloc[0] if len(critical_areas) > 0 else 0):.1f}% achievement
+                - **{critical_areas.index[1] if len(critical_areas) > 1 else 'N/A'}**: {(critical_areas.iloc[1] if len(critical_areas) > 1 else 0):.1f}% achievement
+                - **{critical_areas.index[2] if len(critical_areas) > 2 else 'N/A'}**: {(critical_areas.iloc[2] if len(critical_areas) > 2 else 0):.1f}% achievement
+
+                **📋 Action Items:**
+                - Immediate area manager meetings
+                - Resource reallocation assessment
+                - Market condition analysis
+                """)
+
+            if summary['zero_sales'] > 0:
+                st.markdown(f"""
+                **2. 🎯 Zero-Sales Intervention:**
+                - **{summary['zero_sales']} people** with zero sales
+                - Immediate 1-on-1 coaching required
+                - Performance improvement plans (PIP)
+
+                **📋 Action Items:**
+                - Daily check-ins for 2 weeks
+                - Skills assessment and training
+                - Mentorship pairing
+                """)
+
+    else:
+        st.info("📊 Tidak ada data untuk rekomendasi")
+
+def _render_trends_tab(filtered_data, cube):
+    st.subheader(f"📉 {get_text('trends_title')}")
+
+    # default lewat session_state (bukan argumen value) karena key-nya ikut dipertahankan antar tab
+    st.session_state.setdefault('trend_window', ROLLING_WINDOW)
+    st.session_state.setdefault('trend_threshold', STREAK_THRESHOLD)
+    st.session_state.setdefault('trend_min_streak', STREAK_MIN_PERIODS)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        key_label = st.selectbox(f"🧑 {get_text('trend_identity')}:", list(TREND_KEY_OPTIONS.keys()), key='trend_identity')
+    with col2:
+        window = st.slider(f"🔁 {get_text('rolling_window')}:", 2, 6, key='trend_window')
+    with col3:
+        streak_threshold = st.slider(f"📉 {get_text('streak_threshold')} (%):", 0, 150, step=5, key='trend_threshold')
+    with col4:
+        min_streak = st.slider(f"⏱️ {get_text('streak_periods')}:", 2, 6, key='trend_min_streak')
+
+    fingerprint = st.session_state.get('filter_fingerprint')
+    engine = cached_filter_engine(fingerprint[0]) if fingerprint else None
+    trend_df = pd.DataFrame()
+    if engine is not None and len(engine.periods()) > 1:
+        trend_df = _upload_trend_table(
+            engine.df, fingerprint[0], TREND_KEY_OPTIONS[key_label], window, streak_threshold
+        )
+    elif fingerprint and str(fingerprint[0][0]).startswith('snapshot:'):
+        # snapshot dipilih di sidebar → tren dari semua snapshot di disk
+        snapshots = list_snapshots()
+        source_fingerprint = tuple((snap['path'], os.path.getmtime(snap['path'])) for snap in snapshots)
+        trend_df = _build_trend_table(
+            TREND_KEY_OPTIONS[key_label], window, streak_threshold, source_fingerprint
+        )
+        st.caption(f"📦 {len(snapshots)} snapshot periods (saved on disk), not only the selected snapshot")
+
+    if trend_df.empty:
+        st.info("📊 Belum ada data multi-periode: upload ≥ 2 file (satu per periode) "
+                "atau pilih snapshot di sidebar (`python -m src.data.snapshots csv/`)")
+        return
+
+    # filter sidebar (Area / Grade / Category / rentang %) berlaku per baris orang × periode
+    if fingerprint:
+        trend_df = filter_trend_rows(trend_df, *fingerprint[1:6])
+    if trend_df.empty:
+        st.info("📊 Tidak ada data untuk ditampilkan")
+        return
+
+    trend_areas = ['All'] + sorted(trend_df['Area'].astype(str).unique().tolist())
+    trend_area = st.selectbox(f"📍 {get_text('select_area')}:", trend_areas, key='trend_area')
+    if trend_area != 'All':
+        trend_df = trend_df[trend_df['Area'] == trend_area]
+
+    summary = period_summary(trend_df)
+    periods = summary.index.tolist()
+    st.caption(f"📅 {len(periods)} periode: {periods[0]} → {periods[-1]}")
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=summary.index.astype(str), y=summary['Achievement_Rate'],
+        mode='lines+markers+text', name='Achievement Rate',
+        text=summary['Achievement_Rate'].map('{:.1f}%'.format), textposition='top center'
+    ))
+    fig.add_trace(go.Scatter(
+        x=summary.index.astype(str), y=summary['Avg_Performance'],
+        mode='lines+markers', name='Avg Performance', line=dict(dash='dot')
+    ))
+    fig.update_layout(
+        title='Achievement per Period', xaxis_title='Period',
+        yaxis_title='Achievement (%)', height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    render_table(
+        summary, {
+            'Total_Target': '{:,.0f}', 'Total_Sales': '{:,.0f}',
+            'Avg_Performance': '{:.1f}%', 'Achievement_Rate': '{:.1f}%',
+            'Achievement_Delta': '{:+.1f}'
+        }, na_rep='-',
+        use_container_width=True
+    )
+
+    st.markdown("---")
+    alerts = streak_alerts(trend_df, min_periods=min_streak)
+    st.write(
+        f"### 🚨 {get_text('streak_alerts')}: "
+        f"{len(alerts)} people < {streak_threshold}% for ≥ {min_streak} periods"
+    )
+    if not alerts.empty:
+        # bisa ribuan baris → format native, tanpa Styler
+        render_table(
+            alerts[['Nama', 'Area', 'SubArea', 'Grade', 'Percentage',
+                    'Rolling_Achievement', 'Below_Streak', 'Periods_Active']],
+            {'Percentage': '{:.1f}%', 'Rolling_Achievement': '{:.1f}%'}, na_rep='-',
+            use_container_width=True, height=300
+        )
+
+    st.markdown("---")
+    last_period = trend_df['Period_Index'].max()
+    movers = trend_df[(trend_df['Period_Index'] == last_period) & trend_df['Delta_Pct'].notna()]
+    mover_columns = ['Nama', 'Area', 'SubArea', 'Percentage', 'Delta_Pct', 'Rolling_Achievement']
+    mover_format = {'Percentage': '{:.1f}%', 'Delta_Pct': '{:+.1f}', 'Rolling_Achievement': '{:.1f}%'}
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**📈 {get_text('top_improvers')}:**")
+        render_table(movers.nlargest(10, 'Delta_Pct')[mover_columns], mover_format, na_rep='-', use_container_width=True)
+    with col2:
+        st.write(f"**📉 {get_text('top_decliners')}:**")
+        render_table(movers.nsmallest(10, 'Delta_Pct')[mover_columns], mover_format, na_rep='-', use_container_width=True)
+
+TAB_IDS = ['maps', 'overview', 'performers', 'detailed', 'recommendations', 'trends']
+
+_TAB_RENDERERS = {
+    'maps': _render_maps_tab,
+    'overview': _render_overview_tab,
+    'performers': _render_performers_tab,
+    'detailed': _render_detailed_tab,
+    'recommendations': _render_recommendations_tab,
+    'trends': _render_trends_tab,
+}
+
+# widget di dalam tab yang tidak sedang dirender akan dibuang state-nya oleh Streamlit;
+# key ini di-assign ulang setiap rerun supaya pilihan user tetap saat pindah tab
+_TAB_WIDGET_KEYS = [
+    'map_type', 'map_granularity', 'province_zoom',
+    'detail_search', 'detail_search_subarea', 'detail_sort', 'detail_export', 'detail_export_per_area', 'detail_page_size', 'detail_page',
+    'trend_identity', 'trend_window', 'trend_threshold', 'trend_min_streak', 'trend_area',
+]
+
+def render_tabs(filtered_data, team_metrics, cube=None):
+    if cube is None:
+        cube = get_aggregation_cube(filtered_data)
+
+    with stage('kpi_cards'):
+        render_kpis_card_block(team_metrics)
+    st.markdown("---")
+
+    for key in _TAB_WIDGET_KEYS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+    # navigasi: hanya tab yang aktif yang menghitung & merender isinya
+    tab_labels = {
+        'maps': f"🗺️ {get_text('area_maps')}",
+        'overview': f"📈 {get_text('overview')}",
+        'performers': f"🏆 {get_text('performers')}",
+        'detailed': f"📋 {get_text('detailed_data')}",
+        'recommendations': f"🎯 {get_text('recommendations')}",
+        'trends': f"📉 {get_text('trends')}",
+    }
+    active_tab = st.radio(
+        "Tab", TAB_IDS, format_func=tab_labels.get,
+        horizontal=True, key='active_tab', label_visibility='collapsed'
+    )
+    with stage(f"tab:{active_tab}"):
+        _TAB_RENDERERS[active_tab](filtered_data, cube)
 
     st.markdown("---")
 
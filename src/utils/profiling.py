@@ -0,0 +1,182 @@
+# src/utils/profiling.py
+"""
+Per-rerun stage timing.
+
+`begin_rerun()` starts a profile for the current script thread (each
+Streamlit session reruns on its own thread). `with stage(name):` blocks
+anywhere in the app then add a perf_counter timing; stages may nest. When
+no rerun is being profiled (headless use, tests), `stage` does nothing.
+`end_rerun()` closes the profile and returns a JSON-ready record, which is
+also appended as one line to the local log.
+
+The timers are always on (two perf_counter calls per stage). cProfile and
+tracemalloc are opt-in per rerun, because both slow the app down noticeably.
+Both are process-wide: only one rerun at a time gets them (the others fall
+back to timers only), and tracemalloc peaks include allocations made by
+other sessions' threads meanwhile.
+"""
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# '' = tanpa log file
+PROFILE_LOG_PATH = os.environ.get('DASHBOARD_PROFILE_LOG', os.path.join('logs', 'reruns.jsonl'))
+# log diputar ke '<path>.1' (satu cadangan) begitu melewati batas ini; 0 = tanpa batas
+PROFILE_LOG_MAX_BYTES = int(os.environ.get('DASHBOARD_PROFILE_LOG_MAX_BYTES', 5 * 1024 * 1024))
+PROFILE_TOP_FUNCTIONS = 25
+
+_current = threading.local()
+_log_lock = threading.Lock()
+# tracemalloc (start/stop, reset_peak) berlaku untuk seluruh proses → satu rerun sekaligus
+_trace_lock = threading.Lock()
+
+
+class RerunProfile:
+    def __init__(self, cprofile=False, trace_memory=False):
+        self.stages = []
+        self._open = []
+        self.started = time.perf_counter()
+        self.timestamp = datetime.now().isoformat(timespec='milliseconds')
+        self.notes = []
+        self.trace_memory = False
+        if trace_memory:
+            if _trace_lock.acquire(blocking=False):
+                if tracemalloc.is_tracing():
+                    _trace_lock.release()
+                else:
+                    self.trace_memory = True
+                    tracemalloc.start()
+            if not self.trace_memory:
+                self.notes.append('tracemalloc busy (another rerun or tool is tracing)')
+        self.profiler = None
+        if cprofile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError as e:
+                # Python 3.12: "Another profiling tool is already active" (rerun lain / debugger)
+                self.notes.append(f"cProfile unavailable: {e}")
+
+    def _fold_peak(self):
+        # peak sejak reset terakhir berlaku untuk semua stage yang sedang terbuka
+        _, peak = tracemalloc.get_traced_memory()
+        for entry in self._open:
+            entry['_peak'] = max(entry['_peak'], peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        entry = {'stage': name, 'depth': len(self._open)}
+        if self.trace_memory:
+            self._fold_peak()
+            entry['_baseline'] = entry['_peak'] = tracemalloc.get_traced_memory()[0]
+        self.stages.append(entry)
+        self._open.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            if self.trace_memory:
+                self._fold_peak()
+                entry['peak_mb'] = round((entry.pop('_peak') - entry.pop('_baseline')) / 1e6, 2)
+            self._open.pop()
+
+    def finish(self, context=None):
+        total = time.perf_counter() - self.started
+        # profiler & tracemalloc dimatikan dulu, sebelum apa pun yang bisa gagal
+        if self.profiler is not None:
+            self.profiler.disable()
+        traced_peak = None
+        if self.trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.trace_memory = False
+            _trace_lock.release()
+        record = {
+            'timestamp': self.timestamp,
+            'total_seconds': round(total, 4),
+            'stages': [dict(entry, seconds=round(entry.get('seconds', 0.0), 4)) for entry in self.stages],
+        }
+        if context:
+            record['context'] = context
+        if self.notes:
+            record['notes'] = self.notes
+        if self.profiler is not None:
+            record['profile'] = top_functions(self.profiler)
+        if traced_peak is not None:
+            record['traced_peak_mb'] = round(traced_peak / 1e6, 2)
+        return record
+
+
+def top_functions(profiler, limit=PROFILE_TOP_FUNCTIONS):
+    """Top `limit` functions by cumulative time as plain dicts."""
+    stats = pstats.Stats(profiler).stats
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.items():
+        rows.append({
+            'function': f"{os.path.basename(filename)}:{line}({function})" if line else function,
+            'calls': calls,
+            'own_seconds': round(own, 4),
+            'cumulative_seconds': round(cumulative, 4),
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:limit]
+
+
+def begin_rerun(cprofile=False, trace_memory=False):
+    stale = current_profile()
+    if stale is not None:
+        # rerun sebelumnya di thread ini tidak sampai end_rerun → lepas profiler / tracemalloc-nya
+        stale.finish()
+    _current.profile = RerunProfile(cprofile, trace_memory)
+    return _current.profile
+
+
+def current_profile():
+    return getattr(_current, 'profile', None)
+
+
+@contextmanager
+def stage(name):
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name):
+        yield
+
+
+def append_log(record, path=PROFILE_LOG_PATH, max_bytes=PROFILE_LOG_MAX_BYTES):
+    """Append `record` as one JSON line; the file is rotated to `<path>.1` once it reaches `max_bytes`."""
+    if not path:
+        return
+    line = json.dumps(record, default=str)
+    with _log_lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if max_bytes and os.path.exists(path) and os.path.getsize(path) >= max_bytes:
+            os.replace(path, path + '.1')
+        with open(path, 'a', encoding='utf-8') as log:
+            log.write(line + '\n')
+
+
+def end_rerun(context=None, log_path=PROFILE_LOG_PATH):
+    """Close the current profile; returns its record (None when no rerun was profiled)."""
+    profile = current_profile()
+    if profile is None:
+        return None
+    _current.profile = None
+    record = profile.finish(context)
+    try:
+        append_log(record, log_path)
+    except OSError:
+        # log hanya alat bantu; disk read-only / penuh tidak boleh menjatuhkan dashboard
+        record['log_error'] = True
+    return record
@@ -146,7 +146,7 @@ with tab3:
             
             # Memory usage simulation
             st.info(f"📊 Memory usage: ~{len(large_test_data) * 0.001:.2f} MB")
-            st.info(f"🔄 Cache efficiency: 95.2%")
+            st.caption("Benchmark lengkap (1k–1M baris, latency & peak memory): `python benchmarks/bench_pipeline.py`")
 
 # Development notes
 st.markdown("---")
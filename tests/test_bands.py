@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.bands import (
+    MAP_COLOR_BANDS, PERFORMANCE_CATEGORIES, ROW_HIGHLIGHT_BANDS,
+    band_of, categorize_series, classify_bands
+)
+
+
+# Versi per-baris dari baseline (data_processor / maps / satu.py sebelum bands.py)
+def baseline_category(percentage):
+    if percentage >= 120:
+        return 'Excellent'
+    elif percentage >= 100:
+        return 'Good'
+    elif percentage >= 80:
+        return 'Average'
+    elif percentage >= 60:
+        return 'Below Average'
+    else:
+        return 'Poor'
+
+
+def baseline_marker_color(avg_performance):
+    if avg_performance >= 120:
+        return 'green'
+    elif avg_performance >= 100:
+        return 'lightgreen'
+    elif avg_performance >= 80:
+        return 'orange'
+    else:
+        return 'red'
+
+
+def baseline_row_color(percentage):
+    if percentage >= 120:
+        return '#d4edda'
+    elif percentage >= 100:
+        return '#cce5ff'
+    elif percentage >= 80:
+        return '#fff3cd'
+    elif percentage >= 60:
+        return '#ffeaa7'
+    else:
+        return '#f8d7da'
+
+
+def percentages():
+    rng = np.random.default_rng(0)
+    edges = [0, 59.99, 60, 79.99, 80, 99.99, 100, 119.99, 120, -5, 1e9, np.inf, np.nan]
+    return pd.Series(np.concatenate([edges, rng.uniform(-10, 250, 5_000).round(2)]))
+
+
+def test_categorize_series_matches_baseline():
+    values = percentages()
+    result = categorize_series(values)
+    assert result.tolist() == values.apply(baseline_category).tolist()
+    assert result.cat.ordered
+    assert list(result.cat.categories) == PERFORMANCE_CATEGORIES
+
+
+def test_classify_bands_matches_baseline_colors():
+    values = percentages()
+    assert classify_bands(values, MAP_COLOR_BANDS).tolist() == values.apply(baseline_marker_color).tolist()
+    assert classify_bands(values, ROW_HIGHLIGHT_BANDS).tolist() == values.apply(baseline_row_color).tolist()
+
+
+def test_band_of_matches_baseline():
+    for value in percentages():
+        assert band_of(value) == baseline_category(value)
+        assert band_of(value, MAP_COLOR_BANDS) == baseline_marker_color(value)
@@ -0,0 +1,77 @@
+import glob
+import os
+import random
+
+import pandas as pd
+
+from src.data.column_resolver import REQUIRED_COLUMNS, describe_mapping, resolve_headers
+
+CSV_DIR = os.path.join(os.path.dirname(__file__), '..', 'csv')
+
+
+def baseline_resolution(columns):
+    # pencocokan kolom baseline: nama persis, lalu header pertama yang sama tanpa beda huruf besar/kecil
+    available_columns = [col.strip() for col in columns]
+    rename_map, missing_columns = {}, []
+    for req_col in REQUIRED_COLUMNS:
+        if req_col not in available_columns:
+            for avail_col in available_columns:
+                if req_col.lower() == avail_col.lower():
+                    rename_map[avail_col] = req_col
+                    break
+            else:
+                missing_columns.append(req_col)
+    return rename_map, missing_columns
+
+
+def layouts():
+    for path in sorted(glob.glob(os.path.join(CSV_DIR, '*.csv'))):
+        yield list(pd.read_csv(path, nrows=0).columns.str.strip())
+
+    rng = random.Random(3)
+    variants = [str.lower, str.upper, str.title, lambda name: name]
+    extras = ['No', 'Keterangan', 'Minus/plus', 'Percentage', 'Periode']
+    for _ in range(300):
+        headers = [rng.choice(variants)(column) for column in REQUIRED_COLUMNS if rng.random() > 0.1]
+        headers += rng.sample(extras, rng.randint(0, len(extras)))
+        if rng.random() < 0.3:
+            # kolom ganda dengan huruf besar/kecil berbeda
+            headers.append(rng.choice(REQUIRED_COLUMNS).upper())
+        rng.shuffle(headers)
+        yield headers
+
+
+def test_resolver_agrees_with_baseline_matching():
+    for headers in layouts():
+        rename_map, missing = baseline_resolution(headers)
+        resolution = resolve_headers(headers)
+        resolved = {column: header for header, column in resolution['rename_map'].items()}
+        for header, column in rename_map.items():
+            assert resolved.get(column) == header, headers
+        for column in REQUIRED_COLUMNS:
+            if column in headers:
+                assert column not in resolved and column not in resolution['missing'], headers
+        # alias tambahan boleh menemukan kolom yang dulu hilang, tidak sebaliknya
+        assert set(resolution['missing']) <= set(missing), headers
+
+
+def test_resolver_finds_regional_aliases():
+    resolution = resolve_headers(['Wilayah', 'Sub Area', 'NAMA SALES', 'Jabatan', 'Tgt', 'CA'])
+    assert resolution['missing'] == []
+    assert resolution['rename_map'] == {
+        'Wilayah': 'Area', 'Sub Area': 'SubArea', 'NAMA SALES': 'Nama',
+        'Jabatan': 'Grade', 'Tgt': 'Target', 'CA': 'Sales',
+    }
+
+
+def test_generic_headers_only_fill_unmatched_columns():
+    # "Kota" / "Level" kalah dari kandidat lain, termasuk fuzzy
+    resolution = resolve_headers(['Kota', 'Wilayah', 'SubArea', 'Nama', 'Level', 'Grde', 'Target', 'Sales'])
+    assert resolution['rename_map'] == {'Wilayah': 'Area', 'Grde': 'Grade'}
+    assert 'weak' not in resolution['matched_by'].values()
+
+    resolution = resolve_headers(['Kota', 'SubArea', 'Nama', 'Role', 'Target', 'Sales'])
+    assert resolution['missing'] == []
+    assert resolution['matched_by'] == {'Area': 'weak', 'Grade': 'weak'}
+    assert describe_mapping(resolution, weak=True) == 'Kota → Area, Role → Grade'
+    assert describe_mapping(resolution) == ''
@@ -0,0 +1,174 @@
+import glob
+import io
+import os
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+import xlsxwriter
+
+from src.data import excel_reader
+from src.data.column_resolver import REQUIRED_COLUMNS
+from src.data.data_processor import MissingColumnsError, parse_sales_file
+from src.data.excel_reader import read_roster_xlsx
+
+CSV_DIR = os.path.join(os.path.dirname(__file__), '..', 'csv')
+HEADERS = ['No', 'Area', 'Sub Area', 'Nama', 'Grade', 'Target', 'Sales', 'Keterangan']
+
+
+def roster_workbook(title_rows=2, **options):
+    """Roster layout like the recap files: title rows, extra columns, a formula column; via xlsxwriter."""
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, options)
+    sheet = workbook.add_worksheet('Roster')
+    for row in range(title_rows):
+        sheet.write(row, 0, f"REKAPAN PENCAPAIAN NASIONAL {row + 1}")
+    sheet.write_row(title_rows, 0, HEADERS)
+    rows = [
+        (1, 'Jakarta', 'Jakarta Pusat', 'Andi', 'DS', 20, 30, 'ok'),
+        (2, 'Medan', 'Medan Kota', 'Budi', 'S2', 10, 5, None),
+        (3, 'Bandung', 'Bandung Timur', 'Citra', 'SPV', 0, 7, ''),
+    ]
+    for i, values in enumerate(rows, start=title_rows + 1):
+        for column, value in enumerate(values):
+            if column == 6:
+                # Sales sebagai formula dengan nilai cache
+                sheet.write_formula(i, column, f"=F{i + 1}+0", None, value)
+            elif value is not None:
+                sheet.write(i, column, value)
+    workbook.close()
+    buffer.seek(0)
+    return buffer
+
+
+EXPECTED = pd.DataFrame({
+    'Area': ['Jakarta', 'Medan', 'Bandung'],
+    'SubArea': ['Jakarta Pusat', 'Medan Kota', 'Bandung Timur'],
+    'Nama': ['Andi', 'Budi', 'Citra'],
+    'Grade': ['DS', 'S2', 'SPV'],
+    'Target': [20, 10, 0],
+    'Sales': [30, 5, 7],
+})
+
+
+def test_header_found_below_title_rows_with_shared_strings():
+    source = roster_workbook()
+    assert any(name == 'xl/sharedStrings.xml' for name in zipfile.ZipFile(source).namelist())
+    df, resolution = read_roster_xlsx(source)
+    assert resolution['header_row'] == 2 and resolution['missing'] == []
+    pd.testing.assert_frame_equal(df, EXPECTED)
+
+
+def test_inline_strings():
+    # constant_memory: xlsxwriter menulis teks sebagai <c t="inlineStr">
+    source = roster_workbook(constant_memory=True)
+    assert b'inlineStr' in zipfile.ZipFile(source).read('xl/worksheets/sheet1.xml')
+    df, _ = read_roster_xlsx(source)
+    pd.testing.assert_frame_equal(df, EXPECTED)
+
+
+def test_cached_formula_values_are_used():
+    source = roster_workbook()
+    sheet_xml = zipfile.ZipFile(source).read('xl/worksheets/sheet1.xml')
+    assert b'<f>F4+0</f><v>30</v>' in sheet_xml
+    df, _ = read_roster_xlsx(source)
+    assert df['Sales'].tolist() == [30, 5, 7]
+
+
+def test_sparse_rows_and_missing_cells():
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer)
+    sheet = workbook.add_worksheet()
+    sheet.write_row(3, 2, ['Area', 'SubArea', 'Nama', 'Grade', 'Target', 'Sales'])
+    sheet.write_row(4, 2, ['Jakarta', 'A', 'Andi', 'DS', 20, 30])
+    # baris kosong, lalu baris dengan sel Grade & Sales tidak ada
+    sheet.write_row(6, 2, ['Medan', 'B', 'Budi'])
+    sheet.write(6, 6, 10)
+    # nilai di luar 6 kolom wajib saja → baris dilewati
+    sheet.write(7, 12, 'catatan')
+    workbook.close()
+    buffer.seek(0)
+
+    df, _ = read_roster_xlsx(buffer)
+    assert df['Nama'].tolist() == ['Andi', 'Budi']
+    assert df['Grade'].tolist() == ['DS', None] and df['Sales'].isna().tolist() == [False, True]
+    assert df['Target'].tolist() == [20, 10]
+
+
+def test_cells_without_reference_are_positional():
+    # sel tanpa atribut r (ditulis sebagian generator) → posisi berurutan dalam baris
+    source = roster_workbook(title_rows=0)
+    archive = zipfile.ZipFile(source)
+    sheet_xml = archive.read('xl/worksheets/sheet1.xml').decode()
+    stripped = pd.Series([sheet_xml]).str.replace(r' r="[A-Z]+\d+"', '', regex=True)[0]
+    rebuilt = io.BytesIO()
+    with zipfile.ZipFile(rebuilt, 'w') as out:
+        for name in archive.namelist():
+            out.writestr(name, stripped if name == 'xl/worksheets/sheet1.xml' else archive.read(name))
+    df, _ = read_roster_xlsx(rebuilt)
+    pd.testing.assert_frame_equal(df, EXPECTED)
+
+
+def test_openpyxl_fallback_for_non_standard_parts(monkeypatch):
+    fallback_calls = []
+    iter_openpyxl_rows = excel_reader._iter_openpyxl_rows
+
+    def spy(*args):
+        fallback_calls.append(args)
+        return iter_openpyxl_rows(*args)
+
+    monkeypatch.setattr(excel_reader, '_iter_openpyxl_rows', spy)
+    # workbook part di lokasi lain (ditemukan lewat _rels/.rels): parser XML tidak menemukannya
+    archive = zipfile.ZipFile(roster_workbook())
+    renamed = io.BytesIO()
+    with zipfile.ZipFile(renamed, 'w') as out:
+        for name in archive.namelist():
+            data = archive.read(name)
+            if name in ('_rels/.rels', '[Content_Types].xml'):
+                data = data.replace(b'xl/workbook.xml', b'xl/book.xml')
+            out.writestr(name.replace('workbook.xml', 'book.xml'), data)
+    assert 'xl/workbook.xml' not in zipfile.ZipFile(renamed).namelist()
+
+    df, resolution = read_roster_xlsx(renamed)
+    assert fallback_calls and resolution['header_row'] == 2
+    pd.testing.assert_frame_equal(df, EXPECTED)
+
+
+def test_missing_header_is_reported():
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer)
+    workbook.add_worksheet().write_row(0, 0, ['Wilayah', 'Nama', 'Nilai'])
+    workbook.close()
+    buffer.seek(0)
+    buffer.name = 'rekap.xlsx'
+    with pytest.raises(MissingColumnsError) as error:
+        parse_sales_file(buffer)
+    assert 'Nilai' in error.value.available
+
+
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(CSV_DIR, '*.csv')))[:2])
+def test_matches_read_excel_on_roster_workbooks(path):
+    roster = pd.read_csv(path, on_bad_lines='skip')
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        pd.DataFrame([['REKAPAN PENCAPAIAN NASIONAL']]).to_excel(writer, index=False, header=False)
+        roster.to_excel(writer, index=False, startrow=2)
+    content = buffer.getvalue()
+
+    df, resolution = read_roster_xlsx(io.BytesIO(content))
+    expected = pd.read_excel(io.BytesIO(content), header=2, engine='openpyxl')
+    expected.columns = expected.columns.str.strip()
+    expected = expected.rename(columns=resolution['rename_map'])[REQUIRED_COLUMNS]
+    expected = expected.dropna(how='all').reset_index(drop=True)
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    # parse lengkap: .xlsx dan .csv sumber memberi roster yang sama
+    upload = io.BytesIO(content)
+    upload.name = 'roster.xlsx'
+    with open(path, 'rb') as f:
+        from_csv = parse_sales_file(f)
+    pd.testing.assert_frame_equal(
+        parse_sales_file(upload).reset_index(drop=True), from_csv.reset_index(drop=True), check_dtype=False,
+        check_categorical=False,
+    )
@@ -0,0 +1,48 @@
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from src.data.data_processor import add_derived_columns, normalize_schema
+from src.data.export import to_excel_bytes, write_workbook
+
+
+def roster_with_zero_target():
+    df = pd.DataFrame({
+        'Area': ['Jakarta', 'Jakarta', 'Medan'],
+        'SubArea': ['Jakarta', 'Jakarta', 'Medan'],
+        'Nama': ['Andi', 'Budi', 'Citra'],
+        'Grade': ['DS', 'DS', 'S2'],
+        'Target': [20, 0, 0],
+        'Sales': [30, 7, 0],
+    })
+    return normalize_schema(add_derived_columns(df))
+
+
+def column(sheet, header):
+    rows = list(sheet.iter_rows(values_only=True))
+    index = rows[0].index(header)
+    return [row[index] for row in rows[1:]]
+
+
+def test_excel_export_with_infinite_percentage():
+    df = roster_with_zero_target()
+    assert np.isinf(df['Percentage']).any() and df['Percentage'].isna().any()
+
+    workbook = openpyxl.load_workbook(io.BytesIO(to_excel_bytes(df)), data_only=True)
+    assert column(workbook['Data'], 'Percentage') == [150.0, '#DIV/0!', None]
+    assert column(workbook['Data'], 'Target') == [20, 0, 0]
+
+    per_area = openpyxl.load_workbook(io.BytesIO(to_excel_bytes(df, per_area=True)))
+    assert per_area.sheetnames == ['Jakarta', 'Medan']
+
+
+def test_report_workbook_with_infinite_values(tmp_path):
+    df = roster_with_zero_target()
+    kpi = pd.DataFrame({'Metric': ['overall_achievement', 'top_performance'], 'Value': [np.inf, 'Andi']})
+    path = write_workbook(str(tmp_path / 'report.xlsx'), {'KPI': kpi, 'Data': df})
+
+    workbook = openpyxl.load_workbook(path, data_only=True)
+    assert column(workbook['KPI'], 'Value') == ['#DIV/0!', 'Andi']
+    assert column(workbook['Data'], 'Percentage') == [150.0, '#DIV/0!', None]
@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_processor import add_derived_columns, concat_periods, normalize_schema
+from src.data.filter_engine import FilterEngine
+
+
+def baseline_filter(data, area, grade, category, min_achievement, max_achievement):
+    # filter sidebar baseline (mask pandas berurutan di atas data.copy())
+    filtered_data = data.copy()
+    if area != 'All':
+        filtered_data = filtered_data[filtered_data['Area'] == area]
+    if grade != 'All':
+        filtered_data = filtered_data[filtered_data['Grade'] == grade]
+    if category != 'All':
+        filtered_data = filtered_data[filtered_data['Performance_Category'] == category]
+    return filtered_data[
+        (filtered_data['Percentage'] >= min_achievement) &
+        (filtered_data['Percentage'] <= max_achievement)
+    ]
+
+
+def roster(n_rows=2_000, seed=7):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Area': rng.choice(['Jakarta', 'Bandung', 'Medan', 'Semarang'], n_rows),
+        'SubArea': rng.choice(['A', 'B', 'C'], n_rows),
+        'Nama': [f"Sales {i}" for i in range(n_rows)],
+        'Grade': rng.choice(['DS', 'S2', 'SPV'], n_rows),
+        'Target': rng.integers(0, 50, n_rows),
+        'Sales': rng.integers(0, 70, n_rows),
+    })
+    # Target 0 → Percentage NaN (0/0) atau inf
+    df.loc[:5, ['Target', 'Sales']] = [[0, 0], [0, 5], [10, 12], [10, 8], [10, 6], [10, 20]]
+    return normalize_schema(add_derived_columns(df))
+
+
+def test_select_matches_baseline_masks():
+    df = roster()
+    engine = FilterEngine(df)
+    states = itertools.product(
+        ['All', 'Jakarta', 'Medan', 'Tidak Ada'],
+        ['All', 'DS', 'SPV'],
+        ['All', 'Good', 'Poor'],
+        [(0, 200), (80, 120), (60, 60), (150, 10), (0, 0)],
+    )
+    for area, grade, category, (min_pct, max_pct) in states:
+        expected = baseline_filter(df, area, grade, category, min_pct, max_pct)
+        result = engine.apply(area, grade, category, min_pct, max_pct)
+        pd.testing.assert_frame_equal(result, expected, check_categorical=False)
+
+
+def test_unfiltered_view_is_the_dataset_itself():
+    df = roster()
+    df = df[np.isfinite(df['Percentage']) & df['Percentage'].between(0, 200)]
+    engine = FilterEngine(df)
+    assert engine.apply(min_pct=0, max_pct=200) is df
+
+
+def test_period_filter_on_multi_period_dataset():
+    periods = [('Agustus - September 2024', roster(seed=1)), ('Juli - Agustus 2024', roster(seed=2))]
+    data = concat_periods(periods)
+    engine = FilterEngine(data)
+    assert engine.periods() == ['Juli - Agustus 2024', 'Agustus - September 2024']
+
+    latest = engine.apply(period='Agustus - September 2024', min_pct=0, max_pct=200)
+    assert (latest['Period'] == 'Agustus - September 2024').all()
+    assert len(latest) == len(baseline_filter(periods[0][1], 'All', 'All', 'All', 0, 200))
+    assert len(engine.apply(area='Medan', period='All')) == (data['Area'] == 'Medan').sum()
+
+
+def test_period_is_ignored_for_single_period_dataset():
+    df = roster()
+    engine = FilterEngine(df)
+    assert engine.periods() == []
+    assert len(engine.apply(period='Juli - Agustus 2024')) == len(df)
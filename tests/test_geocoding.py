@@ -0,0 +1,68 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.maps.geocoding import (
+    ABBREV_MAP, COORDINATES_BY_ISLAND, INDONESIA_CENTER, ISLAND_CENTERS, ISLAND_KEYWORDS,
+    geocode_series, get_indonesia_coordinates
+)
+
+CSV_DIR = os.path.join(os.path.dirname(__file__), '..', 'csv')
+
+
+def baseline_coordinates(area_name):
+    # pencarian berurutan dari baseline maps.py: abbreviation → exact → partial → pulau → tengah
+    area_lower = area_name.lower().strip()
+    for abbr, (full_name, island) in ABBREV_MAP.items():
+        if abbr in area_lower:
+            return COORDINATES_BY_ISLAND[island][full_name]
+    for cities in COORDINATES_BY_ISLAND.values():
+        for city, coords in cities.items():
+            if area_lower == city.lower():
+                return coords
+    for cities in COORDINATES_BY_ISLAND.values():
+        for city, coords in cities.items():
+            if city.lower() in area_lower:
+                return coords
+    for island, keywords in ISLAND_KEYWORDS.items():
+        if any(keyword in area_lower for keyword in keywords):
+            return ISLAND_CENTERS[island]
+    return INDONESIA_CENTER
+
+
+def area_names():
+    names = set()
+    for path in glob.glob(os.path.join(CSV_DIR, '*.csv')):
+        roster = pd.read_csv(path, skipinitialspace=True, on_bad_lines='skip')
+        roster.columns = roster.columns.str.strip()
+        names.update(roster['Area'].dropna().astype(str))
+        names.update(roster['SubArea'].dropna().astype(str))
+    for cities in COORDINATES_BY_ISLAND.values():
+        names.update(cities)
+        names.update(f"Kab {city}" for city in cities)
+    names.update(ABBREV_MAP)
+    names.update(keyword.upper() for keywords in ISLAND_KEYWORDS.values() for keyword in keywords)
+    names.update(['', '  Jakarta  ', 'Area Tidak Dikenal', 'xyz', 'Kantor Jateng 2', 'ntb selatan'])
+    return sorted(names)
+
+
+def test_coordinates_match_baseline_search():
+    for name in area_names():
+        assert get_indonesia_coordinates(name) == baseline_coordinates(name), name
+
+
+def test_geocode_series_matches_scalar_lookup():
+    names = pd.Series(area_names() * 3 + [np.nan])
+    result = geocode_series(names)
+    expected = [baseline_coordinates(name) if isinstance(name, str) else INDONESIA_CENTER for name in names]
+    assert result['lat'].tolist() == [coords['lat'] for coords in expected]
+    assert result['lon'].tolist() == [coords['lon'] for coords in expected]
+
+
+def test_geocode_series_uses_fallback_for_unknown_names():
+    result = geocode_series(pd.Series(['Sub Tidak Dikenal', 'Bandung']), fallback=pd.Series(['Medan', 'Medan']))
+    medan = baseline_coordinates('Medan')
+    assert (result.loc[0, 'lat'], result.loc[0, 'lon']) == (medan['lat'], medan['lon'])
+    assert result.loc[1, 'lat'] == baseline_coordinates('Bandung')['lat']
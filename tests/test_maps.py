@@ -0,0 +1,21 @@
+from src.analytics.cube import build_cube
+from src.data.data_processor import load_sample_data
+from src.maps import maps
+
+
+def test_map_html_cached_on_filter_fingerprint(monkeypatch):
+    df = load_sample_data()
+    cube = build_cube(df)
+    fingerprint = ('sample', len(df), 'All', 'All', 'All', 0, 200, 'All')
+    calls = []
+    map_points = maps.map_points
+    monkeypatch.setattr(maps, 'map_points', lambda *args: calls.append(args[2]) or map_points(*args))
+
+    html = maps.performance_map_html(df, cube, {'granularity': 'Nama'}, fingerprint=fingerprint)
+    # hit: titik per sales tidak dibangun (atau di-hash) lagi
+    assert maps.performance_map_html(df, cube, {'granularity': 'Nama'}, fingerprint=fingerprint) == html
+    assert calls == ['Nama']
+
+    # granularity lain = key lain
+    maps.performance_map_html(df, cube, {'granularity': 'Area'}, fingerprint=fingerprint)
+    assert calls == ['Nama', 'Area']
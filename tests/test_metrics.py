@@ -0,0 +1,57 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.metrics import calculate_team_metrics
+from src.data.data_processor import add_derived_columns, normalize_schema
+from src.data.filter_engine import FilterEngine
+
+
+def roster(n_rows=500, seed=5):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Area': rng.choice(['Jakarta', 'Medan', 'Semarang'], n_rows),
+        'SubArea': rng.choice(['A', 'B'], n_rows),
+        'Nama': [f"Sales {i}" for i in range(n_rows)],
+        'Grade': rng.choice(['DS', 'S2', 'SPV'], n_rows),
+        'Target': rng.integers(0, 50, n_rows),
+        'Sales': rng.integers(0, 70, n_rows),
+    })
+    return normalize_schema(add_derived_columns(df))
+
+
+def test_integer_columns_give_integer_totals():
+    df = roster()
+    metrics = calculate_team_metrics(df)
+    assert isinstance(metrics['total_target'], int) and isinstance(metrics['total_sales'], int)
+    assert metrics['total_target'] == df['Target'].sum() and metrics['total_sales'] == df['Sales'].sum()
+
+    card = calculate_team_metrics(pd.DataFrame({
+        'Nama': ['Andi', 'Budi'], 'Target': [9_000, 8_905], 'Sales': [5_000, 4_454], 'Percentage': [55.6, 50.0],
+        'Performance_Category': ['Poor', 'Poor'],
+    }))
+    assert f"{card['total_sales']:,}/{card['total_target']:,}" == "9,454/17,905"
+
+
+def test_float_columns_keep_float_totals():
+    df = roster().astype({'Target': 'float64'})
+    df.loc[0, 'Target'] = np.nan
+    assert calculate_team_metrics(df)['total_target'] == df['Target'].sum()
+
+
+def test_mask_matches_materialized_subset():
+    df = roster()
+    engine = FilterEngine(df)
+    rows = engine.select(area='Medan', min_pct=50, max_pct=150)
+    for mask in (rows, np.isin(np.arange(len(df)), rows)):
+        assert calculate_team_metrics(df, mask) == calculate_team_metrics(engine.view(rows))
+
+
+def test_infinite_percentage_std_without_warning():
+    df = roster()
+    assert np.isinf(df['Percentage']).any()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        metrics = calculate_team_metrics(df)
+    assert np.isnan(metrics['performance_std']) and np.isinf(metrics['avg_individual_performance'])
@@ -0,0 +1,66 @@
+import cProfile
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from src.utils.profiling import append_log, begin_rerun, current_profile, end_rerun, stage
+
+
+def test_interrupted_rerun_releases_profiler_and_tracemalloc():
+    begin_rerun(cprofile=True, trace_memory=True)
+    with pytest.raises(RuntimeError):
+        try:
+            with stage('render_tabs'):
+                raise RuntimeError("st.rerun()")
+        finally:
+            record = end_rerun({'interrupted': True}, log_path='')
+
+    assert record['profile'] and 'traced_peak_mb' in record
+    assert current_profile() is None and not tracemalloc.is_tracing()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    profiler.disable()
+
+
+def test_stale_profile_is_closed_by_the_next_rerun():
+    begin_rerun(cprofile=True, trace_memory=True)
+    begin_rerun(cprofile=True, trace_memory=True)
+    record = end_rerun(log_path='')
+    assert record['profile'] and 'traced_peak_mb' in record and 'notes' not in record
+    assert not tracemalloc.is_tracing()
+
+
+def test_busy_profilers_degrade_to_timers():
+    other = cProfile.Profile()
+    other.enable()
+    tracemalloc.start()
+    try:
+        begin_rerun(cprofile=True, trace_memory=True)
+        with stage('calculate_team_metrics'):
+            pass
+        record = end_rerun(log_path='')
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+        other.disable()
+
+    assert 'profile' not in record and 'traced_peak_mb' not in record
+    assert [entry['stage'] for entry in record['stages']] == ['calculate_team_metrics']
+    assert len(record['notes']) == 2
+
+
+def test_rerun_log_is_rotated_at_max_size(tmp_path):
+    path = str(tmp_path / 'logs' / 'reruns.jsonl')
+    for i in range(30):
+        append_log({'rerun': i, 'stages': []}, path, max_bytes=200)
+    with open(path) as log:
+        current = log.read().splitlines()
+    with open(path + '.1') as log:
+        previous = log.read().splitlines()
+    # file diputar begitu mencapai batas → paling banyak satu baris di atas max_bytes
+    assert os.path.getsize(path) < 200 + len(current[0]) + 1
+    assert json.loads(current[-1])['rerun'] == 29
+    assert json.loads(previous[-1])['rerun'] == json.loads(current[0])['rerun'] - 1
+    assert not os.path.exists(path + '.2')
@@ -0,0 +1,33 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from src.analytics.cube import build_cube
+from src.data.data_processor import load_sample_data
+from src.maps.choropleth import PROVINCE_STAT_COLUMNS, create_province_choropleth, province_stats
+
+MAIN = os.path.join(os.path.dirname(__file__), '..', 'main.py')
+
+
+def test_province_stats_of_empty_selection():
+    empty = load_sample_data().iloc[:0]
+    stats = province_stats(empty, build_cube(empty))
+    assert stats.empty
+    assert list(stats.columns) == PROVINCE_STAT_COLUMNS
+    assert stats.attrs['unmatched_areas'] == []
+    create_province_choropleth(empty, stats=stats).get_root().render()
+
+
+def test_province_tab_with_nothing_selected():
+    at = AppTest.from_file(MAIN, default_timeout=120)
+    at.run()
+    min_slider, max_slider = at.sidebar.slider[0], at.sidebar.slider[1]
+    min_slider.set_value(150)
+    max_slider.set_value(10)
+    at.radio(key='active_tab').set_value('maps')
+    at.run()
+    at.radio(key='map_type').set_value('province')
+    at.run()
+
+    assert not at.exception
+    assert any('Tidak ada data' in info.value for info in at.main.info)
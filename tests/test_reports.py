@@ -0,0 +1,41 @@
+import openpyxl
+
+from src.core import reports
+
+ROSTER = "Area,SubArea,Nama,Grade,Target,Sales\nJakarta,Jakarta,Andi,DS,20,30\nJakarta,Jakarta,Budi,DS,0,7\nMedan,Medan,Citra,S2,10,8\n"
+
+
+def test_batch_keeps_going_past_failed_tasks(tmp_path, monkeypatch):
+    source = tmp_path / 'csv'
+    source.mkdir()
+    (source / 'JULI - AGUSTUS 2024.csv').write_text(ROSTER)
+    (source / 'AGUSTUS - SEPTEMBER 2024.csv').write_text(ROSTER.replace('Medan', 'Semarang'))
+    (source / 'rusak.csv').write_text("Kolom,Lain\n1,2\n")
+
+    write_area_report = reports.write_area_report
+
+    def failing_area_report(area, df, path):
+        if area == 'Medan':
+            raise OSError("disk full")
+        return write_area_report(area, df, path)
+
+    monkeypatch.setattr(reports, 'write_area_report', failing_area_report)
+    result = reports.run_batch([str(source)], str(tmp_path / 'out'), workers=1, on_progress=lambda message: None)
+
+    assert len(result['periods']) == 2
+    assert sorted(path.rsplit('/', 1)[-1] for path in result['areas']) == ['Jakarta.xlsx', 'Semarang.xlsx']
+    assert sorted(failure['file'] for failure in result['failed']) == ['Medan.xlsx', 'rusak.csv']
+
+    files = list(openpyxl.load_workbook(result['summary'])['Files'].iter_rows(values_only=True))
+    assert [row[0] for row in files[1:]][-2:] == [failure['file'] for failure in result['failed']]
+    assert all(row[3] for row in files[-2:])
+
+
+def test_task_that_raises_becomes_an_error_result():
+    def task(value):
+        if value == 2:
+            raise ValueError("boom")
+        return value
+
+    results = list(reports._run_tasks(task, [(1,), (2,), (3,)], 1, lambda args, error: ('error', args, str(error))))
+    assert results == [1, ('error', (2,), 'boom'), 3]
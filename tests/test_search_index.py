@@ -0,0 +1,45 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data.search_index import NameSearchIndex, TrigramIndex
+
+CSV_DIR = os.path.join(os.path.dirname(__file__), '..', 'csv')
+
+QUERIES = [
+    'a', 'an', 'an ', ' an', 'AN', 'Sri', 'sri wa', 'a.', '.', "d'", '-', '(', 'a  b', '  ',
+    'jose', 'José', 'JOSÉ', 'strasse', 'ß', 'fi', 'muhammad', 'MUH', 'ti ', 'xyzq', '0', 'h. ',
+]
+
+
+def names():
+    frames = [pd.read_csv(path, on_bad_lines='skip') for path in sorted(glob.glob(os.path.join(CSV_DIR, '*.csv')))]
+    real = pd.concat(frames)['Nama'].dropna().astype(str).str.strip().tolist()
+    extra = ['José Andi', 'Jose Budi', "Citra D'Souza", 'Dewi-Lestari', 'H. Anwar', 'Straße Eka', 'ﬁtri', 'A  B', 'Sri (Wati)']
+    return pd.DataFrame({'Nama': real + extra})
+
+
+def test_matches_are_exactly_str_contains():
+    df = names()
+    index = NameSearchIndex(df)
+    for query in QUERIES:
+        expected = df['Nama'].str.contains(query, case=False, regex=False, na=False).to_numpy()
+        matched = index.match_scores(df, query, fuzzy=False) > 0
+        assert (matched == expected).all(), query
+
+
+def test_fuzzy_only_when_nothing_matches():
+    index = TrigramIndex(['Sudarmanto', 'Binsar Sudarmono S', 'Andi'])
+    assert [i for i, _ in index.search('sudarmnto')][:1] == [0]
+    assert all(score < 1 for _, score in index.search('sudarmnto'))
+    assert index.search('andi') == [(2, 3.0)]
+    assert index.search('sudarmnto', fuzzy=False) == []
+
+
+def test_ranking_prefers_exact_then_prefix():
+    index = TrigramIndex(['Budi Andi', 'Andika', 'Andi', 'Sandi'])
+    ranked = [index.terms[i] for i, _ in index.search('andi')]
+    assert ranked == ['Andi', 'Andika', 'Budi Andi', 'Sandi']
+    assert np.allclose([score for _, score in index.search('andi')], [3.0, 2.0, 1.5, 1.0])
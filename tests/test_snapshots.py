@@ -0,0 +1,92 @@
+import glob
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.analytics.cube import build_cube
+from src.analytics.metrics import calculate_team_metrics
+from src.data import snapshots
+from src.data.data_processor import MissingColumnsError, parse_sales_file
+from src.data.streaming import ingest_csv_streaming, load_aggregates
+
+ROSTER = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'csv', '*.csv')))[0]
+COLUMNS = ['Area', 'SubArea', 'Nama', 'Grade', 'Target', 'Sales', 'Percentage', 'Performance_Category']
+
+
+def parsed_roster():
+    with open(ROSTER, 'rb') as f:
+        buffer = io.BytesIO(f.read())
+    buffer.name = os.path.basename(ROSTER)
+    return parse_sales_file(buffer)
+
+
+def test_snapshot_stores_the_normalized_schema(tmp_path):
+    df = parsed_roster()
+    path = snapshots.write_snapshot(df, str(tmp_path / 'period.arrow'), 'Juli - Agustus 2024')
+
+    with pa.memory_map(path, 'r') as source:
+        schema = pa.ipc.open_file(source).schema
+    assert pa.types.is_dictionary(schema.field('Area').type)
+    assert schema.field('Target').type == pa.int32()
+
+    loaded, metadata = snapshots.load_snapshot(path)
+    assert metadata['period'] == 'Juli - Agustus 2024'
+    assert isinstance(loaded['Area'].dtype, pd.CategoricalDtype)
+    assert loaded['Target'].dtype == 'int32'
+    pd.testing.assert_frame_equal(loaded[COLUMNS], df[COLUMNS].reset_index(drop=True))
+
+
+def test_streamed_snapshot_matches_parsed_file(tmp_path):
+    result = ingest_csv_streaming(ROSTER, chunksize=100, out_path=str(tmp_path / 'streamed.arrow'))
+    assert result['stats']['chunks'] > 1
+
+    loaded, _ = snapshots.load_snapshot(result['snapshot'])
+    pd.testing.assert_frame_equal(loaded[COLUMNS], parsed_roster()[COLUMNS].reset_index(drop=True))
+
+
+def test_snapshots_from_older_cleaning_rules_are_ignored(tmp_path, monkeypatch):
+    snapshots.write_snapshot(parsed_roster(), str(tmp_path / 'period.arrow'), 'Juli - Agustus 2024')
+    assert len(snapshots.list_snapshots(str(tmp_path))) == 1
+
+    monkeypatch.setattr(snapshots, 'CLEANING_RULES_VERSION', snapshots.CLEANING_RULES_VERSION + 1)
+    assert snapshots.list_snapshots(str(tmp_path)) == []
+
+
+def assert_same_metrics(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float) and np.isnan(value):
+            assert np.isnan(actual[key]), key
+        else:
+            assert actual[key] == value, key
+            assert isinstance(actual[key], str) == isinstance(value, str), key
+    # total Target / Sales tetap int, bukan 16256.0
+    assert isinstance(actual['total_target'], int) and isinstance(actual['total_sales'], int)
+
+
+def test_running_aggregates_match_team_metrics(tmp_path):
+    result = ingest_csv_streaming(ROSTER, chunksize=100, out_path=str(tmp_path / 'streamed.arrow'))
+    expected = calculate_team_metrics(parsed_roster())
+    assert_same_metrics(result['aggregates'].team_metrics(), expected)
+
+    # agregat yang disimpan di samping snapshot memberi KPI & cube yang sama
+    loaded, metadata = snapshots.load_snapshot(result['snapshot'])
+    aggregates = load_aggregates(result['snapshot'], metadata)
+    assert_same_metrics(aggregates.team_metrics(), expected)
+    cube = build_cube(loaded)
+    for level, frame in aggregates.cube().items():
+        pd.testing.assert_frame_equal(frame, cube[level], check_dtype=False)
+
+    # sidecar tidak ikut terdaftar sebagai snapshot, dan diabaikan kalau isinya beda
+    assert len(snapshots.list_snapshots(str(tmp_path))) == 1
+    assert load_aggregates(result['snapshot'], dict(metadata, source_sha256='other')) is None
+
+
+def test_streaming_reports_missing_columns():
+    with pytest.raises(MissingColumnsError) as error:
+        ingest_csv_streaming(io.BytesIO(b'Area,Nama,Sales\nJakarta,Andi,10\n'))
+    assert 'Target' in error.value.missing
@@ -0,0 +1,20 @@
+import os
+
+from src.data.data_processor import extract_period_from_filename, period_sort_key
+from src.data.synthetic import fit_roster_profile, period_labels, write_rosters
+
+
+def test_profile_sources_do_not_depend_on_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    profile = fit_roster_profile.__wrapped__()
+    assert len(profile['areas']) and profile['team_size'] > 0
+
+
+def test_file_names_round_trip_across_december(tmp_path):
+    labels = period_labels(8)
+    assert labels[5:7] == ['Desember - Januari 2024', 'Januari - Februari 2025']
+
+    paths = write_rosters(str(tmp_path), 20, periods=8)
+    periods = [extract_period_from_filename(os.path.basename(path)) for path in paths]
+    assert periods == labels
+    assert sorted(periods, key=period_sort_key) == labels
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.bands import ACHIEVEMENT_TEXT_BANDS, BOTTOM_HIGHLIGHT_BANDS, TOP_HIGHLIGHT_BANDS
+from src.ui.table_styles import background_css, column_config, style_table, text_css
+
+
+# Fungsi Styler per-sel dari baseline (satu.py / tabs.py sebelum table_styles.py)
+def color_achievement(val):
+    if val >= 120:
+        color = '#28a745'
+    elif val >= 100:
+        color = '#17a2b8'
+    elif val >= 80:
+        color = '#ffc107'
+    else:
+        color = '#dc3545'
+    return f'color: {color}; font-weight: bold'
+
+
+def highlight_performance(val):
+    if val >= 120:
+        return 'background-color: #d4edda; color: #155724'
+    elif val >= 100:
+        return 'background-color: #cce5ff; color: #004085'
+    else:
+        return ''
+
+
+def highlight_poor_performance(val):
+    if val < 60:
+        return 'background-color: #f8d7da; color: #721c24'
+    elif val < 80:
+        return 'background-color: #fff3cd; color: #856404'
+    else:
+        return ''
+
+
+VALUES = pd.Series([np.nan, -1, 0, 59.9, 60, 79.9, 80, 99.9, 100, 119.9, 120, 250, np.inf])
+
+
+def test_text_css_matches_baseline_achievement_colors():
+    assert text_css(VALUES, ACHIEVEMENT_TEXT_BANDS).tolist() == VALUES.map(color_achievement).tolist()
+
+
+def test_background_css_matches_baseline_highlights():
+    assert background_css(VALUES, TOP_HIGHLIGHT_BANDS).tolist() == VALUES.map(highlight_performance).tolist()
+    assert background_css(VALUES, BOTTOM_HIGHLIGHT_BANDS).tolist() == VALUES.map(highlight_poor_performance).tolist()
+
+
+def test_styler_keeps_thousands_separators():
+    df = pd.DataFrame({'Total_Target': [17905.0], 'Total_Sales': [9454.0]})
+    html = style_table(df, {'Total_Target': '{:,.0f}', 'Total_Sales': 'Rp {:,.0f}'}).to_html()
+    assert '17,905' in html and 'Rp 9,454' in html
+
+
+def test_column_config_translates_simple_formats():
+    config = column_config({'Percentage': '{:.1f}%', 'Minus/plus': '{:+.0f}', 'Nama': str.upper})
+    assert set(config) == {'Percentage', 'Minus/plus'}
@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from src.analytics.trends import compute_trends, filter_trend_rows, stack_periods, streak_alerts
+from src.data.data_processor import add_derived_columns
+
+MAIN = os.path.join(os.path.dirname(__file__), '..', 'main.py')
+PERIODS = ['Juli - Agustus 2024', 'Agustus - September 2024', 'September - Oktober 2024', 'Oktober - November 2024']
+
+
+def period_frames(n_people=60, seed=11):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for period in reversed(PERIODS):
+        # urutan input acak; sebagian orang absen di periode tertentu
+        present = rng.random(n_people) > 0.2
+        people = np.flatnonzero(present)
+        df = pd.DataFrame({
+            'Area': np.where(people % 2, 'Jakarta', 'Medan'),
+            'SubArea': 'A',
+            'Nama': [f"Sales {i}" for i in people],
+            'Grade': np.where(people % 3, 'DS', 'SPV'),
+            'Target': rng.integers(0, 40, len(people)),
+            'Sales': rng.integers(0, 60, len(people)),
+        })
+        frames.append((period, add_derived_columns(df)))
+    return frames
+
+
+def baseline_trends(long_df, window, threshold):
+    # per orang, per periode, tanpa matriks
+    rows = {}
+    for key, group in long_df.groupby('Person_Key'):
+        by_period = group.set_index('Period_Index')
+        streak = 0
+        for t in range(len(PERIODS)):
+            if t not in by_period.index:
+                streak = 0
+                continue
+            row = by_period.loc[t]
+            previous = by_period.loc[t - 1] if t - 1 in by_period.index else None
+            recent = by_period.loc[[i for i in range(t - window + 1, t + 1) if i in by_period.index]]
+            streak = streak + 1 if row['Percentage'] < threshold else 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rolling = np.float64(recent['Sales'].sum()) / np.float64(recent['Target'].sum()) * 100
+                delta_pct = row['Percentage'] - previous['Percentage'] if previous is not None else np.nan
+            rows[(key, t)] = {
+                'Delta_Pct': delta_pct,
+                'Delta_Sales': row['Sales'] - previous['Sales'] if previous is not None else np.nan,
+                'Rolling_Achievement': round(rolling, 2),
+                'Below_Streak': streak,
+                'Periods_Active': int((by_period.index <= t).sum()),
+            }
+    return rows
+
+
+def test_stack_periods_sums_duplicates_and_orders_periods():
+    frames = period_frames()
+    duplicate = frames[0][1].iloc[:1].copy()
+    frames.append((frames[0][0], duplicate))
+    long_df = stack_periods(frames)
+    assert list(long_df['Period'].cat.categories) == PERIODS
+    assert not long_df.duplicated(['Person_Key', 'Period_Index']).any()
+
+    person = long_df[(long_df['Nama'] == duplicate['Nama'].iloc[0]) & (long_df['Period'] == frames[0][0])]
+    assert person['Target'].iloc[0] == 2 * duplicate['Target'].iloc[0]
+
+
+def test_zero_target_percentage_matches_the_rest_of_the_app():
+    df = add_derived_columns(pd.DataFrame({
+        'Area': ['Jakarta'] * 3, 'SubArea': ['A'] * 3, 'Nama': ['Andi', 'Budi', 'Citra'],
+        'Grade': ['DS'] * 3, 'Target': [0, 0, 10], 'Sales': [7, 0, 5],
+    }))
+    long_df = stack_periods([(PERIODS[0], df)]).set_index('Nama')
+    pd.testing.assert_series_equal(
+        long_df.loc[df['Nama'], 'Percentage'].reset_index(drop=True), df['Percentage'], check_names=False
+    )
+
+
+def test_trend_columns_match_per_person_loop():
+    long_df = stack_periods(period_frames())
+    long_df.loc[long_df.index[:4], 'Target'] = 0
+    long_df['Percentage'] = (long_df['Sales'] / long_df['Target'] * 100).round(2)
+    for window, threshold in [(2, 80), (3, 100)]:
+        trends = compute_trends(long_df, window=window, streak_threshold=threshold)
+        expected = baseline_trends(long_df, window, threshold)
+        for row in trends.itertuples():
+            want = expected[(row.Person_Key, row.Period_Index)]
+            got = {column: getattr(row, column) for column in want}
+            np.testing.assert_allclose(
+                [got[column] for column in want], [want[column] for column in want], equal_nan=True, rtol=1e-9,
+                err_msg=str((row.Person_Key, row.Period_Index)),
+            )
+
+
+def test_streak_alerts_and_sidebar_filters():
+    trends = compute_trends(stack_periods(period_frames()), window=3, streak_threshold=100)
+    alerts = streak_alerts(trends, min_periods=2)
+    assert (alerts['Period_Index'] == len(PERIODS) - 1).all() and (alerts['Below_Streak'] >= 2).all()
+
+    medan = filter_trend_rows(trends, area='Medan', grade='DS', min_pct=50, max_pct=150)
+    assert set(medan['Area']) == {'Medan'} and set(medan['Grade']) == {'DS'}
+    assert medan['Percentage'].between(50, 150).all()
+    assert filter_trend_rows(trends) is trends
+
+
+def test_trends_tab_without_multi_period_source():
+    # sample data (satu periode) → tidak ada tren dari snapshot di disk, hanya petunjuk
+    at = AppTest.from_file(MAIN, default_timeout=120)
+    at.run()
+    for selectbox in at.sidebar.selectbox:
+        if selectbox.label.startswith('📦'):
+            # snapshot di disk → pilih sample data
+            selectbox.set_value(selectbox.options[0])
+            at.run()
+    at.radio(key='active_tab').set_value('trends')
+    at.run()
+    assert not at.exception
+    assert any('multi-periode' in info.value for info in at.main.info)
+    assert not at.main.get('plotly_chart')